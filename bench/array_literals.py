@@ -0,0 +1,110 @@
+# Tablas grandes inicializadas con una lista de literales: un global
+# constante copiado con memcpy, o un _bminor_array_set por elemento
+#
+#   python bench/array_literals.py [elementos]
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+
+from parser import Parser
+
+import rich
+from rich.table import Table
+
+from ir import IRGenerator
+from scanner import Lexer
+from semantic import Check
+
+
+def program(n: int) -> str:
+    values = ", ".join(str(i * 7 % 1000) for i in range(n))
+    floats = ", ".join(f"{i % 100}.5" for i in range(n))
+
+    return f"""
+    ints: array [{n}] integer = {{{values}}};
+
+    main: function integer () = {{
+        fs: array [{n}] float = {{{floats}}};
+        print ints[{n - 1}], " ", fs[{n - 1}], "\\n";
+        return 0;
+    }}
+    """
+
+
+def run(code: str, constant_arrays: bool):
+    start = time.perf_counter()
+    ast = Parser().parse(Lexer().tokenize(code))
+    env, ast = Check.checker(ast, return_ast=True)
+    module = str(IRGenerator.Generate(ast, env, None, constant_arrays=constant_arrays))
+    codegen = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / "prog.ll").write_text(module)
+
+        runtime_c = Path(project_root) / "ir" / "runtime.c"
+        commands = [
+            ["llvm-as", tmpdir / "prog.ll", "-o", tmpdir / "prog.bc"],
+            ["clang", "-O2", "-c", runtime_c, "-o", tmpdir / "rt.o"],
+            [
+                "clang",
+                "-O2",
+                tmpdir / "prog.bc",
+                tmpdir / "rt.o",
+                "-o",
+                tmpdir / "prog",
+            ],
+        ]
+
+        start = time.perf_counter()
+
+        for cmd in commands:
+            subprocess.run([str(c) for c in cmd], check=True, capture_output=True)
+
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [str(tmpdir / "prog")], check=True, capture_output=True, text=True
+        )
+        elapsed = time.perf_counter() - start
+
+    return result.stdout, len(module), codegen, compile_time, elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    code = program(n)
+
+    table = Table(title=f"tablas de {n:,} elementos")
+    table.add_column("inicialización", style="cyan")
+    table.add_column("IR (KB)", justify="right")
+    table.add_column("codegen (s)", justify="right")
+    table.add_column("clang (s)", justify="right")
+    table.add_column("ejecución (s)", justify="right")
+
+    outputs = set()
+
+    for name, constant in (("set por elemento", False), ("memcpy", True)):
+        output, size, codegen, compile_time, elapsed = run(code, constant)
+        outputs.add(output)
+        table.add_row(
+            name,
+            f"{size / 1024:,.0f}",
+            f"{codegen:.3f}",
+            f"{compile_time:.3f}",
+            f"{elapsed:.3f}",
+        )
+
+    rich.print(table)
+
+    if len(outputs) != 1:
+        print(f"Salida diferente: {outputs}")
+        sys.exit(1)
@@ -0,0 +1,122 @@
+# Memoria y velocidad de los arrays del intérprete con una criba de 10M
+#
+#   python bench/array_storage.py [N] [backend]
+#
+# Compara los bytes por elemento de los arrays nativos (arrays.py) con
+# listas de Python y ejecuta la criba de Eratóstenes hasta N (por
+# defecto 10M, backend pyjit) reportando el tiempo y el pico de RSS.
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+
+from parser import Parser
+from parser.model import SimpleTypes
+
+import rich
+from rich.table import Table
+
+from interprete import Context, Interpreter
+from interprete.arrays import new_array
+from scanner import Lexer
+
+CODE = """
+N: integer = {n};
+isprime: array [N] boolean;
+primes: array [N] integer;
+
+i: integer;
+j: integer;
+count: integer = 0;
+
+for (i = 2; i < N; i++) {{
+    isprime[i] = true;
+}}
+
+for (i = 2; i * i < N; i++) {{
+    if (isprime[i]) {{
+        for (j = i * i; j < N; j = j + i) {{
+            isprime[j] = false;
+        }}
+    }}
+}}
+
+for (i = 2; i < N; i++) {{
+    if (isprime[i]) {{
+        primes[count] = i;
+        count++;
+    }}
+}}
+
+print count, " ", primes[count - 1];
+"""
+
+
+def allocated_bytes(make) -> int:
+    tracemalloc.start()
+    value = make()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del value
+    return size
+
+
+def storage_table(n: int) -> Table:
+    table = Table(title=f"bytes por elemento ({n:,} elementos)")
+    table.add_column("tipo", style="cyan")
+    table.add_column("lista", justify="right")
+    table.add_column("nativo", justify="right")
+    table.add_column("ahorro", justify="right", style="bright_green")
+
+    samples = {
+        SimpleTypes.FLOAT: lambda: [i * 0.5 for i in range(n)],
+        SimpleTypes.BOOLEAN: lambda: [i % 3 == 0 for i in range(n)],
+    }
+
+    for t, values in samples.items():
+        base = t.value
+        # valores distintos: en una lista cada float es un objeto aparte
+        boxed = allocated_bytes(values)
+        native = allocated_bytes(lambda: new_array(base, values()))
+
+        table.add_row(
+            base.name,
+            f"{boxed / n:.1f}",
+            f"{native / n:.1f}",
+            f"{boxed / native:.1f}x",
+        )
+
+    return table
+
+
+def run_sieve(n: int, backend: str):
+    code = CODE.format(n=n)
+    ast = Parser().parse(Lexer().tokenize(code))
+    out = []
+
+    start = time.perf_counter()
+    Interpreter(Context(code), out=out.append, backend=backend).interpret(ast)
+    elapsed = time.perf_counter() - start
+
+    return "".join(out), elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    backend = sys.argv[2] if len(sys.argv) > 2 else "pyjit"
+
+    rich.print(storage_table(min(n, 200_000)))
+
+    print(f"Criba hasta {n:,} con backend {backend}...")
+    output, elapsed = run_sieve(n, backend)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"Salida: {output}")
+    print(f"Tiempo: {elapsed:.2f}s ({n / elapsed:,.0f} elementos/s)")
+    print(f"Pico RSS: {peak_mb:.1f} MB")
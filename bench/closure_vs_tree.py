@@ -0,0 +1,99 @@
+# Compara el intérprete de árbol con el backend de closures
+#
+#   python bench/closure_vs_tree.py [repeticiones] [archivo.bminor ...]
+#
+# Por defecto usa todos los programas de bminor-examples. Verifica que
+# ambos backends produzcan la misma salida y reporta el mejor tiempo.
+import glob
+import io
+import os
+import re
+import sys
+import time
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+
+from parser import Parser
+
+import rich
+from rich.table import Table
+
+from interprete import Context, Interpreter
+from scanner import Lexer
+from utils import clear_errors, errors_detected
+
+
+def load(filename: str) -> str:
+    with open(filename) as f:
+        code = f.read()
+
+    # como en el backend IR, llamar main() si el programa no lo hace
+    has_main = re.search(r"^\s*main\s*:\s*function", code, re.M)
+    calls_main = re.search(r"^\s*main\s*\(\s*\)\s*;", code, re.M)
+
+    if has_main and not calls_main:
+        code += "\nmain();\n"
+
+    return code
+
+
+def run(code: str, backend: str):
+    clear_errors()
+    ast = Parser().parse(Lexer().tokenize(code))
+    out = io.StringIO()
+
+    start = time.perf_counter()
+    Interpreter(Context(code), out=out, backend=backend).interpret(ast)
+    elapsed = time.perf_counter() - start
+
+    if errors_detected():
+        return None, None
+
+    return elapsed, out.getvalue()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    reps = int(args.pop(0)) if args and args[0].isdigit() else 5
+    files = args or sorted(
+        glob.glob(os.path.join(project_root, "bminor-examples", "*.bminor"))
+    )
+
+    table = Table(title=f"tree vs closure (mejor de {reps})")
+    table.add_column("programa", style="cyan")
+    table.add_column("tree (ms)", justify="right")
+    table.add_column("closure (ms)", justify="right")
+    table.add_column("speedup", justify="right", style="bright_green")
+
+    for filename in files:
+        code = load(filename)
+        best = {}
+        outputs = {}
+
+        for backend in ("tree", "closure"):
+            times = []
+
+            for _ in range(reps):
+                elapsed, outputs[backend] = run(code, backend)
+                times.append(elapsed)
+
+            best[backend] = None if None in times else min(times)
+
+        if None in best.values():
+            # programas de ejemplo con errores semánticos a propósito
+            table.add_row(os.path.basename(filename), "error", "error", "-")
+            continue
+        elif outputs["tree"] != outputs["closure"]:
+            print(f"Salida diferente entre backends en {filename}")
+            sys.exit(1)
+
+        table.add_row(
+            os.path.basename(filename),
+            f"{best['tree'] * 1000:.2f}",
+            f"{best['closure'] * 1000:.2f}",
+            f"{best['tree'] / best['closure']:.1f}x",
+        )
+
+    rich.print(table)
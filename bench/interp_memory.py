@@ -0,0 +1,98 @@
+# Verifica que el intérprete ejecute un bucle largo con memoria (RSS) constante
+#
+#   python bench/interp_memory.py [iteraciones]
+#
+# La salida del programa va a un callback que la descarta y cada cierto
+# número de prints se toma una muestra del RSS del proceso.
+import os
+import resource
+import sys
+import time
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+
+from parser import Parser
+
+from interprete import Context, Interpreter
+from scanner import Lexer
+
+CODE = """
+N: integer = {n};
+i: integer;
+total: integer = 0;
+
+step: function integer (x: integer) = {{
+    return x % 7;
+}}
+
+for (i = 0; i < N; i++) {{
+    if (i % 2 == 0) {{
+        tmp: integer = step(i);
+        total = total + tmp;
+    }} else {{
+        {{ s: string = "x"; }}
+    }}
+
+    print i % 10;
+}}
+"""
+
+SAMPLES = 20
+
+
+def current_rss_kb() -> int:
+    """RSS actual en KB (Linux), con respaldo al pico de getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run(n: int):
+    code = CODE.format(n=n)
+    ast = Parser().parse(Lexer().tokenize(code))
+
+    every = max(n // SAMPLES, 1)
+    samples = []
+    count = 0
+
+    def sink(text):
+        nonlocal count
+        count += 1
+
+        if count % every == 0:
+            samples.append(current_rss_kb())
+
+    start = time.perf_counter()
+    Interpreter(Context(code), out=sink).interpret(ast)
+    elapsed = time.perf_counter() - start
+
+    return samples, elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    print(f"Ejecutando {n} iteraciones...")
+    samples, elapsed = run(n)
+
+    if not samples:
+        print("Sin muestras, aumente el número de iteraciones")
+        sys.exit(1)
+
+    # descartar la primera muestra: incluye el calentamiento
+    steady = samples[1:] or samples
+    growth = max(steady) - min(steady)
+
+    print(f"Tiempo: {elapsed:.2f}s ({n / elapsed:,.0f} it/s)")
+    print(f"RSS muestras (KB): {samples}")
+    print(f"Crecimiento RSS: {growth} KB")
+
+    # tolerancia para el ruido del allocator de Python
+    if growth > 4 * 1024:
+        print("El RSS crece con las iteraciones")
+        sys.exit(1)
@@ -0,0 +1,93 @@
+# Generación de IR en serie y en paralelo sobre un programa sintético
+#
+#   python bench/parallel_codegen.py [funciones] [--optimize]
+#
+# Mide desde el AST revisado hasta el módulo de llvmlite.binding listo
+# (y optimizado con --optimize), con 1, 2, 4 y 8 procesos.
+import os
+import sys
+import time
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+sys.setrecursionlimit(100_000)
+
+from parser import Parser
+
+import llvmlite.binding as llvm
+import rich
+from rich.table import Table
+
+from ir import IRGenerator
+from ir.parallel import generate_parallel, optimize_module
+from scanner import Lexer
+from semantic import Check
+
+FUNCTION = """
+f{i}: function integer (n: integer, s: string) = {{
+    i: integer;
+    acc: integer = {i};
+    for (i = 0; i < n; i++) {{
+        if (i % 3 == 0) {{
+            acc = acc + i * 2 + table[i % 4];
+        }} else {{
+            acc = acc - 1;
+        }}
+    }}
+    total = total + acc;
+    return acc;
+}}
+"""
+
+
+def synthetic(n: int) -> str:
+    code = ["total: integer = 0;\ntable: array [4] integer = {1, 2, 3, 4};\n"]
+    code += [FUNCTION.format(i=i) for i in range(n)]
+    calls = "".join(f'    print f{i}(5, "x"), " ";\n' for i in range(0, n, 97))
+    code.append(f"main: function integer () = {{\n{calls}    return 0;\n}}\n")
+
+    return "".join(code)
+
+
+def front(code: str):
+    ast = Parser().parse(Lexer().tokenize(code))
+    return Check.checker(ast, return_ast=True)
+
+
+def serial(ast, env, optimize: bool):
+    module = llvm.parse_assembly(str(IRGenerator.Generate(ast, env, None)))
+
+    if optimize:
+        optimize_module(module)
+
+    return module
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    n = int(args[0]) if args else 10_000
+    optimize = "--optimize" in sys.argv
+    code = synthetic(n)
+
+    table = Table(
+        title=f"generación de {n:,} funciones ({os.cpu_count()} CPUs, optimizar={optimize})"
+    )
+    table.add_column("procesos", style="cyan")
+    table.add_column("tiempo (s)", justify="right")
+    table.add_column("aceleración", justify="right")
+
+    env, ast = front(code)
+    start = time.perf_counter()
+    serial(ast, env, optimize)
+    base = time.perf_counter() - start
+    table.add_row("serie", f"{base:.2f}", "1.00x")
+
+    for jobs in (1, 2, 4, 8):
+        env, ast = front(code)
+        start = time.perf_counter()
+        generate_parallel(ast, env, jobs, optimize)
+        elapsed = time.perf_counter() - start
+        table.add_row(str(jobs), f"{elapsed:.2f}", f"{base / elapsed:.2f}x")
+
+    rich.print(table)
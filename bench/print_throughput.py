@@ -0,0 +1,89 @@
+# Salida de print con un printf por valor o con el buffer del runtime
+#
+#   python bench/print_throughput.py [cantidad]
+#
+# El programa imprime los enteros de 0 a cantidad separados por un
+# espacio. La versión con printf se compila con -DBMINOR_PRINTF.
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+
+import rich
+from rich.table import Table
+
+from ir import IRGenerator
+
+CODE = """
+main: function integer () = {{
+    i: integer;
+
+    for (i = 0; i < {n}; i++) {{
+        print i, " ";
+    }}
+
+    return 0;
+}}
+"""
+
+
+def run(module, defines: list):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / "prog.ll").write_text(str(module))
+
+        runtime_c = Path(project_root) / "ir" / "runtime.c"
+        commands = [
+            ["llvm-as", tmpdir / "prog.ll", "-o", tmpdir / "prog.bc"],
+            ["clang", "-O2", *defines, "-c", runtime_c, "-o", tmpdir / "rt.o"],
+            [
+                "clang",
+                "-O2",
+                tmpdir / "prog.bc",
+                tmpdir / "rt.o",
+                "-o",
+                tmpdir / "prog",
+            ],
+        ]
+
+        for cmd in commands:
+            subprocess.run([str(c) for c in cmd], check=True, capture_output=True)
+
+        with open(tmpdir / "out.txt", "wb") as out:
+            start = time.perf_counter()
+            subprocess.run([str(tmpdir / "prog")], check=True, stdout=out)
+            elapsed = time.perf_counter() - start
+
+        data = (tmpdir / "out.txt").read_bytes()
+
+    return hashlib.sha256(data).hexdigest(), len(data), elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    module = IRGenerator().generate_from_code(CODE.format(n=n))
+
+    table = Table(title=f"print de {n:,} enteros")
+    table.add_column("runtime", style="cyan")
+    table.add_column("tiempo (s)", justify="right")
+    table.add_column("MB/s", justify="right")
+
+    outputs = set()
+
+    for name, defines in (("printf", ["-DBMINOR_PRINTF"]), ("buffer", [])):
+        digest, size, elapsed = run(module, defines)
+        outputs.add(digest)
+        table.add_row(name, f"{elapsed:.3f}", f"{size / elapsed / 1e6:.1f}")
+
+    rich.print(table)
+
+    if len(outputs) != 1:
+        print("Salida diferente")
+        sys.exit(1)
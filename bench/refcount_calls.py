@@ -0,0 +1,124 @@
+# Llamadas a _bminor_array_incref/decref ejecutadas, con y sin omitir los
+# pares alrededor de llamadas a funciones que no retienen el array
+#
+#   python bench/refcount_calls.py [iteraciones]
+#
+# El runtime se compila con -DBMINOR_COUNT_CALLS, que cuenta las llamadas
+# y las reporta en stderr al terminar el programa.
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+
+from parser import Parser
+
+import rich
+from rich.table import Table
+
+from ir import IRGenerator
+from scanner import Lexer
+from semantic import Check
+
+CODE = """
+sum: function integer (a: array [] integer) = {{
+    i: integer;
+    total: integer = 0;
+    for (i = 0; i < array_length(a); i++) {{
+        total = total + a[i];
+    }}
+    return total;
+}}
+
+make: function array [4] integer () = {{
+    a: array [4] integer = {{1, 2, 3, 4}};
+    return a;
+}}
+
+main: function integer () = {{
+    a: array [4] integer = {{1, 2, 3, 4}};
+    i: integer;
+    total: integer = 0;
+
+    for (i = 0; i < {n}; i++) {{
+        total = total + sum(a) + sum(make());
+    }}
+
+    print total;
+    return 0;
+}}
+"""
+
+
+def run(code: str, optimize: bool):
+    ast = Parser().parse(Lexer().tokenize(code))
+    env, ast = Check.checker(ast, return_ast=True)
+    module = IRGenerator.Generate(ast, env, None, optimize_refcounts=optimize)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / "prog.ll").write_text(str(module))
+
+        runtime_c = Path(project_root) / "ir" / "runtime.c"
+        commands = [
+            ["llvm-as", tmpdir / "prog.ll", "-o", tmpdir / "prog.bc"],
+            [
+                "clang",
+                "-O2",
+                "-DBMINOR_COUNT_CALLS",
+                "-c",
+                runtime_c,
+                "-o",
+                tmpdir / "rt.o",
+            ],
+            [
+                "clang",
+                "-O2",
+                tmpdir / "prog.bc",
+                tmpdir / "rt.o",
+                "-o",
+                tmpdir / "prog",
+            ],
+        ]
+
+        for cmd in commands:
+            subprocess.run([str(c) for c in cmd], check=True, capture_output=True)
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [str(tmpdir / "prog")], check=True, capture_output=True, text=True
+        )
+        elapsed = time.perf_counter() - start
+
+    counts = dict(re.findall(r"(incref|decref)=(\d+)", result.stderr))
+    return result.stdout, int(counts["incref"]), int(counts["decref"]), elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    code = CODE.format(n=n)
+
+    table = Table(title=f"llamadas de conteo de referencias ({n:,} iteraciones)")
+    table.add_column("versión", style="cyan")
+    table.add_column("incref", justify="right")
+    table.add_column("decref", justify="right")
+    table.add_column("tiempo (s)", justify="right")
+
+    outputs = set()
+
+    for name, optimize in (("antes", False), ("después", True)):
+        output, incref, decref, elapsed = run(code, optimize)
+        outputs.add(output)
+        table.add_row(name, f"{incref:,}", f"{decref:,}", f"{elapsed:.3f}")
+
+    rich.print(table)
+
+    if len(outputs) != 1:
+        print(f"Salida diferente: {outputs}")
+        sys.exit(1)
@@ -0,0 +1,102 @@
+# Strings temporales con malloc/free o en la arena del runtime
+#
+#   python bench/string_arena.py [iteraciones]
+#
+# Cada iteración concatena cuatro strings y pasa el resultado a una
+# función que solo lo lee: tres concatenaciones temporales por iteración.
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+
+from parser import Parser
+
+import rich
+from rich.table import Table
+
+from ir import IRGenerator
+from scanner import Lexer
+from semantic import Check
+
+CODE = """
+weight: function integer (s: string) = {{
+    return 1;
+}}
+
+main: function integer () = {{
+    a: string = "hola";
+    b: string = " mundo";
+    i: integer;
+    total: integer = 0;
+
+    for (i = 0; i < {n}; i++) {{
+        total = total + weight(a + b + " cruel" + "!");
+    }}
+
+    print total;
+    return 0;
+}}
+"""
+
+
+def run(code: str, allocation: str):
+    ast = Parser().parse(Lexer().tokenize(code))
+    env, ast = Check.checker(ast, return_ast=True)
+    module = IRGenerator.Generate(ast, env, None, allocation=allocation)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / "prog.ll").write_text(str(module))
+
+        runtime_c = Path(project_root) / "ir" / "runtime.c"
+        commands = [
+            ["llvm-as", tmpdir / "prog.ll", "-o", tmpdir / "prog.bc"],
+            ["clang", "-O2", "-c", runtime_c, "-o", tmpdir / "rt.o"],
+            [
+                "clang",
+                "-O2",
+                tmpdir / "prog.bc",
+                tmpdir / "rt.o",
+                "-o",
+                tmpdir / "prog",
+            ],
+        ]
+
+        for cmd in commands:
+            subprocess.run([str(c) for c in cmd], check=True, capture_output=True)
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [str(tmpdir / "prog")], check=True, capture_output=True, text=True
+        )
+        elapsed = time.perf_counter() - start
+
+    return result.stdout, elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    code = CODE.format(n=n)
+
+    table = Table(title=f"strings temporales ({n:,} iteraciones)")
+    table.add_column("estrategia", style="cyan")
+    table.add_column("tiempo (s)", justify="right")
+
+    outputs = set()
+
+    for allocation in ("malloc", "arena"):
+        output, elapsed = run(code, allocation)
+        outputs.add(output)
+        table.add_row(allocation, f"{elapsed:.3f}")
+
+    rich.print(table)
+
+    if len(outputs) != 1:
+        print(f"Salida diferente: {outputs}")
+        sys.exit(1)
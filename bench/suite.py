@@ -0,0 +1,461 @@
+# Benchmark de todas las fases del compilador y de ambos motores
+#
+#   python bench/suite.py run [--out resultados.json] [--repeat N]
+#                             [--filter nombre] [--backends tree,closure,pyjit]
+#                             [--generated N] [--cflags "-O2"]
+#   python bench/suite.py compare antes.json despues.json [--threshold 0.10]
+#   python bench/suite.py pgo [--repeat N] [--filter nombre] [--runs N]
+#
+# run mide por separado, con el mejor de N repeticiones, cada fase sobre
+# los programas de bench/programs y un programa generado de N funciones:
+#
+#   lex       Lexer.tokenize
+#   parse     Parser.parse
+#   check     Check.checker
+#   codegen   IRGenerator.Generate (incluye inlining, licm y el texto del IR)
+#   compile   llvm-as + clang con el runtime ya compilado
+#   run       ejecución del binario nativo
+#   tree, closure, pyjit   Interpreter.interpret con cada backend
+#
+# y guarda los tiempos en JSON. compare marca las fases que empeoran más
+# de threshold (y más de --min-ms) entre dos corridas y termina con
+# código 1 si hay alguna. pgo compila cada programa con --build y con
+# --build --pgo (entrenado con el mismo programa) y compara la ejecución.
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+sys.setrecursionlimit(100_000)
+
+from parser import Parser
+
+import rich
+from rich.table import Table
+
+from interprete import Context, Interpreter
+from ir import IRGenerator
+from ir.build import BuildError, build, build_pgo
+from scanner import Lexer
+from semantic import Check
+from utils import clear_errors, errors_detected
+
+VERSION = 1
+FRONT = ("lex", "parse", "check", "codegen")
+NATIVE = ("compile", "run")
+BACKENDS = ("tree", "closure", "pyjit")
+
+FUNCTION = """
+f{i}: function integer (n: integer, s: string) = {{
+    i: integer;
+    acc: integer = {i};
+    for (i = 0; i < n; i++) {{
+        if (i % 3 == 0) {{
+            acc = acc + i * 2 + table[i % 4];
+        }} else {{
+            acc = acc - 1;
+        }}
+    }}
+    total = total + acc;
+    return acc;
+}}
+"""
+
+
+def generated(n: int) -> str:
+    """Programa grande de n funciones, para medir sobre todo el front-end"""
+    code = ["total: integer = 0;\ntable: array [4] integer = {1, 2, 3, 4};\n"]
+    code += [FUNCTION.format(i=i) for i in range(n)]
+    calls = "".join(f'    print f{i}(5, "x"), " ";\n' for i in range(0, n, 97))
+    code.append(f'main: function integer () = {{\n{calls}    print "\\n";\n')
+    code.append("    return 0;\n}\n")
+
+    return "".join(code)
+
+
+def corpus(filter_: str | None, functions: int) -> dict:
+    """Nombre -> código fuente"""
+    programs = {}
+
+    for filename in sorted(glob.glob(os.path.join(base_dir, "programs", "*.bminor"))):
+        with open(filename) as f:
+            programs[Path(filename).stem] = f.read()
+
+    if functions:
+        programs[f"generated_{functions}"] = generated(functions)
+
+    return {
+        name: code for name, code in programs.items() if not filter_ or filter_ in name
+    }
+
+
+def with_main_call(code: str) -> str:
+    """Como en el backend IR, llamar main() si el programa no lo hace"""
+    has_main = re.search(r"^\s*main\s*:\s*function", code, re.M)
+    calls_main = re.search(r"^\s*main\s*\(\s*\)\s*;", code, re.M)
+
+    return code + "\nmain();\n" if has_main and not calls_main else code
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+
+    return time.perf_counter() - start, result
+
+
+def summary(samples: list) -> dict:
+    return {"min": min(samples), "median": statistics.median(samples)}
+
+
+class Native:
+    """Compilación con llvm-as y clang, como ir/runner.py"""
+
+    def __init__(self, cflags: list, tmpdir: Path):
+        self.cflags = cflags
+        self.tmpdir = tmpdir
+        self.available = bool(shutil.which("llvm-as") and shutil.which("clang"))
+
+        if self.available:
+            self.runtime = tmpdir / "runtime.o"
+            runtime_c = os.path.join(project_root, "ir", "runtime.c")
+            self._cmd(["clang", *cflags, "-c", runtime_c, "-o", str(self.runtime)])
+
+    def _cmd(self, cmd: list) -> str:
+        return subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+
+    def compile(self, name: str, ir_code: str) -> Path:
+        ir_path = self.tmpdir / f"{name}.ll"
+        bc_path = self.tmpdir / f"{name}.bc"
+        exe_path = self.tmpdir / name
+
+        ir_path.write_text(ir_code)
+        self._cmd(["llvm-as", str(ir_path), "-o", str(bc_path)])
+        self._cmd(
+            [
+                "clang",
+                *self.cflags,
+                str(bc_path),
+                str(self.runtime),
+                "-o",
+                str(exe_path),
+            ]
+        )
+
+        return exe_path
+
+    def run(self, exe: Path) -> str:
+        return self._cmd([str(exe)])
+
+
+def front_end(code: str) -> tuple:
+    """Tiempos de lex, parse, check y codegen, y el IR generado"""
+    times = {}
+
+    times["lex"], tokens = timed(lambda: list(Lexer().tokenize(code)))
+    times["parse"], ast = timed(Parser().parse, iter(tokens))
+
+    if errors_detected():
+        return times, None
+
+    times["check"], (env, ast) = timed(lambda: Check.checker(ast, return_ast=True))
+
+    if errors_detected():
+        return times, None
+
+    times["codegen"], ir_code = timed(lambda: str(IRGenerator.Generate(ast, env, None)))
+
+    return times, None if errors_detected() else ir_code
+
+
+def interpret(code: str, backend: str) -> tuple:
+    """Tiempo de Interpreter.interpret y salida del programa"""
+    ast = Parser().parse(Lexer().tokenize(code))
+    out = io.StringIO()
+    interp = Interpreter(Context(code), out=out, backend=backend)
+    elapsed, _ = timed(interp.interpret, ast)
+
+    return elapsed, out.getvalue()
+
+
+def bench_program(name: str, code: str, args, native: Native) -> dict:
+    samples = {}
+    result = {"phases": {}, "errors": []}
+    ir_code = None
+
+    for _ in range(args.repeat):
+        clear_errors()
+        times, ir_code = front_end(code)
+
+        for phase, elapsed in times.items():
+            samples.setdefault(phase, []).append(elapsed)
+
+        if ir_code is None:
+            result["errors"].append("front-end")
+            return result
+
+    outputs = {}
+
+    if native.available:
+        try:
+            for _ in range(args.repeat):
+                elapsed, exe = timed(native.compile, name, ir_code)
+                samples.setdefault("compile", []).append(elapsed)
+
+                elapsed, outputs["native"] = timed(native.run, exe)
+                samples.setdefault("run", []).append(elapsed)
+        except subprocess.CalledProcessError as e:
+            result["errors"].append(f"native: {(e.stderr or '').strip()[:200]}")
+
+    source = with_main_call(code)
+
+    for backend in args.backends:
+        for _ in range(args.repeat):
+            clear_errors()
+            elapsed, outputs[backend] = interpret(source, backend)
+
+            if errors_detected():
+                result["errors"].append(backend)
+                break
+
+            samples.setdefault(backend, []).append(elapsed)
+
+    result["phases"] = {phase: summary(values) for phase, values in samples.items()}
+    result["outputs_match"] = len(set(outputs.values())) <= 1
+
+    return result
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=project_root,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.2f}"
+
+
+def cmd_run(args):
+    programs = corpus(args.filter, args.generated)
+    phases = FRONT + NATIVE + tuple(args.backends)
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        native = Native(args.cflags.split(), Path(tmpdir))
+
+        if not native.available:
+            print("llvm-as o clang no encontrados: se omiten compile y run")
+
+        for name, code in programs.items():
+            results[name] = bench_program(name, code, args, native)
+
+            for message in results[name]["errors"]:
+                print(f"{name}: error en {message}")
+            if not results[name].get("outputs_match", True):
+                print(f"{name}: la salida difiere entre motores")
+
+    table = Table(title=f"tiempos en ms (mejor de {args.repeat})")
+    table.add_column("fase", style="cyan")
+
+    for name in results:
+        table.add_column(name, justify="right")
+
+    for phase in phases:
+        table.add_row(
+            phase,
+            *(
+                ms(result["phases"].get(phase, {}).get("min"))
+                for result in results.values()
+            ),
+        )
+
+    rich.print(table)
+
+    data = {
+        "version": VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "cflags": args.cflags,
+        "programs": results,
+    }
+
+    with open(args.out, "w") as f:
+        json.dump(data, f, indent=2)
+
+    print(f"Resultados en {args.out}")
+
+
+def cmd_compare(args):
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    table = Table(title=f"{old.get('git')} -> {new.get('git')} (ms, mínimo)")
+    table.add_column("programa", style="cyan")
+    table.add_column("fase")
+    table.add_column("antes", justify="right")
+    table.add_column("después", justify="right")
+    table.add_column("cambio", justify="right")
+
+    regressions = 0
+
+    for name, result in new["programs"].items():
+        before = old["programs"].get(name, {}).get("phases", {})
+
+        for phase, times in result["phases"].items():
+            if phase not in before:
+                continue
+
+            a, b = before[phase]["min"], times["min"]
+            change = b / a - 1 if a else 0.0
+            slower = change > args.threshold and (b - a) * 1000 > args.min_ms
+
+            if slower:
+                regressions += 1
+                style = "bright_red"
+            elif change < -args.threshold:
+                style = "bright_green"
+            else:
+                style = None
+
+            table.add_row(name, phase, ms(a), ms(b), f"{change:+.1%}", style=style)
+
+    rich.print(table)
+
+    if regressions:
+        print(f"{regressions} fases más lentas que el umbral de {args.threshold:.0%}")
+        sys.exit(1)
+
+    print("Sin regresiones")
+
+
+def cmd_pgo(args):
+    programs = corpus(args.filter, args.generated)
+
+    table = Table(title=f"ejecución en ms (mejor de {args.repeat})")
+    table.add_column("programa", style="cyan")
+    table.add_column("-O2", justify="right")
+    table.add_column("PGO", justify="right")
+    table.add_column("speedup", justify="right")
+
+    speedups = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+
+        for name, code in programs.items():
+            source = tmpdir / f"{name}.bminor"
+            source.write_text(code)
+            exes = {"-O2": tmpdir / f"{name}_o2", "PGO": tmpdir / f"{name}_pgo"}
+
+            try:
+                clear_errors()
+                build([source], tmpdir / "o2", exes["-O2"])
+                clear_errors()
+                build_pgo([source], tmpdir / "pgo", exes["PGO"], args.runs)
+            except (BuildError, subprocess.CalledProcessError) as e:
+                print(f"{name}: error al compilar: {e}")
+                continue
+
+            best, outputs = {}, set()
+
+            for kind, exe in exes.items():
+                samples = []
+
+                for _ in range(args.repeat):
+                    elapsed, output = timed(
+                        subprocess.run, [str(exe)], capture_output=True, text=True
+                    )
+                    samples.append(elapsed)
+                    outputs.add(output.stdout)
+
+                best[kind] = min(samples)
+
+            if len(outputs) > 1:
+                print(f"{name}: la salida difiere con PGO")
+
+            speedup = best["-O2"] / best["PGO"]
+            speedups.append(speedup)
+            table.add_row(name, ms(best["-O2"]), ms(best["PGO"]), f"{speedup:.2f}x")
+
+    if speedups:
+        mean = statistics.geometric_mean(speedups)
+        table.add_row("media geométrica", "", "", f"{mean:.2f}x", style="bold")
+
+    rich.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del compilador B-minor")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="medir y guardar los tiempos en JSON")
+    run.add_argument("--out", default="bench_results.json")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--filter", help="solo programas cuyo nombre contiene el texto")
+    run.add_argument(
+        "--backends",
+        default=",".join(BACKENDS),
+        type=lambda value: [b for b in value.split(",") if b],
+        help="backends del intérprete separados por coma",
+    )
+    run.add_argument(
+        "--generated",
+        type=int,
+        default=300,
+        help="funciones del programa generado, 0 para omitirlo",
+    )
+    run.add_argument("--cflags", default="-O2", help="opciones de clang")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="comparar dos corridas")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.10)
+    compare.add_argument(
+        "--min-ms",
+        type=float,
+        default=1.0,
+        help="ignorar diferencias menores (ruido de fases muy cortas)",
+    )
+    compare.set_defaults(func=cmd_compare)
+
+    pgo = commands.add_parser("pgo", help="speedup de --build --pgo sobre --build")
+    pgo.add_argument("--repeat", type=int, default=5)
+    pgo.add_argument("--filter", help="solo programas cuyo nombre contiene el texto")
+    pgo.add_argument("--generated", type=int, default=0)
+    pgo.add_argument("--runs", type=int, default=1, help="ejecuciones de entrenamiento")
+    pgo.set_defaults(func=cmd_pgo)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# Bucles sobre arrays de integer y float con y sin la copia del for que
+# no revisa el rango de a[i] (ir/array_loops.py), que LLVM puede vectorizar
+#
+#   python bench/vector_kernels.py [repeticiones]
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+base_dir = os.path.dirname(__file__)
+project_root = os.path.abspath(os.path.join(base_dir, ".."))
+sys.path.insert(0, project_root)
+
+from parser import Parser
+
+import rich
+from rich.table import Table
+
+from ir import IRGenerator
+from scanner import Lexer
+from semantic import Check
+
+N = 10_000
+
+CODE = """
+N: integer = {n};
+
+isum: function integer (a: array [] integer) = {{
+    i: integer;
+    total: integer = 0;
+    for (i = 0; i < array_length(a); i++) {{
+        total = total + a[i];
+    }}
+    return total;
+}}
+
+saxpy: function void (k: float, xs: array [] float, ys: array [] float) = {{
+    i: integer;
+    for (i = 0; i < array_length(ys); i++) {{
+        ys[i] = k * xs[i] + ys[i];
+    }}
+}}
+
+main: function integer () = {{
+    a: array [{n}] integer;
+    xs: array [{n}] float;
+    ys: array [{n}] float;
+    i: integer;
+    r: integer;
+    total: integer = 0;
+
+    for (i = 0; i < N; i++) {{
+        a[i] = i % 7;
+        xs[i] = 0.5;
+        ys[i] = 0.0;
+    }}
+    for (r = 0; r < {repeat}; r++) {{
+        total = total + isum(a);
+        saxpy(0.001, xs, ys);
+    }}
+
+    print total, " ", ys[N - 1], "\\n";
+    return 0;
+}}
+"""
+
+
+def run(code: str, vectorize: bool):
+    ast = Parser().parse(Lexer().tokenize(code))
+    env, ast = Check.checker(ast, return_ast=True)
+    module = IRGenerator.Generate(ast, env, None, vectorize=vectorize)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / "prog.ll").write_text(str(module))
+
+        runtime_c = Path(project_root) / "ir" / "runtime.c"
+        commands = [
+            ["llvm-as", tmpdir / "prog.ll", "-o", tmpdir / "prog.bc"],
+            ["clang", "-O2", "-c", runtime_c, "-o", tmpdir / "rt.o"],
+            [
+                "clang",
+                "-O2",
+                tmpdir / "prog.bc",
+                tmpdir / "rt.o",
+                "-o",
+                tmpdir / "prog",
+            ],
+        ]
+
+        for cmd in commands:
+            subprocess.run([str(c) for c in cmd], check=True, capture_output=True)
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [str(tmpdir / "prog")], check=True, capture_output=True, text=True
+        )
+        elapsed = time.perf_counter() - start
+
+    vector_loops = str(module).count("!llvm.loop !")
+    return result.stdout, vector_loops, elapsed
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    code = CODE.format(n=N, repeat=repeat)
+
+    table = Table(title=f"bucles sobre arrays de {N:,} elementos ({repeat:,} veces)")
+    table.add_column("versión", style="cyan")
+    table.add_column("bucles vectorizables", justify="right")
+    table.add_column("tiempo (s)", justify="right")
+
+    outputs = set()
+    times = []
+
+    for name, vectorize in (("con revisión", False), ("sin revisión", True)):
+        output, loops, elapsed = run(code, vectorize)
+        outputs.add(output)
+        times.append(elapsed)
+        table.add_row(name, str(loops), f"{elapsed:.3f}")
+
+    rich.print(table)
+    print(f"speedup: {times[0] / times[1]:.2f}x")
+
+    if len(outputs) != 1:
+        print(f"Salida diferente: {outputs}")
+        sys.exit(1)
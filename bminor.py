@@ -8,11 +8,61 @@ from parser import ASTPrinter, Parser
 import rich
 from rich.table import Table
 
-from interprete import Context, Interpreter
-from ir import IRGenerator, run_llvm_clang_ir
+from interprete import Context, Interpreter, Profiler, set_default_backend
+from ir import (
+    IRGenerator,
+    run_llvm_clang_ir,
+    run_llvm_module,
+    set_allocation_strategy,
+    set_runtime_lto,
+    set_runtime_stats,
+)
+from ir.build import BuildError, build, build_pgo
+from ir.parallel import generate_parallel
 from scanner import Lexer
-from semantic import Check
-from utils import print_json
+from semantic import Check, hoist_invariants, inline_calls
+from semantic.purity import walk
+from utils import PhaseReport, print_json, timed_phase
+
+
+def print_inlined(inlined: list):
+    """Llamadas reemplazadas por el cuerpo de la función (--inline-report)"""
+    t = Table(title="Funciones en línea", show_header=True, header_style="blue")
+    t.add_column("Línea", justify="right")
+    t.add_column("Llamador")
+    t.add_column("Función")
+
+    for lineno, caller, callee in inlined:
+        t.add_row(str(lineno), caller or "(global)", callee)
+
+    rich.print(t)
+
+
+def time_report() -> PhaseReport | None:
+    """PhaseReport ya iniciado si se pidió --time-report o --time-report-json"""
+    if "--time-report" not in sys.argv and "--time-report-json" not in sys.argv:
+        return None
+
+    report = PhaseReport()
+    report.start()
+
+    return report
+
+
+def finish_report(report: PhaseReport | None):
+    if report is None:
+        return
+
+    report.stop()
+    report.print()
+
+    if "--time-report-json" in sys.argv:
+        report.save(sys.argv[sys.argv.index("--time-report-json") + 1])
+
+
+def count_ir_instructions(module) -> int:
+    """Instrucciones de un módulo de llvmlite.ir o llvmlite.binding"""
+    return sum(1 for f in module.functions for b in f.blocks for _ in b.instructions)
 
 
 def run_scan(filename):
@@ -134,15 +184,82 @@ def run_semantic(filename):
 
 
 def run_ir(filename):
+    if "--arena" in sys.argv:
+        # strings temporales en la arena del runtime, aplica también a los tests
+        set_allocation_strategy("arena")
+
+    if "--no-lto" in sys.argv:
+        # runtime.o enlazado por separado, sin optimizar junto al programa
+        set_runtime_lto(False)
+
+    if "--rt-stats" in sys.argv:
+        # runtime con estadísticas de memoria; en los tests, fallar si hay fugas
+        set_runtime_stats("check" if filename == "test" else "report")
+
     if filename.endswith(".bminor"):
+        report = time_report()
+
         try:
-            gen = IRGenerator().generate_from_code(open(filename).read())
+            code = open(filename).read()
+
+            with timed_phase(report, "lex"):
+                tokens = list(Lexer().tokenize(code))
+            with timed_phase(report, "parse"):
+                ast = Parser().parse(iter(tokens))
+            with timed_phase(report, "check"):
+                env, ast = Check.checker(ast, return_ast=True)
+
+            if report:
+                report.count("tokens", len(tokens))
+                report.count("nodos AST", sum(1 for _ in walk(ast)))
+
+            # funciones pequeñas en línea e invariantes fuera de los bucles,
+            # salvo con --no-inline / --no-licm; --instrument no usa inline
+            # para contar las llamadas de cada función
+            inlined = []
+
+            if "--no-inline" not in sys.argv and "--instrument" not in sys.argv:
+                with timed_phase(report, "inline"):
+                    inlined = inline_calls(ast)
+            if "--no-licm" not in sys.argv:
+                with timed_phase(report, "licm"):
+                    hoist_invariants(ast)
+
+            # contadores de llamadas y tiempo por función en el runtime
+            options = {
+                "inline": False,
+                "licm": False,
+                "instrument": "--instrument" in sys.argv,
+                "vectorize": "--no-vectorize" not in sys.argv,
+                "stack_arrays": "--no-stack-arrays" not in sys.argv,
+            }
+
+            with timed_phase(report, "codegen"):
+                if "--jobs" in sys.argv:
+                    # funciones generadas en paralelo y enlazadas con llvmlite
+                    jobs = int(sys.argv[sys.argv.index("--jobs") + 1])
+                    gen = generate_parallel(ast, env, jobs, **options)
+                    run = run_llvm_module
+                else:
+                    gen = IRGenerator.Generate(ast, env, None, **options)
+                    run = lambda module, **kwargs: run_llvm_clang_ir(
+                        str(module), **kwargs
+                    )
+
+            if report:
+                report.count("nodos AST optimizado", sum(1 for _ in walk(ast)))
+                report.count("instrucciones IR", count_ir_instructions(gen))
+
+            if "--inline-report" in sys.argv:
+                print_inlined(inlined)
 
             if "--print" in sys.argv:
                 print(str(gen))
             if "--run" in sys.argv:
-                out = run_llvm_clang_ir(str(gen), add_runtime=True)
+                out = run(gen, add_runtime=True, report=report)
                 print(out)
+
+            finish_report(report)
         except Exception as e:
             print(f"Error: {repr(e)}\n{e}")
             sys.exit(1)
@@ -165,16 +282,63 @@ def run_ir(filename):
 
 
 def run_interprete(filename):
+    if "--closure" in sys.argv:
+        # compilar a closures en vez de recorrer el AST, aplica también a los tests
+        set_default_backend("closure")
+    elif "--pyjit" in sys.argv:
+        # traducir a código fuente de Python y ejecutarlo con exec()
+        set_default_backend("pyjit")
+
     if filename.endswith(".bminor"):
+        report = time_report()
+
         try:
-            parser = Parser()
             code = open(filename).read()
 
-            tokens = Lexer().tokenize(code)
-            ast = parser.parse(tokens)
+            with timed_phase(report, "lex"):
+                tokens = list(Lexer().tokenize(code))
+            with timed_phase(report, "parse"):
+                ast = Parser().parse(iter(tokens))
+
+            if report:
+                report.count("tokens", len(tokens))
+                report.count("nodos AST", sum(1 for _ in walk(ast)))
+
+            passes = {
+                "inline": "--no-inline" not in sys.argv,
+                "licm": "--no-licm" not in sys.argv,
+                "report": report,
+            }
+
+            if "--profile" in sys.argv or "--profile-stacks" in sys.argv:
+                # el profiler instrumenta las closures al compilar
+                if "--pyjit" in sys.argv:
+                    print("--profile usa el backend closure en vez de pyjit")
+
+                passes.update(backend="closure", profiler=Profiler())
+
+            if "--out" in sys.argv:
+                # salida a un archivo con buffer en vez de la consola
+                out_path = sys.argv[sys.argv.index("--out") + 1]
+
+                with open(out_path, "w", buffering=1 << 16) as out:
+                    interpreter = Interpreter(Context(code), out=out, **passes)
+                    interpreter.interpret(ast)
+            else:
+                interpreter = Interpreter(Context(code), **passes)
+                interpreter.interpret(ast)
+
+            if "--inline-report" in sys.argv:
+                print_inlined(interpreter.inlined)
+
+            if interpreter.profiler:
+                interpreter.profiler.print(code)
+
+                if "--profile-stacks" in sys.argv:
+                    stacks = sys.argv[sys.argv.index("--profile-stacks") + 1]
+                    interpreter.profiler.save_collapsed(stacks)
 
-            interpreter = Interpreter(Context(code))
-            interpreter.interpret(ast)
+            finish_report(report)
         except Exception as e:
             print("Error: " + str(e))
             sys.exit(1)
@@ -196,6 +360,48 @@ def run_interprete(filename):
         sys.exit(1)
 
 
+def run_build(filenames):
+    options = {}
+
+    if "--arena" in sys.argv:
+        options["allocation"] = "arena"
+    if "--no-inline" in sys.argv:
+        options["inline"] = False
+    if "--no-licm" in sys.argv:
+        options["licm"] = False
+    if "--instrument" in sys.argv:
+        options["instrument"] = True
+    if "--no-vectorize" in sys.argv:
+        options["vectorize"] = False
+    if "--no-stack-arrays" in sys.argv:
+        options["stack_arrays"] = False
+
+    out_dir = "build"
+    output = None
+
+    if "--dir" in sys.argv:
+        out_dir = sys.argv[sys.argv.index("--dir") + 1]
+    if "--out" in sys.argv:
+        output = sys.argv[sys.argv.index("--out") + 1]
+
+    try:
+        if "--pgo" in sys.argv:
+            # instrumentado, entrenamiento y compilación con el perfil
+            runs = 1
+
+            if "--pgo-runs" in sys.argv:
+                runs = int(sys.argv[sys.argv.index("--pgo-runs") + 1])
+
+            rebuilt = build_pgo(filenames, out_dir, output, runs, **options)
+        else:
+            rebuilt = build(filenames, out_dir, output, **options)
+
+        print(f"Recompilados: {', '.join(rebuilt) or 'ninguno'}")
+    except BuildError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
@@ -203,6 +409,7 @@ if __name__ == "__main__":
         print(
             "Usage: bminor.py --scan|--parser|--semantic | --ir | --interprete [test | filename.bminor | test/.../*.py]"
         )
+        print("       bminor.py --build main.bminor [module.bminor ...]")
         print("Example: bminor.py --scan test/scanner/good1.bminor")
 
         print("\nparser flags: --print | --pretty | --json | --graph")
@@ -214,11 +421,20 @@ if __name__ == "__main__":
         print("\nsemantic flags: --table")
         print("Example: bminor.py --semantic code.bminor --table")
 
-        print("\nir flags: --print | --run")
+        print(
+            "\nir flags: --print | --run | --arena | --jobs N | --no-inline | --inline-report | --no-licm | --no-vectorize | --no-stack-arrays | --instrument | --rt-stats | --no-lto | --time-report | --time-report-json file"
+        )
         print("Example: bminor.py --ir code.bminor --print --run")
 
-        print("\ninterprete flags: --run")
-        print("Example: bminor.py --interprete code.bminor --run")
+        print(
+            "\ninterprete flags: --run | --out file | --closure | --pyjit | --no-inline | --inline-report | --no-licm | --time-report | --time-report-json file | --profile | --profile-stacks file"
+        )
+        print("Example: bminor.py --interprete code.bminor --out output.txt")
+
+        print(
+            "\nbuild flags: --dir build_dir | --out executable | --arena | --no-inline | --no-licm | --no-vectorize | --no-stack-arrays | --instrument | --pgo | --pgo-runs N"
+        )
+        print("Example: bminor.py --build main.bminor lib.bminor --out prog")
         sys.exit(1)
 
     mode = sys.argv[1]
@@ -234,6 +450,10 @@ if __name__ == "__main__":
         run_ir(filename)
     elif mode == "--interprete":
         run_interprete(filename)
+    elif mode == "--build":
+        run_build([arg for arg in sys.argv[2:] if arg.endswith(".bminor")])
     else:
-        print("Invalid mode. Use --scan, --parser, --semantic, --ir or --interprete")
+        print(
+            "Invalid mode. Use --scan, --parser, --semantic, --ir, --interprete or --build"
+        )
         sys.exit(1)
@@ -1,2 +1,3 @@
 from .context import Context
-from .interp import Interpreter
+from .interp import Interpreter, set_default_backend
+from .profiler import Profiler
@@ -0,0 +1,70 @@
+"""
+Almacenamiento de los arrays del intérprete
+
+Los arrays de float (con lista de inicialización), char y boolean usan
+memoria nativa en vez de listas de objetos de Python:
+
+    float   -> array.array('d')   8 bytes por elemento
+    char    -> array.array('w')   4 bytes por elemento ('u' antes de 3.13)
+    boolean -> BoolArray          1 byte por elemento
+
+El resto (integer, string y arrays de arrays) siguen siendo listas: los
+integer del intérprete no tienen límite como los int de Python y
+array('q') no acepta valores de más de 64 bits. Un array de float sin
+valores iniciales también es una lista: sus elementos valen 0 como una
+variable float sin asignar (_default_val) y array('d') guardaría 0.0,
+que se imprime distinto. La semántica no cambia: se indexan igual, se
+pasan por referencia y len() funciona con todos. NumPy no se usa: sus
+escalares (np.int64, np.bool_) no se comportan como los int/bool de
+Python al operar e imprimir.
+"""
+
+import array
+from parser.model import SimpleType, SimpleTypes
+
+_typecodes = {
+    SimpleTypes.FLOAT.value.name: "d",
+    SimpleTypes.CHAR.value.name: "w" if "w" in array.typecodes else "u",
+}
+
+
+class BoolArray(bytearray):
+    """Array de boolean: un byte por elemento, se lee como bool"""
+
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        return bool(bytearray.__getitem__(self, index))
+
+
+# tipos válidos para array_length
+ARRAY_TYPES = (list, array.array, BoolArray)
+
+
+def new_array(base, values=None, size=0):
+    """
+    Array de B-minor con elementos de tipo base. Si hay valores iniciales
+    se usan, si no se crean 'size' elementos con el valor por defecto.
+    """
+    if base == SimpleTypes.BOOLEAN.value:
+        return BoolArray(values) if values else BoolArray(max(size, 0))
+
+    code = _typecodes.get(base.name) if isinstance(base, SimpleType) else None
+
+    if code == "d" and not values:
+        code = None  # 0 y no 0.0, ver arriba
+
+    if code is None:
+        from .interp import _default_val
+
+        if values:
+            return list(values)
+
+        return [_default_val(base) for _ in range(size)]
+    elif values:
+        return array.array(code, values)
+    elif size > 0:
+        # bytes en cero: '\0' es el valor por defecto
+        return array.array(code, bytes(array.array(code).itemsize * size))
+
+    return array.array(code)
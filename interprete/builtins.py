@@ -1,3 +1,6 @@
+from .arrays import ARRAY_TYPES
+
+
 # Helper para funciones integradas simples
 class BuiltinFunction:
     def __init__(self, name, arity, func):
@@ -22,7 +25,7 @@ class CallError(Exception):
 
 
 def get_array_length(array):
-    if not isinstance(array, list):
+    if not isinstance(array, ARRAY_TYPES):
         raise CallError("Se esperaba un array como argumento.")
 
     return len(array)
@@ -0,0 +1,591 @@
+"""
+Backend de closures
+
+Término medio entre el intérprete de recorrido de árbol y una máquina
+virtual: cada nodo del AST ya verificado se convierte una sola vez en
+una función de Python (closure) con sus hijos ya resueltos. Por ejemplo
+
+    BinOper('+', a, b)  ->  lambda f: ea(f) + eb(f)
+
+Al ejecutar no hay despacho del visitor, ni búsquedas en Symtab, ni
+comparaciones con node.oper; todo eso se resuelve al compilar.
+
+Frames
+    Cada variable recibe un slot fijo al compilar. Las globales viven en
+    el frame global 'g' y las locales de una función en una lista nueva
+    por llamada (el slot 0 guarda el valor de retorno). Los scopes de
+    bloques, if y bucles solo existen al compilar, una declaración
+    interna ocupa su propio slot del frame que la contiene.
+
+Sentencias
+    Las closures de sentencias devuelven None o una señal (_BREAK,
+    _CONTINUE, _RETURN) que los bloques y bucles propagan, en lugar de
+    usar excepciones como el intérprete de árbol. Un return f(args)
+    dentro de f (ReturnStmt._tail_call) guarda un _TailCall como valor
+    de retorno y la función repite su cuerpo con un frame nuevo.
+
+Profiler
+    Con interp.profiler (ver profiler.py) el cuerpo de cada función y
+    cada sentencia se envuelven al compilar en una closure que mide su
+    ejecución; sin profiler el código compilado es el mismo.
+
+La semántica (errores, valores por defecto, división entera, strings
+por valor, arrays por referencia) es la misma de Interpreter.
+"""
+
+from parser.model import *
+
+from semantic import Symtab
+
+from .arrays import new_array
+from .builtins import BuiltinFunction, CallError, builtins, consts
+from .interp import _default_val, _is_truthy
+from .operators import binop_for, literal_value, unaryop_for
+
+_BREAK = object()
+_CONTINUE = object()
+_RETURN = object()
+
+# slot del valor de retorno en el frame de una función
+_RET = 0
+
+_BOOLEAN = SimpleTypes.BOOLEAN.value
+
+
+class _TailCall:
+    """Argumentos de una llamada de cola a la misma función"""
+
+    __slots__ = ("args",)
+
+    def __init__(self, args: list):
+        self.args = args
+
+
+class _Slot:
+    """Entrada de la tabla de símbolos de compilación para una variable"""
+
+    def __init__(self, index: int, is_global: bool):
+        self.index = index
+        self.is_global = is_global
+
+
+class CompiledFunction:
+    """
+    Función de bminor compilada. Se crea antes de compilar su cuerpo
+    para poder resolver llamadas recursivas y declaraciones adelantadas.
+    """
+
+    def __init__(self, node: FuncDecl):
+        self.node = node
+        self.name = node.name
+        self.nparams = len(node.params)
+        self.body = None
+        self.frame_size = 1 + self.nparams
+
+        if node.return_type == SimpleTypes.VOID.value:
+            self.default = None
+        else:
+            self.default = _default_val(node.return_type)
+
+    def __call__(self, args):
+        result = None
+
+        try:
+            while True:
+                f = [None] * self.frame_size
+                f[1 : 1 + self.nparams] = args
+
+                if self.body is not None and self.body(f) is _RETURN:
+                    result = f[_RET]
+
+                if result.__class__ is not _TailCall:
+                    break
+
+                args, result = result.args, None
+        except Exception as e:
+            raise RuntimeError(f"Un error inesperado en {self.name}: {e}")
+
+        if result is None:
+            result = self.default
+
+        return result
+
+
+class ClosureCompiler(Visitor):
+    @classmethod
+    def compile(cls, n: Program, interp):
+        """
+        Compila el programa (ya verificado por Check) y devuelve una
+        función sin argumentos que lo ejecuta usando interp para la
+        salida y el reporte de errores.
+        """
+        compiler = cls()
+        compiler.interp = interp
+        compiler.globals = []
+        compiler.frame_size = 1
+        compiler.in_function = False
+        compiler.functions = {}
+        compiler.profiler = interp.profiler
+        compiler.function_name = None
+
+        env = Symtab("global", register=False)
+
+        for name, value in {**consts, **builtins}.items():
+            env[name] = value
+
+        # PRIMERA PASADA: crear las funciones, la última definición gana
+        for decl in n.body:
+            if isinstance(decl, FuncDecl):
+                func = compiler.functions.get(decl.name)
+
+                if func is None or decl.body is not None:
+                    func = CompiledFunction(decl)
+                    compiler.functions[decl.name] = func
+
+                env[decl.name] = func
+
+        stmts = [(stmt, compiler._stmt(stmt, env)) for stmt in n.body]
+
+        g = compiler.globals
+        g.extend([None] * compiler.frame_size)
+
+        def run():
+            for stmt, code in stmts:
+                try:
+                    code(g)
+                except Exception as e:
+                    raise RuntimeError(
+                        f"Error in {type(stmt).__name__} line {stmt.lineno} \n\n {e}"
+                    )
+
+        if compiler.profiler:
+            return compiler.profiler.wrap_program(run)
+
+        return run
+
+    # --- Utilidades
+
+    def _declare(self, name: str, env: Symtab) -> int:
+        index = self.frame_size
+        self.frame_size += 1
+        env[name] = _Slot(index, not self.in_function)
+
+        return index
+
+    def _load(self, name: str, env: Symtab):
+        slot = env.get(name)
+        i = slot.index
+
+        if slot.is_global and self.in_function:
+            g = self.globals
+            return lambda f: g[i]
+
+        return lambda f: f[i]
+
+    def _store(self, name: str, env: Symtab):
+        slot = env.get(name)
+        i = slot.index
+
+        if slot.is_global and self.in_function:
+            g = self.globals
+
+            def store(f, value):
+                g[i] = value
+
+        else:
+
+            def store(f, value):
+                f[i] = value
+
+        return store
+
+    def _stmt(self, n: Node, env: Symtab):
+        """
+        Compila una sentencia. Las expresiones usadas como sentencia
+        (llamadas, asignaciones, ++) descartan su valor.
+        """
+        if isinstance(n, (Expression, Assignment)):
+            expr = n.accept(self, env)
+
+            def stmt(f):
+                expr(f)
+
+            code = stmt
+        else:
+            code = n.accept(self, env)
+
+        lineno = getattr(n, "lineno", None)
+
+        if self.profiler and lineno and not isinstance(n, FuncDecl):
+            return self.profiler.wrap_stmt(code, lineno, self.function_name)
+
+        return code
+
+    def _block(self, stmts: list, env: Symtab):
+        code = [self._stmt(stmt, env) for stmt in stmts or []]
+
+        if not code:
+            return lambda f: None
+        elif len(code) == 1:
+            return code[0]
+
+        def block(f):
+            for stmt in code:
+                signal = stmt(f)
+
+                if signal is not None:
+                    return signal
+
+        return block
+
+    def _condition(self, n: Expression | None, env: Symtab):
+        if n is None:
+            return lambda f: True
+
+        cond = n.accept(self, env)
+
+        if getattr(n, "type", None) == _BOOLEAN:
+            return cond
+
+        return lambda f: _is_truthy(cond(f))
+
+    # --- Statements
+
+    def visit(self, n: BlockStmt, env: Symtab):
+        return self._block(n.body, Symtab("block", env, register=False))
+
+    def visit(self, n: PrintStmt, env: Symtab):
+        emit = self.interp._print
+        parts = []
+
+        for expr in n.expr:
+            code = expr.accept(self, env)
+
+            if expr.type == _BOOLEAN:
+                parts.append(lambda f, code=code: emit("true" if code(f) else "false"))
+            else:
+
+                def part(f, code=code):
+                    val = code(f)
+
+                    if isinstance(val, bool):
+                        emit("true" if val else "false")
+                    else:
+                        emit(val)
+
+                parts.append(part)
+
+        def print_stmt(f):
+            for part in parts:
+                part(f)
+
+        return print_stmt
+
+    def visit(self, n: IfStmt, env: Symtab):
+        cond = self._condition(n.condition, env)
+        then_branch = self._block(n.then_branch, Symtab("if", env, register=False))
+
+        if not n.else_branch:
+
+            def if_stmt(f):
+                if cond(f):
+                    return then_branch(f)
+
+            return if_stmt
+
+        else_branch = self._block(n.else_branch, Symtab("else", env, register=False))
+
+        def if_else_stmt(f):
+            if cond(f):
+                return then_branch(f)
+
+            return else_branch(f)
+
+        return if_else_stmt
+
+    def visit(self, n: WhileStmt, env: Symtab):
+        env = Symtab("while", env, register=False)
+        cond = self._condition(n.condition, env)
+        body = self._block(n.body, env)
+
+        def while_stmt(f):
+            while cond(f):
+                signal = body(f)
+
+                if signal is _BREAK:
+                    break
+                elif signal is _RETURN:
+                    return signal
+
+        return while_stmt
+
+    def visit(self, n: DoWhileStmt, env: Symtab):
+        cond = self._condition(n.condition, env)
+        body = self._block(n.body, Symtab("do-while", env, register=False))
+
+        def do_while_stmt(f):
+            while True:
+                signal = body(f)
+
+                if signal is _BREAK:
+                    break
+                elif signal is _RETURN:
+                    return signal
+
+                if not cond(f):
+                    break
+
+        return do_while_stmt
+
+    def visit(self, n: ForStmt, env: Symtab):
+        env = Symtab("for", env, register=False)
+        init = self._stmt(n.init, env) if n.init else None
+        update = self._stmt(n.update, env) if n.update else (lambda f: None)
+
+        # condición y update antes que el cuerpo: no ven sus declaraciones
+        cond = self._condition(n.condition, env)
+        body = self._block(n.body, env)
+
+        def for_stmt(f):
+            if init is not None:
+                init(f)
+
+            while cond(f):
+                signal = body(f)
+
+                if signal is _BREAK:
+                    break
+                elif signal is _RETURN:
+                    return signal
+
+                update(f)
+
+        return for_stmt
+
+    def visit(self, n: ContinueStmt, env: Symtab):
+        return lambda f: _CONTINUE
+
+    def visit(self, n: BreakStmt, env: Symtab):
+        return lambda f: _BREAK
+
+    def visit(self, n: ReturnStmt, env: Symtab):
+        if not n.expr:
+
+            def return_void(f):
+                f[_RET] = None
+                return _RETURN
+
+            return return_void
+
+        if getattr(n, "_tail_call", False) and isinstance(
+            env.get(n.expr.name), CompiledFunction
+        ):
+            args = [arg.accept(self, env) for arg in n.expr.args]
+
+            def tail_call(f):
+                f[_RET] = _TailCall([arg(f) for arg in args])
+                return _RETURN
+
+            return tail_call
+
+        expr = n.expr.accept(self, env)
+
+        def return_stmt(f):
+            f[_RET] = expr(f)
+            return _RETURN
+
+        return return_stmt
+
+    # --- Declarations
+
+    def visit(self, n: FuncDecl, env: Symtab):
+        func = self.functions[n.name]
+
+        if n.body is not None and func.node is n:
+            outer_size, outer_in_function = self.frame_size, self.in_function
+            self.frame_size, self.in_function = 1, True
+            self.function_name = n.name
+
+            local_env = Symtab(n.name, env, register=False)
+
+            for param in n.params:
+                self._declare(param.name, local_env)
+
+            func.body = self._block(n.body, local_env)
+            func.frame_size = self.frame_size
+
+            if self.profiler:
+                func.body = self.profiler.wrap_function(func.body, n.name)
+
+            self.frame_size, self.in_function = outer_size, outer_in_function
+            self.function_name = None
+
+        return lambda f: None
+
+    def visit(self, n: VarDecl, env: Symtab):
+        if isinstance(n, AutoDecl) and isinstance(n.value, list):
+            items = [v.accept(self, env) for v in n.value]
+            base = n.type.base
+            value = lambda f: new_array(base, [item(f) for item in items])
+        elif n.value:
+            value = n.value.accept(self, env)
+        else:
+            default = _default_val(n.type)
+            value = lambda f: default
+
+        i = self._declare(n.name, env)
+
+        def var_decl(f):
+            f[i] = value(f)
+
+        return var_decl
+
+    def visit(self, n: ArrayDecl, env: Symtab):
+        items = [v.accept(self, env) for v in n.value or []]
+        base = n.type.base
+
+        if isinstance(n.type.size, int):
+            size_value = n.type.size
+            size = lambda f: size_value
+        else:
+            size = n.type.size.accept(self, env)
+
+        i = self._declare(n.name, env)
+
+        def array_decl(f):
+            f[i] = new_array(base, [item(f) for item in items], size(f) or 0)
+
+        return array_decl
+
+    # --- Expressions
+
+    def visit(self, n: Literal, env: Symtab):
+        value = getattr(n, "_value", None)
+
+        if value is None:
+            value = literal_value(n)
+
+        return lambda f: value
+
+    def visit(self, n: VarLoc, env: Symtab):
+        return self._load(n.name, env)
+
+    def visit(self, n: ArrayLoc, env: Symtab):
+        array = n.array.accept(self, env)
+        index = n.index.accept(self, env)
+
+        return lambda f: array(f)[index(f)]
+
+    def visit(self, n: Assignment, env: Symtab):
+        value = n.value.accept(self, env)
+
+        if isinstance(n.location, ArrayLoc):
+            array = n.location.array.accept(self, env)
+            index = n.location.index.accept(self, env)
+
+            def assign_index(f):
+                val = value(f)
+                array(f)[index(f)] = val
+                return val
+
+            return assign_index
+
+        store = self._store(n.location.name, env)
+
+        def assign(f):
+            val = value(f)
+            store(f, val)
+            return val
+
+        return assign
+
+    def visit(self, n: Increment | Decrement, env: Symtab):
+        step = 1 if isinstance(n, Increment) else -1
+        postfix = n.postfix
+
+        if not isinstance(n.location, VarLoc):
+            # sin ubicación en memoria: se opera sobre el valor temporal
+            expr = n.location.accept(self, env)
+
+            if postfix:
+                return expr
+
+            return lambda f: expr(f) + step
+
+        load = self._load(n.location.name, env)
+        store = self._store(n.location.name, env)
+
+        def inc_dec(f):
+            value = load(f)
+            new_value = value + step
+            store(f, new_value)
+
+            return value if postfix else new_value
+
+        return inc_dec
+
+    def visit(self, n: UnaryOper, env: Symtab):
+        expr = n.expr.accept(self, env)
+        op = unaryop_for(n)
+
+        if op is not None:
+            return lambda f: op(expr(f))
+        elif n.oper == "+":
+            return expr
+        elif n.oper == "-":
+            return lambda f: -expr(f)
+        elif n.oper == "!":
+            return lambda f: not _is_truthy(expr(f))
+
+        raise NotImplementedError(n.oper)
+
+    def visit(self, n: BinOper, env: Symtab):
+        left = n.left.accept(self, env)
+        right = n.right.accept(self, env)
+
+        if n.oper in ("LOR", "LAND"):
+            proven = n.left.type == _BOOLEAN and n.right.type == _BOOLEAN
+
+            if n.oper == "LOR" and proven:
+                return lambda f: left(f) or right(f)
+            elif n.oper == "LAND" and proven:
+                return lambda f: left(f) and right(f)
+            elif n.oper == "LOR":
+                return lambda f: (lambda l: l if _is_truthy(l) else right(f))(left(f))
+
+            return lambda f: (lambda l: right(f) if _is_truthy(l) else l)(left(f))
+
+        op = binop_for(n)
+
+        if op is not None:
+            return lambda f: op(left(f), right(f))
+
+        # tipos no probados: misma verificación que Interpreter.check
+        checked = self.interp._apply_binop
+
+        return lambda f: checked(n, left(f), right(f))
+
+    def visit(self, n: FuncCall, env: Symtab):
+        interp = self.interp
+        callee = env.get(n.name)
+        args = [arg.accept(self, env) for arg in n.args]
+
+        if isinstance(callee, BuiltinFunction):
+            builtin = callee
+            callee = lambda values: builtin(interp, *values)
+        elif not isinstance(callee, CompiledFunction):
+            raise CallError(f"'{n.name}' no es invocable.")
+
+        def call(f):
+            values = [arg(f) for arg in args]
+
+            try:
+                return callee(values)
+            except CallError as err:
+                interp.error(n, str(err))
+            except KeyError as e:
+                interp.error(n, f"No existe la variable o función '{e.args[0]}'")
+            except Exception as e:
+                interp.error(n, str(e))
+
+        return call
@@ -2,19 +2,58 @@
 Tree-walking interpreter
 """
 
+import io
 import sys
+import threading
 from parser.model import *
 
 from rich import print
 
-from semantic import Check, Symtab
-from utils import errors_detected
+from semantic import Check, Symtab, hoist_invariants, inline_calls
+from utils import errors_detected, timed_phase
 
+from .arrays import new_array
 from .builtins import BuiltinFunction, CallError, builtins, consts
+from .operators import literal_value, specialize
 
-# Recursividad limitada en python
-# Problemas de rendimiento en el interprete por recursividad
-# sys.setrecursionlimit(1000) # por defecto
+# Recursividad: las llamadas de cola a la misma función se ejecutan como
+# un ciclo sin crecer la pila (ver specialize y Function.__call__). El
+# resto de la recursión usa la pila de python, así que el programa corre
+# en un hilo con una pila grande y un límite de recursión más alto
+RECURSION_LIMIT = 1_000_000
+STACK_SIZE = 512 * 1024 * 1024
+
+
+def run_with_deep_stack(fn):
+    """Ejecuta fn() en un hilo con pila de STACK_SIZE bytes"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+
+    old_limit = sys.getrecursionlimit()
+    old_size = threading.stack_size()
+
+    try:
+        sys.setrecursionlimit(max(old_limit, RECURSION_LIMIT))
+        threading.stack_size(STACK_SIZE)
+        thread = threading.Thread(target=target)
+        thread.start()
+    finally:
+        threading.stack_size(old_size)
+
+    try:
+        thread.join()
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+    if "error" in outcome:
+        raise outcome["error"]
+
+    return outcome.get("result")
 
 
 # Veracidad en bminor
@@ -41,7 +80,7 @@ def _default_val(_type: SimpleType | ArrayType | None):
     elif _type == SimpleTypes.BOOLEAN.value:
         return False
     elif _type == SimpleTypes.CHAR.value:
-        return "\\0"
+        return "\0"
     elif _type == SimpleTypes.FLOAT.value:
         return 0
 
@@ -53,6 +92,14 @@ class ReturnException(Exception):
         self.value = value
 
 
+class TailCall(ReturnException):
+    """return f(args) dentro de f: se repite el cuerpo con los nuevos args"""
+
+    def __init__(self, args):
+        super().__init__(None)
+        self.args_values = args
+
+
 class BreakException(Exception):
     pass
 
@@ -69,6 +116,41 @@ class AttributeError(Exception):
     pass
 
 
+# Backends de ejecución: "tree" recorre el AST con el visitor,
+# "closure" lo compila una vez a closures (ver compiler.py) y "pyjit" lo
+# traduce a código fuente de Python (ver pyjit.py)
+BACKENDS = ("tree", "closure", "pyjit")
+_default_backend = "tree"
+
+
+def set_default_backend(name: str):
+    """Backend usado por los Interpreter creados sin backend explícito"""
+    global _default_backend
+
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconocido '{name}', use uno de {BACKENDS}")
+
+    _default_backend = name
+
+
+def _make_sink(out):
+    """
+    Normaliza el destino de la salida del programa a una función que
+    recibe un str.
+
+    out puede ser None (consola con rich), un objeto con write
+    (io.StringIO, archivo con buffer, sys.stdout) o un callable.
+    """
+    if out is None:
+        return lambda text: print(text, end="")
+    elif hasattr(out, "write"):
+        return out.write
+    elif callable(out):
+        return out
+
+    raise TypeError(f"Destino de salida no soportado: {type(out).__name__}")
+
+
 class Function:
     def __init__(self, node: FuncDecl, env: Symtab):
         self.node = node
@@ -79,20 +161,28 @@ class Function:
         return len(self.node.params)
 
     def __call__(self, interp, *args):
-        new_env = Symtab("func", self.env)
-
-        for name, arg in zip(self.node.params, args):
-            new_env[name.name] = arg
-
         old_env = interp.env
-        interp.env = new_env
         result = None
 
         try:
-            for stmt in self.node.body or []:
-                stmt.accept(interp)
-        except ReturnException as e:
-            result = e.value
+            while True:
+                new_env = Symtab("func", self.env, register=False)
+
+                for name, arg in zip(self.node.params, args):
+                    new_env[name.name] = arg
+
+                interp.env = new_env
+
+                try:
+                    for stmt in self.node.body or []:
+                        stmt.accept(interp)
+                except TailCall as e:
+                    args = e.args_values
+                    continue
+                except ReturnException as e:
+                    result = e.value
+
+                break
         except Exception as e:
             raise RuntimeError(f"Un error inesperado en {self.node.name}: {e}")
         finally:
@@ -104,13 +194,44 @@ class Function:
         return result
 
     def bind(self, instance):
-        env = Symtab("func", self.env)
+        env = Symtab("func", self.env, register=False)
         env["this"] = instance
         return Function(self.node, env)
 
 
 class Interpreter(Visitor):
-    def __init__(self, ctxt, get_output=False):
+    def __init__(
+        self,
+        ctxt,
+        get_output=False,
+        out=None,
+        backend=None,
+        inline=True,
+        licm=True,
+        report=None,
+        profiler=None,
+    ):
+        """
+        get_output: capturar la salida del programa, disponible en self.output
+        out: destino de la salida (ver _make_sink), por defecto la consola
+        backend: "tree", "closure" o "pyjit", por defecto el de set_default_backend
+        inline: reemplazar llamadas a funciones pequeñas por su cuerpo
+            (ver semantic/inline.py), las reemplazadas quedan en self.inlined
+        licm: calcular antes de los bucles sus expresiones invariantes
+            (ver semantic/licm.py)
+        report: utils.PhaseReport donde medir cada fase de interpret()
+        profiler: Profiler (ver profiler.py) que mide funciones y líneas,
+            solo con el backend "closure". Desactiva inline: una función
+            reemplazada por su cuerpo no aparecería en el perfil
+        """
+        if backend is None:
+            backend = _default_backend
+        elif backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido '{backend}', use uno de {BACKENDS}")
+
+        if profiler is not None and backend != "closure":
+            raise ValueError("El profiler solo funciona con el backend 'closure'")
+
         self.ctxt = ctxt
         # self.env = ChainMap()
         # self.check_env = ChainMap()
@@ -118,7 +239,21 @@ class Interpreter(Visitor):
         self.check_env = Symtab("global")
         self.localmap = {}
         self.get_output = get_output
-        self.output = ""
+        self._captured = io.StringIO() if get_output else None
+        self._sink = _make_sink(out)
+        self.backend = backend
+        self.inline = inline and profiler is None
+        self.licm = licm
+        self.inlined = []
+        self.report = report
+        self.profiler = profiler
+
+    @property
+    def output(self) -> str:
+        if self._captured is None:
+            return ""
+
+        return self._captured.getvalue()
 
     def _check_numeric_operands(self, node, left, right):
         if isinstance(left, (int, float)) and isinstance(right, (int, float)):
@@ -152,10 +287,12 @@ class Interpreter(Visitor):
         raise BminorExit()
 
     def _print(self, value):
-        if self.get_output:
-            self.output += str(value)
+        text = str(value)
 
-        print(value, end="")
+        if self._captured is not None:
+            self._captured.write(text)
+
+        self._sink(text)
 
     # Punto de entrada alto-nivel
     def interpret(self, node):
@@ -167,12 +304,39 @@ class Interpreter(Visitor):
             self.check_env[name] = func
             self.env[name] = func
 
+        report = self.report
+
         try:
-            Check.check_interpreter(node, self.check_env, self)
+            with timed_phase(report, "check"):
+                Check.check_interpreter(node, self.check_env, self)
 
             # if not self.ctxt.have_errors:
             if errors_detected() == 0:
-                node.accept(self)
+                if self.inline:
+                    with timed_phase(report, "inline"):
+                        self.inlined = inline_calls(node)
+                if self.licm:
+                    with timed_phase(report, "licm"):
+                        hoist_invariants(node)
+
+                with timed_phase(report, "specialize"):
+                    specialize(node)
+
+                if self.backend == "closure":
+                    from .compiler import ClosureCompiler
+
+                    with timed_phase(report, "closures"):
+                        program = ClosureCompiler.compile(node, self)
+                    with timed_phase(report, "ejecución"):
+                        run_with_deep_stack(program)
+                elif self.backend == "pyjit":
+                    from .pyjit import PyTranspiler
+
+                    with timed_phase(report, "ejecución"):
+                        run_with_deep_stack(lambda: PyTranspiler.run(node, self))
+                else:
+                    with timed_phase(report, "ejecución"):
+                        run_with_deep_stack(lambda: node.accept(self))
         except BminorExit as e:
             pass
         except Exception as e:
@@ -190,7 +354,7 @@ class Interpreter(Visitor):
                 )
 
     def visit(self, node: BlockStmt):
-        env = Symtab("block", parent=self.env)
+        env = Symtab("block", parent=self.env, register=False)
         self.env = env
 
         for stmt in node.body:
@@ -218,17 +382,23 @@ class Interpreter(Visitor):
                 self._print(val)
 
     def visit(self, node: Literal):
-        val = node.value
+        # decodificado una sola vez en specialize(); getattr y no
+        # except AttributeError, que aquí es la clase de este módulo
+        value = getattr(node, "_value", None)
 
-        if isinstance(val, str):
-            val = val.encode("utf-8").decode("unicode_escape")
+        if value is None:
+            value = literal_value(node)
 
-        return val
+        return value
 
     # Expressions
 
     def visit(self, node: UnaryOper):
         expr = node.expr.accept(self)
+        op = getattr(node, "_unop", None)
+
+        if op is not None:
+            return op(expr)
 
         if node.oper == "+":
             return expr
@@ -245,7 +415,12 @@ class Interpreter(Visitor):
             0++, se agrega el valor después debería dar 0 pero con doble visit da 1
         """
         right = node.right.accept(self)
+        return self._apply_binop(node, left, right)
 
+    def _apply_binop(self, node: BinOper, left, right):
+        """
+        Operación binaria con verificación de operandos en tiempo de ejecución
+        """
         if node.oper == "+":
             if (
                 isinstance(left, str) and isinstance(right, str)
@@ -297,6 +472,12 @@ class Interpreter(Visitor):
             raise NotImplementedError(f"Mal operador {node.oper}")
 
     def visit(self, node: BinOper):
+        op = getattr(node, "_binop", None)
+
+        # tipos probados por Check, sin verificaciones en tiempo de ejecución
+        if op is not None:
+            return op(node.left.accept(self), node.right.accept(self))
+
         left = node.left.accept(self)
 
         if node.oper == "LOR":
@@ -314,7 +495,7 @@ class Interpreter(Visitor):
 
     def visit(self, node: VarDecl):
         if isinstance(node, AutoDecl) and isinstance(node.value, list):
-            expr = [v.accept(self) for v in node.value]
+            expr = new_array(node.type.base, [v.accept(self) for v in node.value])
         elif node.value:
             expr = node.value.accept(self)
         else:
@@ -330,10 +511,7 @@ class Interpreter(Visitor):
 
         size = node.type.size.accept(self)
 
-        if size and not vals:
-            vals = [_default_val(node.type.base) for _ in range(size)]
-
-        self.env[node.name] = vals
+        self.env[node.name] = new_array(node.type.base, vals, size or 0)
 
     def visit(self, node: VarLoc):
         return self.env.get(node.name)
@@ -382,7 +560,7 @@ class Interpreter(Visitor):
         expr = node.condition.accept(self)
 
         if _is_truthy(expr):
-            env = Symtab("if", self.env)
+            env = Symtab("if", self.env, register=False)
             self.env = env
 
             for stmt in node.then_branch:
@@ -390,7 +568,7 @@ class Interpreter(Visitor):
 
             self.env = self.env.parent
         elif node.else_branch:
-            env = Symtab("else", self.env)
+            env = Symtab("else", self.env, register=False)
             self.env = env
 
             for stmt in node.else_branch:
@@ -400,7 +578,7 @@ class Interpreter(Visitor):
 
     def visit(self, node: WhileStmt):
         env_parent = self.env
-        env = Symtab("while", env_parent)
+        env = Symtab("while", env_parent, register=False)
         self.env = env
 
         while node.condition is None or _is_truthy(node.condition.accept(self)):
@@ -421,7 +599,7 @@ class Interpreter(Visitor):
 
     def visit(self, node: DoWhileStmt):
         env_parent = self.env
-        env = Symtab("do-while", env_parent)
+        env = Symtab("do-while", env_parent, register=False)
         self.env = env
 
         is_break = False
@@ -454,7 +632,7 @@ class Interpreter(Visitor):
 
     def visit(self, node: ForStmt):
         env_parent = self.env
-        env = Symtab("for", env_parent)
+        env = Symtab("for", env_parent, register=False)
         self.env = env
 
         if node.init:
@@ -493,6 +671,9 @@ class Interpreter(Visitor):
         raise BreakException
 
     def visit(self, node: ReturnStmt):
+        if getattr(node, "_tail_call", False):
+            raise TailCall([arg.accept(self) for arg in node.expr.args])
+
         value = None if not node.expr else node.expr.accept(self)
         raise ReturnException(value)
 
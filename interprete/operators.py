@@ -0,0 +1,167 @@
+"""
+Operadores especializados por tipo
+
+El verificador semántico ya anota cada expresión con su tipo estático,
+así que el intérprete puede escoger la operación concreta una sola vez
+por nodo en lugar de revisar los operandos con isinstance en cada
+evaluación. Si los tipos no están probados (por ejemplo un nodo con
+tipo 'undefined') no se especializa y el intérprete usa el camino con
+verificaciones en tiempo de ejecución.
+"""
+
+import operator
+from parser.model import *
+
+from semantic.typesys import _bin_ops, _unary_ops
+
+_arith = {
+    "integer": {
+        "+": operator.add,
+        "-": operator.sub,
+        "*": operator.mul,
+        # división entera como en Interpreter.check
+        "/": operator.floordiv,
+        "%": operator.mod,
+    },
+    "float": {
+        "+": operator.add,
+        "-": operator.sub,
+        "*": operator.mul,
+        "/": operator.truediv,
+        "%": operator.mod,
+    },
+    "string": {
+        "+": operator.add,
+    },
+}
+
+# Los char son str de largo 1, compararlos equivale a comparar ord()
+_compare = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_unary = {
+    "+": lambda value: value,
+    "-": operator.neg,
+    "!": operator.not_,
+}
+
+
+def _type_name(node) -> str | None:
+    _type = getattr(node, "type", None)
+
+    if isinstance(_type, SimpleType):
+        return _type.name
+
+    return None
+
+
+def binop_for(node: BinOper):
+    """
+    Devuelve la función (left, right) -> valor para node o None si
+    el tipo de sus operandos no está probado por el verificador.
+    LAND y LOR no se especializan por ser de corto circuito.
+    """
+    left = _type_name(node.left)
+    right = _type_name(node.right)
+
+    if (left, node.oper, right) not in _bin_ops:
+        return None
+
+    if node.oper in _compare:
+        return _compare[node.oper]
+
+    return _arith.get(left, {}).get(node.oper)
+
+
+def unaryop_for(node: UnaryOper):
+    """
+    Devuelve la función value -> valor para node o None si el tipo
+    del operando no está probado por el verificador.
+    """
+    if (node.oper, _type_name(node.expr)) not in _unary_ops:
+        return None
+
+    return _unary.get(node.oper)
+
+
+def literal_value(node: Literal):
+    """
+    Valor de un literal tal como lo usa el programa, las secuencias de
+    escape de char y string ('\\n', '\\t', ...) ya interpretadas.
+    """
+    val = node.value
+
+    if isinstance(val, str):
+        val = val.encode("utf-8").decode("unicode_escape")
+
+    return val
+
+
+def _mark_tail_calls(decl: FuncDecl):
+    """Marca los return que llaman a la misma función con todos sus argumentos"""
+    stack = list(decl.body)
+
+    while stack:
+        n = stack.pop()
+
+        if isinstance(n, list):
+            stack.extend(n)
+            continue
+        elif not isinstance(n, Node) or isinstance(n, FuncDecl):
+            continue
+
+        if (
+            isinstance(n, ReturnStmt)
+            and isinstance(n.expr, FuncCall)
+            and n.expr.name == decl.name
+            and len(n.expr.args) == len(decl.params)
+        ):
+            n._tail_call = True
+
+        for key, value in vars(n).items():
+            if not key.startswith("_") and isinstance(value, (Node, list)):
+                stack.append(value)
+
+
+def specialize(node: Node):
+    """
+    Recorre el AST ya verificado una sola vez y guarda en cada nodo lo
+    que no cambia entre evaluaciones:
+
+        BinOper._binop, UnaryOper._unop: operador según el tipo estático
+        Literal._value: valor decodificado
+        ReturnStmt._tail_call: return f(args) dentro de la misma f, se
+            ejecuta como un ciclo en lugar de una llamada
+    """
+    stack = [node]
+    seen = set()
+
+    while stack:
+        n = stack.pop()
+
+        if isinstance(n, list):
+            stack.extend(n)
+            continue
+        elif not isinstance(n, Node) or id(n) in seen:
+            continue
+
+        seen.add(id(n))
+
+        if isinstance(n, BinOper):
+            n._binop = binop_for(n)
+        elif isinstance(n, UnaryOper):
+            n._unop = unaryop_for(n)
+        elif isinstance(n, Literal):
+            n._value = literal_value(n)
+        elif isinstance(n, FuncDecl) and n.body:
+            _mark_tail_calls(n)
+
+        for key, value in vars(n).items():
+            if not key.startswith("_") and isinstance(value, (Node, list)):
+                stack.append(value)
@@ -0,0 +1,196 @@
+"""
+Profiler de programas B-minor (--interprete --profile)
+
+Cuenta ejecuciones y tiempo acumulado por función (FuncDecl) y por línea
+del código fuente (el lineno que el parser pone con _L). Funciona sobre
+el backend de closures: ClosureCompiler envuelve al compilar el cuerpo de
+cada función y cada sentencia, así que sin profiler no hay ningún costo
+y con él solo dos lecturas del reloj por sentencia.
+
+    llamadas    veces que se ejecutó la función o alguna sentencia de la línea
+    total       tiempo acumulado, incluye lo que se llama desde ahí. En una
+                recursión solo cuenta la activación más externa
+    propio      tiempo de la función sin las funciones que llama
+
+Las pilas se guardan en formato "collapsed" (una línea por pila,
+`<global>;main;fib 1234` en microsegundos de tiempo propio), la entrada
+de flamegraph.pl, speedscope o inferno.
+"""
+
+from time import perf_counter_ns
+
+ROOT = "<global>"
+
+
+class Stats:
+    __slots__ = ("calls", "total", "own", "depth")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0
+        self.own = 0
+        self.depth = 0
+
+
+class Profiler:
+    def __init__(self):
+        self.functions = {}  # nombre -> Stats
+        self.lines = {}  # línea -> Stats
+        self.line_function = {}  # línea -> función que la contiene
+        self.stacks = {}  # id de pila -> ns de tiempo propio
+        self._paths = [(None, ROOT)]  # id de pila -> (id de la pila padre, función)
+        self._ids = {}  # (id de la pila padre, función) -> id de pila
+        self._frames = []  # [id de pila, ns de las funciones llamadas]
+
+    def _stack_id(self, parent: int, name: str) -> int:
+        key = (parent, name)
+        stack = self._ids.get(key)
+
+        if stack is None:
+            stack = self._ids[key] = len(self._paths)
+            self._paths.append(key)
+
+        return stack
+
+    def wrap_program(self, run):
+        """run() con el scope global como raíz de las pilas"""
+        stats = self.functions.setdefault(ROOT, Stats())
+
+        def profiled():
+            frame = [0, 0]
+            self._frames.append(frame)
+            stats.calls += 1
+            start = perf_counter_ns()
+
+            try:
+                run()
+            finally:
+                elapsed = perf_counter_ns() - start
+                self._frames.pop()
+                stats.total += elapsed
+                stats.own += elapsed - frame[1]
+                self.stacks[0] = self.stacks.get(0, 0) + elapsed - frame[1]
+
+        return profiled
+
+    def wrap_function(self, body, name: str):
+        """Cuerpo compilado de una función que registra cada llamada"""
+        stats = self.functions.setdefault(name, Stats())
+        frames = self._frames
+        stacks = self.stacks
+        stack_id = self._stack_id
+
+        def profiled(f):
+            parent = frames[-1]
+            frame = [stack_id(parent[0], name), 0]
+            frames.append(frame)
+            stats.calls += 1
+            stats.depth += 1
+            start = perf_counter_ns()
+
+            try:
+                return body(f)
+            finally:
+                elapsed = perf_counter_ns() - start
+                own = elapsed - frame[1]
+                frames.pop()
+                parent[1] += elapsed
+                stats.depth -= 1
+                stats.own += own
+                stacks[frame[0]] = stacks.get(frame[0], 0) + own
+
+                if not stats.depth:
+                    stats.total += elapsed
+
+        return profiled
+
+    def wrap_stmt(self, code, lineno: int, function: str | None):
+        """Sentencia compilada que suma su ejecución a la de su línea"""
+        stats = self.lines.setdefault(lineno, Stats())
+        self.line_function[lineno] = function or ROOT
+
+        def profiled(f):
+            stats.calls += 1
+            stats.depth += 1
+            start = perf_counter_ns()
+
+            try:
+                return code(f)
+            finally:
+                stats.depth -= 1
+
+                if not stats.depth:
+                    stats.total += perf_counter_ns() - start
+
+        return profiled
+
+    def _stack_name(self, stack: int) -> str:
+        names = []
+
+        while stack is not None:
+            stack, name = self._paths[stack]
+            names.append(name)
+
+        return ";".join(reversed(names))
+
+    def collapsed(self) -> str:
+        """Pilas en formato collapsed, tiempo propio en microsegundos"""
+        stacks = sorted(
+            (self._stack_name(stack), ns) for stack, ns in self.stacks.items()
+        )
+
+        return "".join(f"{name} {ns // 1000}\n" for name, ns in stacks if ns >= 1000)
+
+    def save_collapsed(self, filename: str):
+        with open(filename, "w") as f:
+            f.write(self.collapsed())
+
+    def print(self, source: str = "", limit: int = 20):
+        """Perfil plano de funciones y líneas, de mayor a menor tiempo total"""
+        import rich
+        from rich.markup import escape
+        from rich.table import Table
+
+        t = Table(title="Funciones", show_header=True, header_style="blue")
+        t.add_column("Función")
+        t.add_column("Llamadas", justify="right")
+        t.add_column("Total (ms)", justify="right")
+        t.add_column("Propio (ms)", justify="right")
+
+        functions = sorted(self.functions.items(), key=lambda item: -item[1].total)
+
+        for name, stats in functions[:limit]:
+            t.add_row(
+                escape(name),
+                f"{stats.calls:,}",
+                f"{stats.total / 1e6:.2f}",
+                f"{stats.own / 1e6:.2f}",
+            )
+
+        rich.print(t)
+
+        source_lines = source.splitlines()
+        t = Table(title="Líneas", show_header=True, header_style="blue")
+        t.add_column("Línea", justify="right")
+        t.add_column("Función")
+        t.add_column("Ejecuciones", justify="right")
+        t.add_column("Total (ms)", justify="right")
+        t.add_column("Código")
+
+        lines = sorted(self.lines.items(), key=lambda item: -item[1].total)
+
+        for lineno, stats in lines[:limit]:
+            code = ""
+
+            if 0 < lineno <= len(source_lines):
+                code = source_lines[lineno - 1].strip()
+
+            t.add_row(
+                str(lineno),
+                escape(self.line_function[lineno]),
+                f"{stats.calls:,}",
+                f"{stats.total / 1e6:.2f}",
+                escape(code),
+            )
+
+        rich.print(t)
@@ -0,0 +1,643 @@
+"""
+Backend pyjit: traducir B-minor a código fuente de Python
+
+El AST ya verificado se traduce a un módulo de Python que se compila una
+sola vez con compile() y se ejecuta con exec(). Así el trabajo de cada
+operación lo hace directamente el bytecode de Python:
+
+    - las variables de una función son locales reales de Python y las
+      globales son variables del módulo generado
+    - if/while/for/do-while son bucles nativos; un for de la forma
+      for (i = a; i < b; i++) se traduce a 'for i in range(...)'
+    - los arrays usan el mismo almacenamiento que Interpreter (arrays.py)
+    - un return f(args) dentro de f, fuera de bucles, reasigna los
+      parámetros y repite el cuerpo de la función con 'continue'
+
+La semántica es la de Interpreter: división entera con //, strings por
+valor, arrays por referencia, valores por defecto de _default_val y
+errores dentro de funciones reportados con Interpreter.error.
+
+El código generado se guarda en caché por hash del código fuente y de
+las opciones del Interpreter que cambian el AST (inline y licm), en
+memoria y en disco (ver _cache_dir).
+"""
+
+import hashlib
+import marshal
+import os
+import stat
+import sys
+from parser.model import *
+
+from semantic import Symtab
+
+from .arrays import new_array
+from .builtins import get_array_length
+from .interp import _default_val, _is_truthy
+from .operators import binop_for, literal_value, unaryop_for
+
+# cambiar al modificar la traducción para invalidar la caché en disco
+VERSION = 3
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "bminor-pyjit",
+)
+
+_cache = {}
+
+_BOOLEAN = SimpleTypes.BOOLEAN.value
+_INTEGER = SimpleTypes.INTEGER.value
+_STRING = SimpleTypes.STRING.value
+
+_compare = {"<", "<=", ">", ">=", "==", "!="}
+
+
+class _Pos:
+    """Posición para reportar errores (reemplaza al nodo del AST)"""
+
+    def __init__(self, oper, lineno):
+        self.oper = oper
+        self.lineno = lineno
+
+
+def _cache_dir() -> str | None:
+    """
+    CACHE_DIR si solo el usuario actual puede escribir en él, si no None.
+    marshal.load de un archivo que dejó otro usuario ejecutaría su código,
+    por eso el directorio se crea con modo 0700 y se descarta si es de otro
+    dueño, un enlace simbólico o si el grupo u otros tienen permisos.
+    """
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        info = os.lstat(CACHE_DIR)
+    except OSError:
+        return None
+
+    if not stat.S_ISDIR(info.st_mode):
+        return None
+    if os.name == "posix" and (
+        info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077
+    ):
+        return None
+
+    return CACHE_DIR
+
+
+def _store(value, array, index):
+    # asignación a un índice usada como expresión: a = b[i] = v
+    array[index] = value
+    return value
+
+
+_bases = {t.value.name: t.value for t in SimpleTypes}
+
+
+def _new_array(base: str, values: list, size: int = 0):
+    return new_array(_bases[base], values, size)
+
+
+class PyTranspiler(Visitor):
+    @classmethod
+    def transpile(cls, n: Program) -> str:
+        """Devuelve el código fuente de Python para el programa ya verificado"""
+        gen = cls()
+        gen.lines = []
+        gen.indent = 0
+        gen.preamble = []
+        gen.functions = []
+        gen.names = {}
+        gen.module_names = set()
+        gen.in_function = False
+        gen.func_globals = set()
+        gen.loops = []
+        gen.temp = 0
+
+        env = Symtab("global", register=False)
+        env["array_length"] = "_array_length"
+
+        # PRIMERA PASADA: nombres de las funciones, la última definición gana
+        gen.defined = {}
+
+        for decl in n.body:
+            if isinstance(decl, FuncDecl):
+                env[decl.name] = f"f_{decl.name}"
+
+                if decl.body is not None or decl.name not in gen.defined:
+                    gen.defined[decl.name] = decl
+
+        for stmt in n.body:
+            gen._stmt(stmt, env)
+
+        # funciones declaradas sin cuerpo devuelven su valor por defecto
+        for name, decl in gen.defined.items():
+            if decl.body is None:
+                gen.functions.append(f"def f_{name}(*args):")
+                gen.functions.append(f"    return {_default_val(decl.return_type)!r}")
+                gen.functions.append("")
+
+        return "\n".join(gen.preamble + [""] + gen.functions + gen.lines) + "\n"
+
+    @classmethod
+    def run(cls, n: Program, interp):
+        """
+        Ejecuta el programa con la salida y los errores de interp.
+        Usa la caché si el código fuente ya fue traducido antes.
+        """
+        code = cls.load(n, interp.ctxt.source_code, interp.inline, interp.licm)
+        namespace = {
+            "__name__": "bminor_pyjit",
+            "_print": interp._print,
+            "_binop": interp._apply_binop,
+            "_fail": interp.error,
+            "_truthy": _is_truthy,
+            "_Pos": _Pos,
+            "_store": _store,
+            "_new_array": _new_array,
+            "_array_length": get_array_length,
+        }
+
+        try:
+            exec(code, namespace)
+        except Exception as e:
+            raise RuntimeError(f"Error in Program \n\n {e}")
+
+    @classmethod
+    def load(cls, n: Program, source: str, inline=True, licm=True):
+        """
+        Código compilado para el programa, desde la caché si existe.
+        inline y licm son las opciones con que se transformó n: cambian
+        el código generado, así que forman parte de la clave.
+        """
+        options = f"inline={inline:d},licm={licm:d}"
+        text = f"{VERSION}:{sys.implementation.cache_tag}:{options}:{source}"
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        if key in _cache:
+            return _cache[key]
+
+        directory = _cache_dir()
+        path = directory and os.path.join(directory, f"{key}.bin")
+        code = None
+
+        if path:
+            try:
+                with open(path, "rb") as f:
+                    code = marshal.load(f)
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+        if code is None:
+            code = compile(cls.transpile(n), f"<bminor-pyjit {key[:12]}>", "exec")
+
+            if path:
+                try:
+                    with open(path, "wb") as f:
+                        marshal.dump(code, f)
+                except OSError:
+                    pass
+
+        _cache[key] = code
+        return code
+
+    # --- Utilidades
+
+    def _emit(self, line: str):
+        self.lines.append("    " * self.indent + line)
+
+    def _new_temp(self) -> str:
+        self.temp += 1
+        return f"_t{self.temp}"
+
+    def _pos(self, oper, lineno) -> str:
+        name = f"_p{len(self.preamble)}"
+        self.preamble.append(f"{name} = _Pos({oper!r}, {lineno!r})")
+        return name
+
+    def _declare(self, name: str, env: Symtab) -> str:
+        """Nombre de Python único para una declaración (evita choques por shadowing)"""
+        count = self.names.get(name, 0)
+        self.names[name] = count + 1
+        py_name = f"v_{name}" if count == 0 else f"v_{name}_{count}"
+        env[name] = py_name
+
+        if not self.in_function:
+            self.module_names.add(py_name)
+
+        return py_name
+
+    def _name(self, name: str, env: Symtab) -> str:
+        py_name = env.get(name)
+
+        if self.in_function and py_name in self.module_names:
+            self.func_globals.add(py_name)
+
+        return py_name
+
+    def _expr(self, n: Node, env: Symtab) -> str:
+        return n.accept(self, env)
+
+    def _cond(self, n: Node | None, env: Symtab) -> str:
+        if n is None:
+            return "True"
+
+        code = self._expr(n, env)
+
+        if getattr(n, "type", None) == _BOOLEAN:
+            return code
+
+        return f"_truthy({code})"
+
+    def _block(self, stmts: list, env: Symtab):
+        start = len(self.lines)
+
+        for stmt in stmts or []:
+            self._stmt(stmt, env)
+
+        if len(self.lines) == start:
+            self._emit("pass")
+
+    def _stmt(self, n: Node, env: Symtab):
+        if isinstance(n, Assignment):
+            self._emit(self._assign(n, env))
+        elif isinstance(n, (Increment, Decrement)) and isinstance(n.location, VarLoc):
+            op = "+=" if isinstance(n, Increment) else "-="
+            self._emit(f"{self._name(n.location.name, env)} {op} 1")
+        elif isinstance(n, Expression):
+            self._emit(self._expr(n, env))
+        else:
+            n.accept(self, env)
+
+    def _assign(self, n: Assignment, env: Symtab) -> str:
+        value = self._expr(n.value, env)
+
+        if isinstance(n.location, ArrayLoc):
+            array = self._expr(n.location.array, env)
+            index = self._expr(n.location.index, env)
+            return f"{array}[{index}] = {value}"
+
+        return f"{self._name(n.location.name, env)} = {value}"
+
+    def _array_value(self, base, items: list | None, size: str | None) -> str:
+        values = f"[{', '.join(items or [])}]"
+
+        if isinstance(base, SimpleType) and base != _STRING:
+            return f"_new_array({base.name!r}, {values}, {size or 0})"
+        elif items or size is None:
+            return values
+
+        return f"[{_default_val(base)!r} for _ in range({size})]"
+
+    # --- Statements
+
+    def visit(self, n: BlockStmt, env: Symtab):
+        self._block(n.body, Symtab("block", env, register=False))
+
+    def visit(self, n: PrintStmt, env: Symtab):
+        for expr in n.expr:
+            code = self._expr(expr, env)
+
+            if expr.type == _BOOLEAN:
+                self._emit(f'_print("true" if {code} else "false")')
+            elif isinstance(expr.type, SimpleType):
+                self._emit(f"_print({code})")
+            else:
+                temp = self._new_temp()
+                self._emit(f"{temp} = {code}")
+                self._emit(
+                    f'_print(("true" if {temp} else "false") '
+                    f"if isinstance({temp}, bool) else {temp})"
+                )
+
+    def visit(self, n: IfStmt, env: Symtab):
+        self._emit(f"if {self._cond(n.condition, env)}:")
+        self.indent += 1
+        self._block(n.then_branch, Symtab("if", env, register=False))
+        self.indent -= 1
+
+        if n.else_branch:
+            self._emit("else:")
+            self.indent += 1
+            self._block(n.else_branch, Symtab("else", env, register=False))
+            self.indent -= 1
+
+    def visit(self, n: WhileStmt, env: Symtab):
+        env = Symtab("while", env, register=False)
+        self._emit(f"while {self._cond(n.condition, env)}:")
+        self.indent += 1
+        self.loops.append(None)
+        self._block(n.body, env)
+        self.loops.pop()
+        self.indent -= 1
+
+    def visit(self, n: DoWhileStmt, env: Symtab):
+        cond = self._cond(n.condition, env)
+
+        # continue debe evaluar la condición antes de repetir
+        check = lambda: self._emit(f"if not ({cond}): break")
+
+        self._emit("while True:")
+        self.indent += 1
+        self.loops.append(check)
+        self._block(n.body, Symtab("do-while", env, register=False))
+        self.loops.pop()
+        check()
+        self.indent -= 1
+
+    def _range_loop(self, n: ForStmt, env: Symtab) -> bool:
+        """
+        for (i = a; i < b; i++) { ... } como 'for i in range(a, b)' si el
+        cuerpo no escribe i ni el límite b, que se evalúa una sola vez.
+        Al terminar sin break i queda como en el bucle original.
+        """
+        init, cond, update = n.init, n.condition, n.update
+
+        if not (
+            isinstance(init, Assignment)
+            and isinstance(init.location, VarLoc)
+            and init.location.type == _INTEGER
+            and isinstance(cond, BinOper)
+            and cond.oper in ("<", "<=")
+            and isinstance(cond.left, VarLoc)
+            and cond.left.name == init.location.name
+            and cond.right.type == _INTEGER
+            and isinstance(update, Increment)
+            and isinstance(update.location, VarLoc)
+            and update.location.name == init.location.name
+        ):
+            return False
+
+        var = init.location.name
+        bound = cond.right
+
+        if isinstance(bound, FuncCall) and bound.name == "array_length":
+            bound_vars = {a.name for a in bound.args if isinstance(a, VarLoc)}
+
+            if len(bound_vars) != len(bound.args):
+                return False
+        elif isinstance(bound, VarLoc):
+            bound_vars = {bound.name}
+        elif isinstance(bound, Integer):
+            bound_vars = set()
+        else:
+            return False
+
+        written, calls = _writes(n.body)
+        is_global = lambda name: env.get(name) in self.module_names
+
+        if var in written or bound_vars & written:
+            return False
+        elif calls and any(is_global(v) for v in bound_vars | {var}):
+            # una función podría modificar la variable global
+            return False
+
+        py_var = self._name(var, env)
+        start = self._expr(init.value, env)
+        stop = self._expr(bound, env)
+
+        if cond.oper == "<=":
+            stop = f"{stop} + 1"
+
+        start_temp, stop_temp = self._new_temp(), self._new_temp()
+
+        self._emit(f"{start_temp} = {start}")
+        self._emit(f"{stop_temp} = {stop}")
+        self._emit(f"for {py_var} in range({start_temp}, {stop_temp}):")
+        self.indent += 1
+        self.loops.append(None)
+        self._block(n.body, env)
+        self.loops.pop()
+        self.indent -= 1
+        self._emit("else:")
+        self._emit(f"    {py_var} = max({start_temp}, {stop_temp})")
+
+        return True
+
+    def visit(self, n: ForStmt, env: Symtab):
+        env = Symtab("for", env, register=False)
+
+        if self._range_loop(n, env):
+            return
+
+        if n.init:
+            self._stmt(n.init, env)
+
+        # condición y update antes que el cuerpo: no ven sus declaraciones
+        cond = self._cond(n.condition, env)
+        update_lines = []
+
+        if n.update:
+            outer, self.lines = self.lines, update_lines
+            indent, self.indent = self.indent, 0
+            self._stmt(n.update, env)
+            self.lines, self.indent = outer, indent
+
+        def update():
+            for line in update_lines:
+                self._emit(line)
+
+        self._emit(f"while {cond}:")
+        self.indent += 1
+        self.loops.append(update)
+        self._block(n.body, env)
+        self.loops.pop()
+        update()
+        self.indent -= 1
+
+    def visit(self, n: ContinueStmt, env: Symtab):
+        before_continue = self.loops[-1]
+
+        if before_continue is not None:
+            before_continue()
+
+        self._emit("continue")
+
+    def visit(self, n: BreakStmt, env: Symtab):
+        self._emit("break")
+
+    def visit(self, n: ReturnStmt, env: Symtab):
+        if getattr(n, "_tail_call", False) and not self.loops:
+            # dentro de un bucle 'continue' sería del bucle
+            args = [f"({self._expr(arg, env)})" for arg in n.expr.args]
+
+            if self.tail_params:
+                self._emit(f"{', '.join(self.tail_params)} = {', '.join(args)},")
+
+            self._emit("continue")
+            self.tail_loop = True
+        elif n.expr is None:
+            self._emit(f"return {self.return_default!r}")
+        else:
+            self._emit(f"return {self._expr(n.expr, env)}")
+
+    # --- Declarations
+
+    def visit(self, n: FuncDecl, env: Symtab):
+        if n.body is None or self.defined[n.name] is not n:
+            return
+
+        outer_lines, outer_indent = self.lines, self.indent
+        self.lines, self.indent = [], 2
+        self.in_function, self.func_globals = True, set()
+        self.return_default = _default_val(n.return_type)
+
+        local_env = Symtab(n.name, env, register=False)
+        params = [self._declare(p.name, local_env) for p in n.params]
+        self.tail_params, self.tail_loop = params, False
+
+        self._block(n.body, local_env)
+        body = self.lines
+
+        pos = self._pos(None, n.lineno)
+        header = [f"def f_{n.name}({', '.join(params)}):"]
+
+        if self.func_globals:
+            header.append(f"    global {', '.join(sorted(self.func_globals))}")
+
+        function = ["    try:"] + body
+        function += [
+            "    except Exception as e:",
+            f'        _fail({pos}, f"Un error inesperado en {n.name}: {{e}}")',
+            f"    return {self.return_default!r}",
+        ]
+
+        if self.tail_loop:
+            function = ["    while True:"] + ["    " + line for line in function]
+
+        self.functions += header + function + [""]
+
+        self.lines, self.indent = outer_lines, outer_indent
+        self.in_function = False
+
+    def visit(self, n: VarDecl, env: Symtab):
+        if isinstance(n, AutoDecl) and isinstance(n.value, list):
+            items = [self._expr(v, env) for v in n.value]
+            value = self._array_value(n.type.base, items, None)
+        elif n.value:
+            value = self._expr(n.value, env)
+        else:
+            value = repr(_default_val(n.type))
+
+        self._emit(f"{self._declare(n.name, env)} = {value}")
+
+    def visit(self, n: ArrayDecl, env: Symtab):
+        items = [self._expr(v, env) for v in n.value or []]
+
+        if isinstance(n.type.size, int):
+            size = repr(n.type.size)
+        else:
+            size = self._expr(n.type.size, env)
+
+        value = self._array_value(n.type.base, items, size)
+        self._emit(f"{self._declare(n.name, env)} = {value}")
+
+    # --- Expressions
+
+    def visit(self, n: Literal, env: Symtab):
+        return repr(literal_value(n))
+
+    def visit(self, n: VarLoc, env: Symtab):
+        return self._name(n.name, env)
+
+    def visit(self, n: ArrayLoc, env: Symtab):
+        return f"{self._expr(n.array, env)}[{self._expr(n.index, env)}]"
+
+    def visit(self, n: Assignment, env: Symtab):
+        value = self._expr(n.value, env)
+
+        if isinstance(n.location, ArrayLoc):
+            array = self._expr(n.location.array, env)
+            index = self._expr(n.location.index, env)
+            return f"_store({value}, {array}, {index})"
+
+        return f"({self._name(n.location.name, env)} := {value})"
+
+    def visit(self, n: Increment | Decrement, env: Symtab):
+        sign, undo = ("+", "-") if isinstance(n, Increment) else ("-", "+")
+
+        if not isinstance(n.location, VarLoc):
+            # sin ubicación en memoria: se opera sobre el valor temporal
+            value = self._expr(n.location, env)
+            return value if n.postfix else f"({value} {sign} 1)"
+
+        name = self._name(n.location.name, env)
+        updated = f"({name} := {name} {sign} 1)"
+
+        return f"({updated} {undo} 1)" if n.postfix else updated
+
+    def visit(self, n: UnaryOper, env: Symtab):
+        expr = self._expr(n.expr, env)
+
+        if n.oper == "!":
+            if unaryop_for(n) is not None:
+                return f"(not {expr})"
+
+            return f"(not _truthy({expr}))"
+
+        return f"({n.oper}{expr})"
+
+    def visit(self, n: BinOper, env: Symtab):
+        left = self._expr(n.left, env)
+        right = self._expr(n.right, env)
+
+        if n.oper in ("LAND", "LOR"):
+            op = "and" if n.oper == "LAND" else "or"
+
+            if n.left.type == _BOOLEAN and n.right.type == _BOOLEAN:
+                return f"({left} {op} {right})"
+
+            temp = self._new_temp()
+
+            if n.oper == "LOR":
+                return f"({temp} if _truthy({temp} := {left}) else {right})"
+
+            return f"({right} if _truthy({temp} := {left}) else {temp})"
+
+        if binop_for(n) is not None:
+            oper = n.oper
+
+            if oper == "/" and n.left.type == _INTEGER:
+                oper = "//"
+
+            return f"({left} {oper} {right})"
+
+        # tipos no probados: misma verificación que Interpreter.check
+        return f"_binop({self._pos(n.oper, n.lineno)}, {left}, {right})"
+
+    def visit(self, n: FuncCall, env: Symtab):
+        args = ", ".join(self._expr(arg, env) for arg in n.args)
+        return f"{env.get(n.name)}({args})"
+
+
+def _writes(stmts) -> tuple:
+    """
+    Nombres de variables escritos (asignación, ++, --, declaración) en
+    las sentencias y si hay llamadas a funciones.
+    """
+    written = set()
+    calls = False
+    stack = list(stmts or [])
+
+    while stack:
+        n = stack.pop()
+
+        if isinstance(n, list):
+            stack.extend(n)
+            continue
+        elif not isinstance(n, Node):
+            continue
+
+        if isinstance(n, (Assignment, Increment, Decrement)) and isinstance(
+            n.location, VarLoc
+        ):
+            written.add(n.location.name)
+        elif isinstance(n, (VarDecl, ArrayDecl)):
+            written.add(n.name)
+        elif isinstance(n, FuncCall) and n.name != "array_length":
+            calls = True
+
+        for key, value in vars(n).items():
+            if not key.startswith("_") and isinstance(value, (Node, list)):
+                stack.append(value)
+
+    return written, calls
@@ -1,3 +1,9 @@
-from .ir_gen import IRGenerator
+from .ir_gen import IRGenerator, set_allocation_strategy
 from .ir_type import IrTypes
-from .runner import run_llvm_clang_ir, run_llvm_ir
+from .runner import (
+    run_llvm_clang_ir,
+    run_llvm_ir,
+    run_llvm_module,
+    set_runtime_lto,
+    set_runtime_stats,
+)
@@ -0,0 +1,186 @@
+"""
+Arrays locales en el stack
+
+Un array declarado en una función con tamaño constante se puede crear
+con alloca en vez de _bminor_array_new (un malloc para el header y un
+calloc para los datos) si ninguna referencia a él sobrevive a la
+función. Así tampoco hace falta el decref al salir del bloque.
+
+Un uso de la variable del array no escapa si:
+
+    - indexa el array: a[i]
+    - lo pasa a un parámetro que la función llamada no retiene (ver
+      array_params): el llamador no hace incref/decref
+
+Cualquier otro uso (return a, b = a, a = ..., {a}, pasarlo a un
+parámetro retenido) deja en el heap todas las declaraciones con ese
+nombre en la función.
+
+Además:
+
+    - solo arrays de integer, float, char y boolean: el decref de un
+      array de strings libera sus elementos
+    - el tamaño es un literal, un constant entero o + - * de ellos, y
+      coincide con el de la lista de inicialización si la hay (si no,
+      _bminor_array_new reporta el error)
+    - la función no es recursiva, ni llama a funciones sin cuerpo que
+      podrían llamarla: cada llamada anidada tendría sus propios arrays
+    - hasta MAX_STACK_BYTES de datos por función
+"""
+
+from parser.model import *
+
+from .ir_type import IrTypes
+from .string_params import _walk
+
+MAX_STACK_BYTES = 4096
+
+
+def integer_constants(body: list) -> dict:
+    """Nombre -> valor de los constant con un literal entero bajo body"""
+    values = {}
+
+    for n in _walk(body):
+        if isinstance(n, ConstantDecl) and isinstance(n.value, Integer):
+            values.setdefault(n.name, set()).add(n.value.value)
+
+    # el mismo nombre con dos valores en distintos bloques: ninguno
+    return {name: v.pop() for name, v in values.items() if len(v) == 1}
+
+
+def recursive_functions(program: Program) -> set:
+    """Funciones que se pueden llamar a sí mismas, directa o indirectamente"""
+    calls = {}
+
+    for decl in program.body:
+        if isinstance(decl, FuncDecl) and decl.body is not None:
+            calls[decl.name] = {
+                n.name for n in _walk(decl.body) if isinstance(n, FuncCall)
+            }
+
+    def reaches(start: str) -> bool:
+        seen, stack = set(), list(calls[start])
+
+        while stack:
+            name = stack.pop()
+
+            if name == start:
+                return True
+            if name in seen or name == "array_length":
+                continue
+            if name not in calls:  # sin cuerpo: de otro módulo
+                return True
+
+            seen.add(name)
+            stack.extend(calls[name])
+
+        return False
+
+    return {name for name in calls if reaches(name)}
+
+
+def _constant_size(n, constants: dict) -> int | None:
+    if isinstance(n, int):
+        return n
+    if isinstance(n, Integer):
+        return n.value
+    if isinstance(n, VarLoc):
+        return constants.get(n.name)
+    if isinstance(n, BinOper) and n.oper in ("+", "-", "*"):
+        left = _constant_size(n.left, constants)
+        right = _constant_size(n.right, constants)
+
+        if left is None or right is None:
+            return None
+        if n.oper == "+":
+            return left + right
+        if n.oper == "-":
+            return left - right
+
+        return left * right
+
+    return None
+
+
+def stack_arrays(func: FuncDecl, constants: dict, is_retained) -> dict:
+    """
+    id del ArrayDecl (o AutoDecl con una lista) -> tamaño, para los
+    arrays de func que van en el stack.
+
+    constants: constant enteros globales (integer_constants)
+    is_retained: (función, índice) -> True si el parámetro se retiene
+    """
+    nodes = list(_walk(func.body or []))
+    variables = {p.name for p in func.params}
+    declared = set()  # constant locales, con o sin literal entero
+
+    for n in nodes:
+        if isinstance(n, ConstantDecl):
+            declared.add(n.name)
+        elif isinstance(n, (VarDecl, ArrayDecl)):
+            variables.add(n.name)
+
+    # un nombre que en la función es variable, o constant con otro valor,
+    # no se puede reemplazar por su valor global
+    local_values = integer_constants(func.body or [])
+    constants = {
+        name: value
+        for name, value in {**constants, **local_values}.items()
+        if name not in variables
+        and (name not in declared or name in local_values)
+        and constants.get(name, value) == value
+    }
+
+    candidates = []
+
+    for n in nodes:
+        if isinstance(n, ArrayDecl):
+            values = n.value
+        elif isinstance(n, AutoDecl) and isinstance(n.value, list):
+            values = n.value
+        else:
+            continue
+
+        base = n.type.base
+
+        if isinstance(base, ArrayType) or base == SimpleTypes.STRING.value:
+            continue
+
+        size = _constant_size(n.type.size, constants)
+
+        if size is None or size <= 0 or (values and len(values) != size):
+            continue
+
+        candidates.append((n, size * IrTypes.get_align(base), size))
+
+    if not candidates:
+        return {}
+
+    names = {n.name for n, _, _ in candidates}
+    safe = set()
+
+    for n in nodes:
+        if isinstance(n, ArrayLoc):
+            safe.add(id(n.array))
+        elif isinstance(n, FuncCall):
+            for i, arg in enumerate(n.args):
+                if isinstance(arg, VarLoc) and not is_retained(n.name, i):
+                    safe.add(id(arg))
+
+    escaped = {
+        n.name
+        for n in nodes
+        if isinstance(n, VarLoc) and n.name in names and id(n) not in safe
+    }
+
+    result = {}
+    total = 0
+
+    for n, data_bytes, size in candidates:
+        if n.name in escaped or total + data_bytes > MAX_STACK_BYTES:
+            continue
+
+        result[id(n)] = size
+        total += data_bytes
+
+    return result
@@ -0,0 +1,130 @@
+"""
+Bucles for sin revisión de rango en los accesos a[i]
+
+En un bucle interno de la forma
+
+    for (i = inicio; i < fin; i++) { ... a[i] ... }
+
+donde el cuerpo no cambia i, fin ni a, todos los a[i] caen dentro del
+array si i >= 0 y fin <= array_length(a) al empezar. El generador revisa
+eso una vez antes del bucle y, si se cumple, ejecuta una copia del bucle
+en la que esos accesos no revisan el rango; si no, el bucle de siempre,
+que reporta el error en el mismo acceso. Sin la rama de error en cada
+vuelta LLVM puede vectorizar la copia.
+
+Condiciones:
+
+    - i < fin o i <= fin, con fin hecho de enteros, variables, + - * y
+      array_length(a): evaluarlo una vez de más no cambia el programa
+    - update i++, ++i o i = i + 1: con paso 1 i no se desborda antes de
+      llegar a fin
+    - el cuerpo no llama funciones (podrían cambiar i, fin o a si son
+      globales), no tiene bucles y no asigna ni declara i, las variables
+      de fin o los arrays
+"""
+
+from dataclasses import dataclass, field
+from parser.model import *
+
+from .string_params import _walk
+
+_LOOPS = (ForStmt, WhileStmt, DoWhileStmt)
+# con estas sentencias LLVM no vectoriza el bucle, no se le pide
+_SCALAR = (PrintStmt, ReturnStmt, BreakStmt, ContinueStmt)
+
+
+@dataclass
+class RangeLoop:
+    index: str  # variable del bucle
+    bound: Expression  # fin
+    inclusive: bool  # i <= fin
+    arrays: set = field(default_factory=set)  # arrays con accesos a[i]
+    accesses: set = field(default_factory=set)  # ids de esos ArrayLoc
+    vectorize: bool = True  # sin print, return, break ni continue
+
+
+def _bound_names(n: Expression) -> set | None:
+    """Variables de fin, None si fin no es una expresión permitida"""
+    if isinstance(n, Integer):
+        return set()
+    if isinstance(n, VarLoc):
+        return {n.name}
+    if isinstance(n, BinOper) and n.oper in ("+", "-", "*"):
+        left, right = _bound_names(n.left), _bound_names(n.right)
+
+        return None if left is None or right is None else left | right
+    if (
+        isinstance(n, FuncCall)
+        and n.name == "array_length"
+        and len(n.args) == 1
+        and isinstance(n.args[0], VarLoc)
+    ):
+        return {n.args[0].name}
+
+    return None
+
+
+def _steps_by_one(update: Node, index: str) -> bool:
+    if isinstance(update, Increment):
+        return isinstance(update.location, VarLoc) and update.location.name == index
+
+    return (
+        isinstance(update, Assignment)
+        and isinstance(update.location, VarLoc)
+        and update.location.name == index
+        and isinstance(update.value, BinOper)
+        and update.value.oper == "+"
+        and isinstance(update.value.left, VarLoc)
+        and update.value.left.name == index
+        and isinstance(update.value.right, Integer)
+        and update.value.right.value == 1
+    )
+
+
+def range_loop(n: ForStmt) -> RangeLoop | None:
+    """Los accesos a[i] del for que se pueden hacer sin revisar el rango"""
+    cond = n.condition
+
+    if not (
+        isinstance(cond, BinOper)
+        and cond.oper in ("<", "<=")
+        and isinstance(cond.left, VarLoc)
+        and cond.left.type == SimpleTypes.INTEGER.value
+    ):
+        return None
+
+    index = cond.left.name
+    names = _bound_names(cond.right)
+
+    if names is None or index in names or not _steps_by_one(n.update, index):
+        return None
+
+    loop = RangeLoop(index, cond.right, cond.oper == "<=")
+    changed = set()
+
+    for node in _walk(n.body):
+        if isinstance(node, _LOOPS):
+            return None
+        if isinstance(node, FuncCall) and node.name != "array_length":
+            return None
+        if isinstance(node, _SCALAR):
+            loop.vectorize = False
+        if isinstance(node, (Assignment, Increment, Decrement)):
+            if isinstance(node.location, VarLoc):
+                changed.add(node.location.name)
+        elif isinstance(node, (VarDecl, ArrayDecl)):
+            changed.add(node.name)
+        elif (
+            isinstance(node, ArrayLoc)
+            and isinstance(node.array, VarLoc)
+            and isinstance(node.index, VarLoc)
+            and node.index.name == index
+            and not isinstance(node.type, ArrayType)
+        ):
+            loop.arrays.add(node.array.name)
+            loop.accesses.add(id(node))
+
+    if not loop.arrays or changed & (names | loop.arrays | {index}):
+        return None
+
+    return loop
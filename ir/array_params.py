@@ -0,0 +1,108 @@
+"""
+Parámetros array que la función puede retener
+
+Al pasar un array a una función el llamador hace incref antes de la
+llamada y decref después, para que el array siga vivo aunque la función
+cambie la variable que lo contiene. Si la función no retiene el
+parámetro el par se compensa y se puede omitir.
+
+Un parámetro array se retiene si la función:
+
+    - lo asigna (a = ...), cambiando la variable del llamador
+    - lo retorna
+    - lo pasa a un parámetro que se retiene en otra función
+
+Las funciones sin cuerpo retienen todos sus parámetros; array_length
+solo lee el tamaño. En las llamadas a otros módulos (externs) se usa lo
+que dice su interfaz, pero al propagar se supone que retienen: así la
+interfaz de un módulo no depende de la de los módulos que importa.
+"""
+
+from parser.model import *
+
+from .string_params import _walk
+
+# funciones del runtime que no retienen sus argumentos
+_builtins = {"array_length": [False]}
+
+
+def retained_array_params(program: Program, externs: dict | None = None) -> dict:
+    """
+    Para cada función, una lista con True en los parámetros array que
+    la función puede retener y False en el resto.
+
+    externs: interfaz de las funciones de otros módulos, None si el
+    programa está completo
+    """
+    funcs = {}
+
+    for decl in program.body:
+        if isinstance(decl, FuncDecl):
+            if decl.body is not None or decl.name not in funcs:
+                funcs[decl.name] = decl
+
+    retained = {}  # función -> parámetros array retenidos
+    calls = {}  # función -> [(función llamada, índice, nombre del argumento)]
+
+    for name, decl in funcs.items():
+        params = {p.name for p in decl.params if isinstance(p.type, ArrayType)}
+
+        if decl.body is None:
+            retained[name], calls[name] = params, []
+            continue
+
+        nodes = list(_walk(decl.body))
+
+        assigned = {
+            n.location.name
+            for n in nodes
+            if isinstance(n, Assignment) and isinstance(n.location, VarLoc)
+        }
+        returned = {
+            n.expr.name
+            for n in nodes
+            if isinstance(n, ReturnStmt) and isinstance(n.expr, VarLoc)
+        }
+
+        retained[name] = params & (assigned | returned)
+        calls[name] = [
+            (n.name, i, arg.name)
+            for n in nodes
+            if isinstance(n, FuncCall)
+            for i, arg in enumerate(n.args)
+            if isinstance(arg, VarLoc) and arg.name in params
+        ]
+
+    changed = True
+
+    while changed:
+        changed = False
+
+        for name in funcs:
+            for callee, i, arg in calls[name]:
+                if arg in retained[name]:
+                    continue
+
+                if callee in funcs:
+                    flags = [p.name in retained[callee] for p in funcs[callee].params]
+                else:
+                    flags = _builtins.get(callee, [])
+
+                # función desconocida: suponer que retiene
+                if i >= len(flags) or flags[i]:
+                    retained[name].add(arg)
+                    changed = True
+
+    result = dict(_builtins)
+    result.update(
+        {
+            name: [p.name in retained[name] for p in decl.params]
+            for name, decl in funcs.items()
+        }
+    )
+
+    for name, info in (externs or {}).items():
+        if name in funcs and funcs[name].body is None:
+            result[name] = list(info["retained"])
+
+    return result
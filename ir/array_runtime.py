@@ -4,6 +4,18 @@ from .ir_type import IrTypes
 
 
 class ArrayRuntime:
+    # struct _bminor_array de runtime.c:
+    # {void* data, int32 data_size, int32 size, bool is_string, int32 reference_count}
+    header_t = ir.LiteralStructType(
+        [IrTypes.generic_pointer_t, IrTypes.i32, IrTypes.i32, IrTypes.i8, IrTypes.i32]
+    )
+    DATA = 0
+    SIZE = 2
+    REFERENCE_COUNT = 4
+
+    # data viene de calloc: alineado como max_align_t
+    DATA_ALIGN = 2 * IrTypes.get_ptr_size()
+
     def __init__(self, module):
         self.module = module
         self._functions = {}
@@ -129,3 +141,162 @@ class ArrayRuntime:
 
     def decref(self):
         return self._functions["_bminor_array_decref"]
+
+    def inline_incref(self, builder: ir.IRBuilder, array_ptr: ir.Value):
+        """
+        Igual que _bminor_array_incref pero sin llamada: incrementa el
+        campo reference_count directamente si el array no es null.
+        """
+        not_null = builder.icmp_unsigned("!=", array_ptr, IrTypes.null_pointer)
+
+        with builder.if_then(not_null, likely=True):
+            header = builder.bitcast(array_ptr, self.header_t.as_pointer())
+            count_ptr = builder.gep(
+                header,
+                [IrTypes.const_int(0), IrTypes.const_int(self.REFERENCE_COUNT)],
+                inbounds=True,
+                name="reference_count",
+            )
+            count = builder.load(count_ptr)
+            builder.store(builder.add(count, IrTypes.const_int(1)), count_ptr)
+
+    def stack_new(
+        self, alloca: ir.IRBuilder, size: int, element_size: int
+    ) -> tuple[ir.Value, ir.Value]:
+        """
+        Igual que _bminor_array_new pero con alloca (ir/array_escape.py).
+        El header se escribe una sola vez en el bloque alloca: data y size
+        no cambian y reference_count nunca llega a 0, el array no escapa.
+        Retorna el array (i8*) y sus datos, que se ponen en cero donde se
+        declara el array.
+        """
+        data_t = ir.ArrayType(IrTypes.i8, size * element_size)
+        data = alloca.alloca(data_t, name="array_data")
+        data.align = self.DATA_ALIGN
+
+        header = alloca.alloca(self.header_t, name="array_header")
+        header.align = IrTypes.get_ptr_size()
+
+        fields = (
+            alloca.bitcast(data, IrTypes.generic_pointer_t),
+            IrTypes.const_int(element_size),
+            IrTypes.const_int(size),
+            ir.Constant(IrTypes.i8, 0),  # is_string
+            IrTypes.const_int(1),  # reference_count
+        )
+
+        for i, value in enumerate(fields):
+            field_ptr = alloca.gep(
+                header, [IrTypes.const_int(0), IrTypes.const_int(i)], inbounds=True
+            )
+            alloca.store(value, field_ptr)
+
+        return alloca.bitcast(header, IrTypes.generic_pointer_t), data
+
+    def copy_data(
+        self, builder: ir.IRBuilder, array_ptr: ir.Value, source: ir.Value, size: int
+    ):
+        """Copia size bytes de source a los datos del array con un memcpy"""
+        memcpy = self.module.declare_intrinsic(
+            "llvm.memcpy",
+            [IrTypes.generic_pointer_t, IrTypes.generic_pointer_t, IrTypes.i32],
+        )
+        data = self._header_field(builder, array_ptr, self.DATA)
+        source = builder.bitcast(source, IrTypes.generic_pointer_t)
+
+        builder.call(
+            memcpy, [data, source, IrTypes.const_int(size), ir.Constant(IrTypes.i1, 0)]
+        )
+
+    # --- Acceso directo a los elementos ---
+    #
+    # data y size no cambian mientras el array existe (solo array_new los
+    # escribe), así que se cargan con !invariant.load y LLVM los puede
+    # sacar de los bucles aunque dentro se escriban elementos.
+
+    def _header_field(self, builder: ir.IRBuilder, array_ptr: ir.Value, field: int):
+        header = builder.bitcast(array_ptr, self.header_t.as_pointer())
+        field_ptr = builder.gep(
+            header,
+            [IrTypes.const_int(0), IrTypes.const_int(field)],
+            inbounds=True,
+        )
+        value = builder.load(field_ptr, name="data" if field == self.DATA else "size")
+        value.set_metadata("invariant.load", self.module.add_metadata([]))
+
+        return value
+
+    def inline_size(self, builder: ir.IRBuilder, array_ptr: ir.Value) -> ir.Value:
+        """Igual que _bminor_array_size: size del array, 0 si es null"""
+        func = builder.function
+        size_block = func.append_basic_block(name="array_size")
+        merge_block = func.append_basic_block(name="array_size_end")
+        entry_block = builder.block
+
+        not_null = builder.icmp_unsigned("!=", array_ptr, IrTypes.null_pointer)
+        builder.cbranch(not_null, size_block, merge_block)
+
+        builder.position_at_end(size_block)
+        size = self._header_field(builder, array_ptr, self.SIZE)
+        builder.branch(merge_block)
+
+        builder.position_at_end(merge_block)
+        result = builder.phi(IrTypes.i32, name="array_length")
+        result.add_incoming(size, size_block)
+        result.add_incoming(IrTypes.i32_zero, entry_block)
+
+        return result
+
+    def element_ptr(
+        self,
+        builder: ir.IRBuilder,
+        array_ptr: ir.Value,
+        index: ir.Value,
+        element_t: ir.Type,
+        fallback: ir.Function,
+        checked: bool = True,
+    ) -> ir.Value:
+        """
+        Puntero tipado al elemento index, sin llamar al runtime.
+
+        Si el array es null o index está fuera de rango se llama a
+        fallback, el get o set del runtime, que reporta el error y
+        termina el programa sin usar su tercer argumento. Con
+        checked=False el rango ya se revisó antes (ir/array_loops.py).
+        """
+        if not checked:
+            return self._element(builder, array_ptr, index, element_t)
+
+        func = builder.function
+        bounds_block = func.append_basic_block(name="array_bounds")
+        error_block = func.append_basic_block(name="array_error")
+        element_block = func.append_basic_block(name="array_element")
+
+        not_null = builder.icmp_unsigned("!=", array_ptr, IrTypes.null_pointer)
+        builder.cbranch(not_null, bounds_block, error_block)
+
+        # sin signo: un índice negativo también queda fuera de rango
+        builder.position_at_end(bounds_block)
+        size = self._header_field(builder, array_ptr, self.SIZE)
+        in_bounds = builder.icmp_unsigned("<", index, size)
+        builder.cbranch(in_bounds, element_block, error_block)
+
+        builder.position_at_end(error_block)
+        builder.call(fallback, [array_ptr, index, IrTypes.null_pointer])
+        builder.unreachable()
+
+        builder.position_at_end(element_block)
+
+        return self._element(builder, array_ptr, index, element_t)
+
+    def _element(self, builder, array_ptr, index, element_t) -> ir.Value:
+        data = self._header_field(builder, array_ptr, self.DATA)
+        data.set_metadata("nonnull", self.module.add_metadata([]))
+        data.set_metadata(
+            "align",
+            self.module.add_metadata([ir.Constant(ir.IntType(64), self.DATA_ALIGN)]),
+        )
+
+        elements = builder.bitcast(data, element_t.as_pointer())
+
+        return builder.gep(elements, [index], inbounds=True, name="element")
@@ -0,0 +1,372 @@
+"""
+Compilación separada y enlace de programas con varios módulos
+
+build() compila cada archivo .bminor a su propio .ll/.o en el directorio
+de compilación y enlaza todo con el runtime:
+
+    build/
+        lib.bmi     interfaz del módulo (ver ir/modules.py)
+        lib.json    estado: hash del fuente, interfaces importadas
+        lib.ll
+        lib.o
+        runtime.o
+
+Un módulo se recompila solo si cambió su fuente o la interfaz de alguno
+de los módulos que importa (los que exportan sus externs). Cambiar el
+cuerpo de una función sin cambiar su convención de llamada no cambia la
+interfaz, así que los módulos que la usan no se recompilan.
+
+El módulo que define main es el de entrada. Las sentencias globales del
+resto se ejecutan en un constructor antes de main, en el orden de
+enlace: primero los módulos importados.
+
+build_pgo() compila en dos pasos con optimización guiada por perfil:
+un ejecutable instrumentado con -fprofile-generate en build/pgo, que se
+ejecuta como entrenamiento, y el ejecutable final con -fprofile-use y
+el perfil de esas ejecuciones (build/bminor.profdata).
+"""
+
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+from parser import Parser
+from pathlib import Path
+
+from scanner import Lexer
+from semantic import Check, hoist_invariants, inline_calls
+from utils import clear_errors, errors_detected
+
+from .ir_gen import IRGenerator
+from .modules import defines_main, interface, interface_hash, prototypes
+from .runner import run_cmd
+
+RUNTIME_C = Path(__file__).parent / "runtime.c"
+PGO_DIR = "pgo"
+
+
+class BuildError(Exception):
+    pass
+
+
+class Module:
+    def __init__(self, source: Path, out_dir: Path):
+        self.source = source
+        self.name = re.sub(r"\W", "_", source.stem)
+        self.code = source.read_text()
+        self.hash = hashlib.sha256(self.code.encode()).hexdigest()
+
+        self.interface_path = out_dir / f"{self.name}.bmi"
+        self.state_path = out_dir / f"{self.name}.json"
+        self.ll_path = out_dir / f"{self.name}.ll"
+        self.obj_path = out_dir / f"{self.name}.o"
+
+        self.ast = None
+        self.env = None
+        self.state = self._load_state()
+
+    def _load_state(self) -> dict | None:
+        if not self.state_path.exists() or not self.obj_path.exists():
+            return None
+
+        state = json.loads(self.state_path.read_text())
+
+        return state if state.get("source") == self.hash else None
+
+    def check(self, inline: bool = True, licm: bool = True):
+        """Analiza el fuente si cambió, si no usa el estado guardado"""
+        if self.state is not None:
+            self.interface = self.state["interface"]
+            self.externs = self.state["externs"]
+            self.entry = self.state["entry"]
+            return
+
+        clear_errors()
+        ast = Parser().parse(Lexer().tokenize(self.code))
+
+        if not errors_detected():
+            env, ast = Check.checker(ast, return_ast=True)
+
+        if errors_detected():
+            raise BuildError(f"Errores en {self.source}")
+
+        # antes de la interfaz: las convenciones de llamada son las del
+        # código que se genera
+        if inline:
+            inline_calls(ast)
+        if licm:
+            hoist_invariants(ast)
+
+        self.ast, self.env = ast, env
+        self.interface = interface(ast, self.name)
+        self.externs = prototypes(ast)
+        self.entry = defines_main(ast)
+
+        # solo reescribir si cambia, los que importan el módulo la leen
+        text = json.dumps(self.interface, indent=2, sort_keys=True)
+
+        if not self.interface_path.exists() or self.interface_path.read_text() != text:
+            self.interface_path.write_text(text)
+
+
+def _providers(modules: list) -> dict:
+    """Función exportada -> módulo que la define"""
+    providers = {}
+
+    for module in modules:
+        for fname in module.interface["functions"]:
+            if fname in providers:
+                raise BuildError(
+                    f"La función '{fname}' está definida en {providers[fname].source} y {module.source}"
+                )
+
+            providers[fname] = module
+
+    return providers
+
+
+def _imports(module: Module, providers: dict) -> dict:
+    """Externs del módulo resueltos: función -> módulo, revisando la firma"""
+    imports = {}
+
+    for fname, sig in module.externs.items():
+        provider = providers.get(fname)
+
+        if provider is None or provider is module:
+            continue  # función del runtime de C, la resuelve el enlazador
+
+        exported = provider.interface["functions"][fname]["signature"]
+
+        if exported != sig:
+            raise BuildError(
+                f"{module.source}: '{fname}' se declara como '{sig}' pero {provider.source} la define como '{exported}'"
+            )
+
+        imports[fname] = provider
+
+    return imports
+
+
+def _link_order(modules: list, imports: dict) -> list:
+    """Módulos importados antes que los que los importan (tolera ciclos)"""
+    order, seen = [], set()
+
+    def visit(module):
+        if module.name in seen:
+            return
+
+        seen.add(module.name)
+
+        for provider in imports[module.name].values():
+            visit(provider)
+
+        order.append(module)
+
+    for module in modules:
+        visit(module)
+
+    return order
+
+
+def _pgo_flags(pgo: str | Path | None, out_dir: Path) -> list:
+    """Opciones de clang para compilar y enlazar en cada paso de PGO"""
+    if pgo == "generate":
+        # ruta absoluta: queda fija en el ejecutable instrumentado
+        return [f"-fprofile-generate={(out_dir / 'profiles').resolve()}"]
+    if pgo:
+        return [f"-fprofile-use={Path(pgo).resolve()}"]
+
+    return []
+
+
+def _pgo_key(pgo: str | Path | None) -> str | None:
+    """Lo que cambia los objetos compilados: el paso y el contenido del perfil"""
+    if pgo is None or pgo == "generate":
+        return pgo
+
+    return hashlib.sha256(Path(pgo).read_bytes()).hexdigest()
+
+
+def _compile_runtime(out_dir: Path, flags: list, pgo_key: str | None) -> Path:
+    obj_path = out_dir / "runtime.o"
+    state_path = out_dir / "runtime.json"
+    runtime_hash = hashlib.sha256(RUNTIME_C.read_bytes()).hexdigest()
+
+    if pgo_key:
+        runtime_hash += f":{pgo_key}"
+
+    if (
+        not obj_path.exists()
+        or not state_path.exists()
+        or state_path.read_text() != runtime_hash
+    ):
+        run_cmd(["clang", "-O2", *flags, "-c", str(RUNTIME_C), "-o", str(obj_path)])
+        state_path.write_text(runtime_hash)
+
+    return obj_path
+
+
+def build(
+    sources: list,
+    out_dir: str | Path = "build",
+    output: str | Path | None = None,
+    pgo: str | Path | None = None,
+    **options,
+) -> list:
+    """
+    Compila los módulos que cambiaron y enlaza el ejecutable.
+
+    args:
+        sources (list): archivos .bminor del programa
+        out_dir (str | Path): directorio para interfaces, .ll y .o
+        output (str | Path | None): ejecutable, por defecto out_dir/<módulo de entrada>
+        pgo (str | Path | None): "generate" para instrumentar, o el .profdata a usar
+        options: opciones de IRGenerator.Generate (allocation, optimize_refcounts, inline, licm, instrument, vectorize, stack_arrays)
+
+    return:
+        nombres de los módulos recompilados
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    modules = [Module(Path(source), out_dir) for source in sources]
+
+    names = [module.name for module in modules]
+    if len(set(names)) != len(names):
+        raise BuildError(f"Nombres de módulo repetidos: {names}")
+
+    # instrumentado sin inline, como en IRGenerator.Generate
+    inline = options.get("inline", True) and not options.get("instrument", False)
+    passes = (inline, options.get("licm", True))
+
+    for module in modules:
+        module.check(*passes)
+
+    entries = [module for module in modules if module.entry]
+
+    if len(entries) != 1:
+        raise BuildError(
+            f"Se necesita exactamente un módulo con main, hay {len(entries)}"
+        )
+
+    providers = _providers(modules)
+    imports = {module.name: _imports(module, providers) for module in modules}
+    flags = _pgo_flags(pgo, out_dir)
+    pgo_key = _pgo_key(pgo)
+    options_key = json.dumps(
+        dict(options, pgo=pgo_key) if pgo_key else options, sort_keys=True
+    )
+    rebuilt = []
+
+    for module in modules:
+        imported = {
+            provider.name: interface_hash(provider.interface)
+            for provider in imports[module.name].values()
+        }
+
+        if (
+            module.state is not None
+            and module.state["imports"] == imported
+            and module.state["options"] == options_key
+        ):
+            continue
+
+        if module.ast is None:
+            module.state = None
+            module.check(*passes)
+
+        externs = {
+            fname: provider.interface["functions"][fname]
+            for fname, provider in imports[module.name].items()
+        }
+
+        ir_module = IRGenerator.Generate(
+            module.ast,
+            module.env,
+            module.name,
+            externs=externs,
+            entry=module.entry,
+            **dict(options, inline=False, licm=False),  # ya aplicados en check
+        )
+
+        if errors_detected():
+            raise BuildError(f"Errores generando {module.source}")
+
+        module.ll_path.write_text(str(ir_module))
+        bc_path = module.ll_path.with_suffix(".bc")
+
+        run_cmd(["llvm-as", str(module.ll_path), "-o", str(bc_path)])
+        run_cmd(
+            ["clang", "-O2", *flags, "-c", str(bc_path), "-o", str(module.obj_path)]
+        )
+
+        module.state_path.write_text(
+            json.dumps(
+                {
+                    "source": module.hash,
+                    "interface": module.interface,
+                    "externs": module.externs,
+                    "entry": module.entry,
+                    "imports": imported,
+                    "options": options_key,
+                },
+                indent=2,
+            )
+        )
+        rebuilt.append(module.name)
+
+    objects = [str(m.obj_path) for m in _link_order(modules, imports)]
+    objects.append(str(_compile_runtime(out_dir, flags, pgo_key)))
+
+    if output is None:
+        output = out_dir / entries[0].name
+
+    run_cmd(["clang", *flags, *objects, "-fuse-ld=lld", "-o", str(output)])
+
+    return rebuilt
+
+
+def build_pgo(
+    sources: list,
+    out_dir: str | Path = "build",
+    output: str | Path | None = None,
+    runs: int = 1,
+    **options,
+) -> list:
+    """
+    Compila con optimización guiada por perfil.
+
+    El ejecutable instrumentado se compila en out_dir/pgo y se ejecuta
+    runs veces; los perfiles se unen con llvm-profdata y el ejecutable
+    final se compila con ellos. Como build(), solo recompila los módulos
+    que cambiaron, pero un perfil nuevo recompila todos los finales.
+
+    return:
+        nombres de los módulos recompilados en el paso final
+    """
+    out_dir = Path(out_dir)
+    train_dir = out_dir / PGO_DIR
+    profiles = train_dir / "profiles"
+    train = train_dir / "train"
+
+    shutil.rmtree(profiles, ignore_errors=True)
+    profiles.mkdir(parents=True)
+
+    build(sources, train_dir, train, pgo="generate", **options)
+
+    for _ in range(runs):
+        # la salida del entrenamiento no interesa, solo el perfil al terminar
+        subprocess.run([str(train.resolve())], stdout=subprocess.DEVNULL)
+
+    raw = sorted(str(path) for path in profiles.glob("*.profraw"))
+
+    if not raw:
+        raise BuildError(
+            f"El entrenamiento no generó perfiles en {profiles} (clang sin -fprofile-generate)"
+        )
+
+    profdata = out_dir / "bminor.profdata"
+    run_cmd(["llvm-profdata", "merge", f"-output={profdata}", *raw])
+
+    return build(sources, out_dir, output, pgo=profdata, **options)
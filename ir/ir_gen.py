@@ -13,29 +13,80 @@ from parser.model import *
 from llvmlite import ir
 
 from scanner import Lexer
-from semantic import Check, Symtab
+from semantic import Check, Symtab, hoist_invariants, inline_calls
 from utils import error, warning
 
+from .array_escape import integer_constants, recursive_functions, stack_arrays
+from .array_loops import RangeLoop, range_loop
+from .array_params import retained_array_params
 from .array_runtime import ArrayRuntime
 from .ir_type import IrTypes
 from .math_runtime import MathRuntime
 from .print_runtime import PrintRuntime
+from .profile_runtime import ProfileRuntime
+from .string_params import _walk, borrowed_params
 from .string_runtime import StringRuntime
+from .tbaa import TBAA
+from .temp_slots import TempSlots
+
+# Memoria de los strings temporales (concatenaciones intermedias y
+# argumentos prestados): "malloc" reserva y libera cada uno, "arena" los
+# reserva en la arena del runtime y los libera en bloque
+ALLOCATION_STRATEGIES = ("malloc", "arena")
+_default_allocation = "malloc"
+
+# valor de ReturnStmt cuando el return es una llamada de cola a la misma
+# función: _run_block salta al inicio del cuerpo en lugar de retornar
+_TAIL_CALL = object()
+
+_SCALARS = (
+    SimpleTypes.INTEGER.value,
+    SimpleTypes.FLOAT.value,
+    SimpleTypes.BOOLEAN.value,
+    SimpleTypes.CHAR.value,
+)
+
+
+def set_allocation_strategy(name: str):
+    """Estrategia usada cuando Generate no recibe una explícita"""
+    global _default_allocation
+
+    if name not in ALLOCATION_STRATEGIES:
+        raise ValueError(
+            f"Estrategia desconocida '{name}', use una de {ALLOCATION_STRATEGIES}"
+        )
+
+    _default_allocation = name
 
 
 class IRGenerator(Visitor):
     @classmethod
-    def generate_from_code(cls, code: str) -> ir.Module:
+    def generate_from_code(cls, code: str, **options) -> ir.Module:
 
         lexer = Lexer().tokenize(code)
         ast = Parser().parse(lexer)
         env, ast = Check.checker(ast, return_ast=True)
 
-        return cls.Generate(ast, env, None)
+        return cls.Generate(ast, env, None, **options)
 
     @classmethod
     def Generate(
-        cls, n: Program, semantic_env: Symtab, module_name: str | None
+        cls,
+        n: Program,
+        semantic_env: Symtab,
+        module_name: str | None,
+        optimize_refcounts: bool = True,
+        allocation: str | None = None,
+        externs: dict | None = None,
+        entry: bool = True,
+        functions: set | None = None,
+        conventions: tuple | None = None,
+        inline: bool = True,
+        licm: bool = True,
+        instrument: bool = False,
+        vectorize: bool = True,
+        stack_arrays: bool = True,
+        constant_arrays: bool = True,
     ) -> ir.Module:
         """
         Genera un módulo de IR a partir del AST y la tabla de símbolos.
@@ -47,7 +98,25 @@ class IRGenerator(Visitor):
             n (Program): AST del programa, el ast generado por el analizador semántico ya que este inyecta los tipos en cada nodo
             semantic_env (Symtab): Tabla de símbolos
             module_name (str | None): Nombre del módulo de IR
+            optimize_refcounts (bool): omitir incref/decref alrededor de llamadas a funciones que no retienen el array
+            allocation (str | None): "malloc" o "arena" para strings temporales, por defecto el de set_allocation_strategy
+            externs (dict | None): interfaz de las funciones de otros módulos (ir/modules.py), None si el programa está completo
+            entry (bool): módulo con el main de entrada; si no, sus sentencias globales van en un constructor
+            functions (set | None): solo definir estas funciones, el resto se declara (ir/parallel.py); con entry=False las globales son de otra parte
+            conventions (tuple | None): (strings prestados, arrays retenidos) ya calculados para todo el programa
+            inline (bool): reemplazar llamadas a funciones pequeñas por su cuerpo (semantic/inline.py), no con instrument
+            licm (bool): calcular antes de los bucles sus expresiones invariantes (semantic/licm.py)
+            instrument (bool): contar llamadas y tiempo de cada función con _bminor_prof_* del runtime
+            vectorize (bool): copia de los for sin revisar el rango de a[i] (ir/array_loops.py)
+            stack_arrays (bool): arrays locales que no escapan en el stack (ir/array_escape.py)
+            constant_arrays (bool): listas de literales copiadas de un global constante con memcpy
         """
+        if allocation is None:
+            allocation = _default_allocation
+        elif allocation not in ALLOCATION_STRATEGIES:
+            raise ValueError(
+                f"Estrategia desconocida '{allocation}', use una de {ALLOCATION_STRATEGIES}"
+            )
 
         gen = cls()
 
@@ -56,50 +125,99 @@ class IRGenerator(Visitor):
 
         module = ir.Module(name=module_name)
 
-        # Crear función run, bloques y builder
-        func_type = ir.FunctionType(IrTypes.i32, [])
-        run_func = ir.Function(module, func_type, name="main")
-
-        alloca_block = run_func.append_basic_block(name="alloca_entry")
-        entry_block = run_func.append_basic_block(name="entry")
-        global_exit_block = run_func.append_basic_block(name="global_exit")
-
-        alloca_builder = ir.IRBuilder(alloca_block)
-        run_builder = ir.IRBuilder(entry_block)
-
         # Asignar atributos al generador
         setattr(gen, "module", module)
         setattr(gen, "global_scope", True)
-        setattr(gen, "run_func", run_func)
-        setattr(gen, "run_builder", run_builder)
-        setattr(gen, "alloca_builder", alloca_builder)
-        setattr(gen, "entry_block", entry_block)
-        setattr(gen, "global_exit_block", global_exit_block)
         setattr(gen, "semantic_env", semantic_env)
         setattr(gen, "print_runtime", PrintRuntime(module))
         setattr(gen, "math_runtime", MathRuntime(module))
         setattr(gen, "string_runtime", StringRuntime(module))
         setattr(gen, "array_runtime", ArrayRuntime(module))
+        setattr(gen, "tbaa", TBAA(module))
+        setattr(gen, "profile_runtime", ProfileRuntime(module) if instrument else None)
         setattr(gen, "_string_cache", {})
+        setattr(gen, "_array_cache", {})
+        setattr(gen, "constant_arrays", constant_arrays)
+        setattr(gen, "temp_slots", {})
+        setattr(gen, "tail_loop", None)
+        setattr(gen, "tail_params", [])
+        setattr(gen, "tail_returns", set())
+        setattr(gen, "open_blocks", [])
+        setattr(gen, "unchecked_accesses", set())
+        setattr(gen, "vectorize", vectorize)
+        setattr(gen, "stack_sizes", {})
+        setattr(gen, "arena", allocation == "arena")
+        # con varios módulos cada uno tiene sus globales
+        setattr(gen, "global_linkage", "dso_local" if externs is None else "internal")
 
         # Entorno de símbolos contexto global
         env = Symtab("global")
 
-        # renombrar función main del usuario, main_uid para evitar conflicto con nuestro main de entrada
-        user_main = semantic_env.get("main", recursive=False)
+        # instrumentado sin inline: cada función cuenta sus propias llamadas
+        if inline and not instrument:
+            inline_calls(n)
+        if licm:
+            hoist_invariants(n)
 
-        if user_main:
-            user_main.name = f"main_{uuid.uuid4().hex}"
+        cls.rename_main(semantic_env)
+
+        # parámetros string que se pasan prestados, después de renombrar main
+        if conventions is None:
+            conventions = (
+                borrowed_params(n, externs),
+                retained_array_params(n, externs),
+            )
+
+        setattr(gen, "borrowed", conventions[0])
+        setattr(gen, "retained", conventions[1] if optimize_refcounts else None)
+
+        # arrays locales en el stack: no en funciones recursivas
+        if stack_arrays:
+            globals_ = [d for d in n.body if not isinstance(d, FuncDecl)]
+            setattr(gen, "constants", integer_constants(globals_))
+            setattr(gen, "recursive", recursive_functions(n))
+        else:
+            setattr(gen, "recursive", None)
 
         # PRIMERA PASADA: Declarar todas las funciones
         for decl in n.body:
             try:
                 if isinstance(decl, FuncDecl):
-                    gen.declare_function(decl, env, run_builder.module)
+                    gen.declare_function(decl, env, module)
             except Exception as e:
                 error(f"Error declaring function {decl.name}", lineno=decl.lineno)
 
-        gen._inject_fun_builtins(env, run_builder, alloca_builder, run_func)
+        gen._inject_fun_builtins(env)
+
+        if functions is not None and not entry:
+            # parte de un programa en paralelo: las globales y el main de
+            # entrada se generan en la parte principal
+            gen._declare_globals(n.body, env)
+            gen._define_functions(n.body, env, functions)
+            return module
+
+        # Crear función run, bloques y builder
+        if entry:
+            func_type = ir.FunctionType(IrTypes.i32, [])
+            run_func = ir.Function(module, func_type, name="main")
+        else:
+            func_type = ir.FunctionType(IrTypes.void, [])
+            run_func = ir.Function(
+                module, func_type, name=f"_bminor_init_{module_name}"
+            )
+
+        alloca_block = run_func.append_basic_block(name="alloca_entry")
+        entry_block = run_func.append_basic_block(name="entry")
+        global_exit_block = run_func.append_basic_block(name="global_exit")
+
+        alloca_builder = ir.IRBuilder(alloca_block)
+        run_builder = ir.IRBuilder(entry_block)
+
+        setattr(gen, "run_func", run_func)
+        setattr(gen, "run_builder", run_builder)
+        setattr(gen, "alloca_builder", alloca_builder)
+        setattr(gen, "entry_block", entry_block)
+        setattr(gen, "global_exit_block", global_exit_block)
 
         # Visitar todas las declaraciones
         # liberar string antes de salir
@@ -113,12 +231,7 @@ class IRGenerator(Visitor):
         )
 
         # SEGUNDA PASADA: Definir todas las funciones
-        for decl in n.body:
-            try:
-                if isinstance(decl, FuncDecl):
-                    gen.define_function(decl, env)
-            except Exception as e:
-                error(f"Error defining function {decl.name}", lineno=decl.lineno)
+        gen._define_functions(n.body, env, functions)
 
         # salto explícito al bloque principal
         # Posicionar run_builder al final del bloque antes de emitir ret
@@ -126,6 +239,12 @@ class IRGenerator(Visitor):
         run_builder.branch(global_exit_block)
         run_builder.position_at_start(global_exit_block)
 
+        if not entry:
+            # las globales del módulo viven hasta que termina el programa
+            run_builder.ret_void()
+            gen._register_constructor(run_func)
+            return module
+
         user_main = semantic_env.get("main", recursive=False)
 
         if user_main:
@@ -151,6 +270,64 @@ class IRGenerator(Visitor):
 
         return module
 
+    @staticmethod
+    def rename_main(semantic_env: Symtab):
+        """
+        Renombrar la función main del usuario a main_uid para evitar conflicto
+        con nuestro main de entrada. Solo una vez: las partes de un programa
+        en paralelo deben usar el mismo nombre.
+        """
+        user_main = semantic_env.get("main", recursive=False)
+
+        if user_main and user_main.name == "main":
+            user_main.name = f"main_{uuid.uuid4().hex}"
+
+    def _define_functions(self, body: list, env: Symtab, functions: set | None):
+        for decl in body:
+            try:
+                if isinstance(decl, FuncDecl):
+                    if functions is None or decl.name in functions:
+                        self.define_function(decl, env)
+            except Exception as e:
+                error(f"Error defining function {decl.name}", lineno=decl.lineno)
+
+    def _declare_globals(self, body: list, env: Symtab):
+        """Globales definidas en otra parte del programa: solo declararlas"""
+        for decl in body:
+            if isinstance(decl, ArrayDecl) or (
+                isinstance(decl, AutoDecl)
+                and (
+                    isinstance(decl.value, list)
+                    or isinstance(decl.value.type, ArrayType)
+                )
+            ):
+                llvm_type = IrTypes.generic_pointer_t
+            elif isinstance(decl, VarDecl):
+                llvm_type = IrTypes.get_type(decl.type)
+            else:
+                continue
+
+            env.add(decl.name, ir.GlobalVariable(self.module, llvm_type, decl.name))
+
+    def _register_constructor(self, func: ir.Function):
+        """Ejecutar func antes del main del programa (llvm.global_ctors)"""
+        ctor_t = ir.LiteralStructType(
+            [IrTypes.i32, func.type, IrTypes.generic_pointer_t]
+        )
+        ctors_t = ir.ArrayType(ctor_t, 1)
+
+        ctors = ir.GlobalVariable(self.module, ctors_t, "llvm.global_ctors")
+        ctors.linkage = "appending"
+        ctors.initializer = ir.Constant(
+            ctors_t,
+            [
+                ir.Constant(
+                    ctor_t,
+                    [ir.Constant(IrTypes.i32, 65535), func, IrTypes.null_pointer],
+                )
+            ],
+        )
+
     def _free_strings(self, builder: ir.IRBuilder, env: Symtab, strings_in_block: list):
         if not strings_in_block:
             return
@@ -209,6 +386,7 @@ class IRGenerator(Visitor):
         """
         strings_in_block = []
         arrays_in_block = []
+        self.open_blocks.append((env, strings_in_block, arrays_in_block))
 
         for stmt in n or []:
             self.global_scope = is_global
@@ -218,9 +396,23 @@ class IRGenerator(Visitor):
             elif isinstance(stmt, (ArrayDecl, Assignment, AutoDecl)) and isinstance(
                 stmt.type, ArrayType
             ):
-                arrays_in_block.append(stmt)
+                # los del stack no tienen decref
+                if id(stmt) not in self.stack_sizes:
+                    arrays_in_block.append(stmt)
             elif isinstance(stmt, (BreakStmt, ContinueStmt)):
                 self._free_strings(builder, env, strings_in_block)
+                self._decref_arrays(builder, env, arrays_in_block)
+
+                # y los de los bloques que lo contienen hasta el cuerpo del bucle
+                inner = env
+
+                for outer_env, strings, arrays in reversed(self.open_blocks[:-1]):
+                    if "loop_merge" in inner.entries:
+                        break
+
+                    self._free_strings(builder, outer_env, list(strings))
+                    self._decref_arrays(builder, outer_env, list(arrays))
+                    inner = outer_env
 
             try:
                 ptr = stmt.accept(self, env, builder, alloca, func)
@@ -237,6 +429,9 @@ class IRGenerator(Visitor):
                 self._free_strings(builder, env, strings_in_block)
                 self._decref_arrays(builder, env, arrays_in_block)
                 continue
+            finally:
+                # los temporales de la sentencia se pueden reutilizar
+                self._release_temps(alloca)
 
             # free string flotantes
             if (
@@ -254,13 +449,22 @@ class IRGenerator(Visitor):
                 self._free_strings(builder, env, strings_in_block)
                 self._decref_arrays(builder, env, arrays_in_block)
 
-                if ptr:
+                # y los de los bloques que lo contienen, que en los demás
+                # caminos se liberan al terminar cada bloque
+                for outer_env, strings, arrays in self.open_blocks[:-1]:
+                    self._free_strings(builder, outer_env, list(strings))
+                    self._decref_arrays(builder, outer_env, list(arrays))
+
+                if ptr is _TAIL_CALL:
+                    builder.branch(self.tail_loop)
+                elif ptr:
                     builder.ret(ptr)
 
             if builder.block.is_terminated:
                 break
 
         self.global_scope = is_global
+        self.open_blocks.pop()
 
         if is_global:
             return strings_in_block, arrays_in_block
@@ -273,6 +477,45 @@ class IRGenerator(Visitor):
 
         return tuple()
 
+    def _temp(self, alloca: ir.IRBuilder, llvm_type: ir.Type, name: str):
+        """Slot temporal en el bloque alloca de la función (ver TempSlots)"""
+        slots = self.temp_slots.get(alloca.block)
+
+        if slots is None:
+            slots = self.temp_slots[alloca.block] = TempSlots(alloca)
+
+        return slots.get(llvm_type, name)
+
+    def _release_temps(self, alloca: ir.IRBuilder):
+        """Fin de sentencia: los temporales se pueden reutilizar"""
+        slots = self.temp_slots.get(alloca.block)
+
+        if slots is not None:
+            slots.release()
+
+    def _is_concat(self, n) -> bool:
+        return (
+            isinstance(n, BinOper)
+            and n.oper == "+"
+            and n.type == SimpleTypes.STRING.value
+        )
+
+    def _arena_temporary(self, n, builder: ir.IRBuilder, mark=None):
+        """
+        Con --arena, marca la concatenación n como temporal (se reserva en la
+        arena) y devuelve la marca de la arena para liberarla en bloque
+        cuando se consuma su valor. Reutiliza mark si ya se tomó una.
+        """
+        if not self.arena or not self._is_concat(n):
+            return mark
+
+        n._arena_temporary = True
+
+        if mark is None:
+            mark = builder.call(self.string_runtime.arena_mark(), [], "arena_mark")
+
+        return mark
+
     def comment(self, builder: ir.IRBuilder, msg: str = None):
         if not msg:
             builder.comment("")
@@ -285,13 +528,7 @@ class IRGenerator(Visitor):
 
         builder.comment("-" * len(msg))
 
-    def _inject_fun_builtins(
-        self,
-        env: Symtab,
-        builder: ir.IRBuilder,
-        alloca: ir.IRBuilder,
-        func: ir.Function,
-    ):
+    def _inject_fun_builtins(self, env: Symtab):
         # agregar array_length(i8*)
         array_length = FuncDecl(
             name="array_length",
@@ -302,12 +539,13 @@ class IRGenerator(Visitor):
             body=None,
         )
         array_length.type = SimpleTypes.INTEGER.value
-        self.declare_function(array_length, env, builder.module)
+        self.declare_function(array_length, env, self.module)
 
         n = array_length
 
-        # definir
+        # definir, cada módulo tiene su copia
         func_body = env.get(n.name, recursive=False)
+        func_body.linkage = "internal"
 
         entry_block = func_body.append_basic_block(name="entry")
         body_builder = ir.IRBuilder(entry_block)
@@ -320,10 +558,10 @@ class IRGenerator(Visitor):
             llvm_arg = func_body.args[i]
             local_env.add(param.name, llvm_arg)
 
-        # llamar a runtime ._bminor_array_size
-        size_fn = self.array_runtime.size()
+        # igual que _bminor_array_size, sin llamada
         load_arr = body_builder.load(local_env.get(n.params[0].name))
-        size = body_builder.call(size_fn, [load_arr])
+        load_arr.set_metadata("tbaa", self.tbaa.tag("array"))
+        size = self.array_runtime.inline_size(body_builder, load_arr)
         body_builder.ret(size)
 
     def visit(
@@ -360,16 +598,36 @@ class IRGenerator(Visitor):
             array_ptr = array_var
         else:
             array_ptr = builder.load(array_var, name=f"{array_name}_ptr")
+            array_ptr.set_metadata("tbaa", self.tbaa.tag("array"))
 
         index = n.location.index.accept(self, env, builder, alloca, func)
 
+        if not isinstance(n.location.type, ArrayType) and (
+            n.location.type != SimpleTypes.STRING.value
+        ):
+            # acceso directo al elemento, el runtime solo para los errores
+            element = self.array_runtime.element_ptr(
+                builder,
+                array_ptr,
+                index,
+                val.type,
+                self.array_runtime.set(),
+                checked=id(n.location) not in self.unchecked_accesses,
+            )
+            store = builder.store(val, element)
+            store.align = IrTypes.get_align(n.location.type)
+            store.set_metadata("tbaa", self.tbaa.element(n.location.type))
+            self.comment(builder)
+
+            return val
+
         if n.location.type == SimpleTypes.STRING.value:
             # Si es string, el valor YA ES un puntero (i8*)
             value_ptr = val
         else:
             # Si es básico (int/bool), necesitamos un puntero a él.
             # Crear espacio temporal en el stack
-            temp_val = alloca.alloca(val.type, name="temp_assign_val")
+            temp_val = self._temp(alloca, val.type, "temp_assign_val")
             builder.store(val, temp_val)
 
             # Obtener el puntero genérico (i8*)
@@ -379,6 +637,18 @@ class IRGenerator(Visitor):
         set_fn = self.array_runtime.set()
         builder.call(set_fn, [array_ptr, index, value_ptr])
 
+        if n.location.type == SimpleTypes.STRING.value and isinstance(
+            n.value, (BinOper, FuncCall)
+        ):
+            # el array guarda una copia: liberar el temporal y usar como
+            # valor de la asignación el string del array
+            builder.call(self.string_runtime.free(), [val])
+
+            slot = self._temp(alloca, IrTypes.generic_pointer_t, "temp_assign_str")
+            slot_ptr = builder.bitcast(slot, IrTypes.generic_pointer_t)
+            builder.call(self.array_runtime.get(), [array_ptr, index, slot_ptr])
+            val = builder.load(slot)
+
         self.comment(builder)
 
         # retornar valor
@@ -451,13 +721,16 @@ class IRGenerator(Visitor):
         }
 
         for expr in n.expr or []:
+            mark = self._arena_temporary(expr, builder)
             val = expr.accept(self, env, builder, alloca, func)
 
             fn = fun_call[str(expr.type)]
             builder.call(fn, [val])
 
+            if mark is not None:
+                builder.call(self.string_runtime.arena_release(), [mark])
             # liberar string temporal si aplica
-            if expr.type == SimpleTypes.STRING.value and isinstance(
+            elif expr.type == SimpleTypes.STRING.value and isinstance(
                 expr, (BinOper, FuncCall)
             ):
                 free = self.string_runtime.free()
@@ -540,11 +813,44 @@ class IRGenerator(Visitor):
         if n.init:
             n.init.accept(self, env, builder, alloca, func)
 
-        # Crear los bloques básicos necesarios
+        merge_block = func.append_basic_block(name="for_merge")
+        loop = range_loop(n) if self.vectorize else None
+
+        if loop is None:
+            self._for_loop(n, env, builder, alloca, func, merge_block)
+        else:
+            # dos copias del bucle: sin revisar el rango de los a[i] si la
+            # revisión de antes del bucle pasa, la normal si no
+            unchecked_block = func.append_basic_block(name="for_unchecked")
+            checked_block = func.append_basic_block(name="for_checked")
+            in_range = self._range_guard(loop, env, builder, alloca, func)
+            builder.cbranch(in_range, unchecked_block, checked_block)
+
+            builder.position_at_end(unchecked_block)
+            outer, self.unchecked_accesses = self.unchecked_accesses, loop.accesses
+            latch = self._for_loop(n, env, builder, alloca, func, merge_block)
+            self.unchecked_accesses = outer
+            latch.set_metadata("llvm.loop", self._loop_metadata(loop.vectorize))
+
+            builder.position_at_end(checked_block)
+            self._for_loop(n, env, builder, alloca, func, merge_block)
+
+        builder.position_at_end(merge_block)
+        self.comment(builder, "End for loop")
+
+    def _for_loop(
+        self,
+        n: ForStmt,
+        env: Symtab,
+        builder: ir.IRBuilder,
+        alloca: ir.IRBuilder,
+        func: ir.Function,
+        merge_block: ir.Block,
+    ) -> ir.Instruction:
+        """Condición, cuerpo y update del for; retorna el salto de vuelta"""
         condition_block = func.append_basic_block(name="for_cond")
         loop_block = func.append_basic_block(name="for_body")
         update_block = func.append_basic_block(name="for_update")
-        merge_block = func.append_basic_block(name="for_merge")
 
         # Verificar la condición
         builder.branch(condition_block)
@@ -567,10 +873,52 @@ class IRGenerator(Visitor):
         if n.update:
             n.update.accept(self, env, builder, alloca, func)
 
-        builder.branch(condition_block)  # Volver a la condición
+        return builder.branch(condition_block)  # Volver a la condición
 
-        builder.position_at_end(merge_block)
-        self.comment(builder, "End for loop")
+    def _range_guard(
+        self,
+        loop: RangeLoop,
+        env: Symtab,
+        builder: ir.IRBuilder,
+        alloca: ir.IRBuilder,
+        func: ir.Function,
+    ) -> ir.Value:
+        """i >= 0 y fin <= array_length(a) (fin < con <=) para cada array"""
+        index = builder.load(env.get(loop.index), name=loop.index)
+        bound = loop.bound.accept(self, env, builder, alloca, func)
+        in_range = builder.icmp_signed(">=", index, IrTypes.i32_zero)
+
+        for name in sorted(loop.arrays):
+            array_var = env.get(name)
+
+            if array_var.type == IrTypes.generic_pointer_t:
+                array_ptr = array_var
+            else:
+                array_ptr = builder.load(array_var, name=f"{name}_array_ptr")
+
+            # un array null tiene tamaño 0: solo pasa si el bucle no corre
+            size = self.array_runtime.inline_size(builder, array_ptr)
+            fits = builder.icmp_signed("<" if loop.inclusive else "<=", bound, size)
+            in_range = builder.and_(in_range, fits)
+
+        return in_range
+
+    def _loop_metadata(self, vectorize: bool) -> ir.MDValue:
+        """!llvm.loop del bucle sin revisiones: termina y se puede vectorizar"""
+        options = [self.module.add_metadata(["llvm.loop.mustprogress"])]
+
+        if vectorize:
+            options.append(
+                self.module.add_metadata(
+                    ["llvm.loop.vectorize.enable", ir.Constant(IrTypes.i1, 1)]
+                )
+            )
+
+        # un nodo nuevo por bucle, su primer operando es él mismo
+        loop_id = ir.MDValue(self.module, [], name=str(len(self.module.metadata)))
+        loop_id.operands = (loop_id, *options)
+
+        return loop_id
 
     def visit(
         self,
@@ -680,6 +1028,17 @@ class IRGenerator(Visitor):
             self.default_return(builder, func.type)
             return None
 
+        if id(n) in self.tail_returns and not builder.block.is_terminated:
+            # llamada de cola a la misma función: nuevos parámetros y saltar
+            # al inicio del cuerpo, los argumentos se evalúan antes de guardar
+            self.comment(builder, "Tail call")
+            args = [arg.accept(self, env, builder, alloca, func) for arg in n.expr.args]
+
+            for ptr, arg in zip(self.tail_params, args):
+                builder.store(arg, ptr)
+
+            return _TAIL_CALL
+
         if not builder.block.is_terminated:
             val = n.expr.accept(self, env, builder, alloca, func)
 
@@ -796,13 +1155,18 @@ class IRGenerator(Visitor):
             n.type,
             n.value,
         )
+
+        if id(n) in self.stack_sizes:
+            self.stack_sizes[id(arr)] = self.stack_sizes[id(n)]
+
         self.visit(arr, env, builder, alloca, func)
+        self.stack_sizes.pop(id(arr), None)  # arr se libera y su id se reutiliza
 
     def _auto_array_decl_assign(self, n, env, builder, alloca, func):
         if self.global_scope:
             var = ir.GlobalVariable(self.module, IrTypes.generic_pointer_t, n.name)
             var.initializer = IrTypes.null_pointer
-            var.linkage = "dso_local"
+            var.linkage = self.global_linkage
         else:
             var = alloca.alloca(IrTypes.generic_pointer_t, name=n.name)
             alloca.store(IrTypes.null_pointer, var)
@@ -848,7 +1212,7 @@ class IRGenerator(Visitor):
             elif n.type == SimpleTypes.BOOLEAN.value:
                 var.initializer = IrTypes.const_bool(val)
 
-            var.linkage = "dso_local"
+            var.linkage = self.global_linkage
         else:
             var = alloca.alloca(
                 llvm_type, name=n.name
@@ -950,11 +1314,27 @@ class IRGenerator(Visitor):
         if self.global_scope:
             var = ir.GlobalVariable(self.module, IrTypes.generic_pointer_t, n.name)
             var.initializer = IrTypes.null_pointer
-            var.linkage = "dso_local"
+            var.linkage = self.global_linkage
         else:
             var = alloca.alloca(IrTypes.generic_pointer_t, name=n.name)
             builder.store(IrTypes.null_pointer, var)
 
+        stack_size = None if self.global_scope else self.stack_sizes.get(id(n))
+
+        if stack_size is not None:
+            # no escapa de la función: header y datos en el stack
+            env.add(n.name, var)
+            array_ptr, data = self.array_runtime.stack_new(
+                alloca, stack_size, IrTypes.get_align(n.type.base)
+            )
+
+            if not n.value:
+                builder.store(ir.Constant(data.allocated_type, None), data)
+
+            builder.store(array_ptr, var)
+            self._init_array(n, array_ptr, env, builder, alloca, func)
+            return
+
         if isinstance(n.type.size, int):
             # Auto array posible size como entero de len(n.value)
             size = IrTypes.const_int(n.type.size)
@@ -978,7 +1358,19 @@ class IRGenerator(Visitor):
         new_fn = self.array_runtime.new()
         array_ptr = builder.call(new_fn, [size, list_size, element_size, is_string])
         builder.store(array_ptr, load_var)
+        self._init_array(n, array_ptr, env, builder, alloca, func)
+
+    def _init_array(self, n: ArrayDecl, array_ptr, env, builder, alloca, func):
+        """Guarda los valores de la lista de inicialización en el array"""
+        table = self._constant_array(n) if n.value and self.constant_arrays else None
 
+        if table is not None:
+            # todos literales: un memcpy en vez de un set por elemento
+            size = len(n.value) * IrTypes.get_align(n.type.base)
+            self.array_runtime.copy_data(builder, array_ptr, table, size)
+            return
+
+        is_string = n.type.base == SimpleTypes.STRING.value
         temp_alloca_reusable = None
 
         if n.value:
@@ -986,8 +1378,8 @@ class IRGenerator(Visitor):
             if n.type.base != SimpleTypes.STRING.value:
                 # Asume que 'alloca' es el IRBuilder para el bloque alloca_entry
                 element_llvm_type = IrTypes.get_type(n.type.base)
-                temp_alloca_reusable = alloca.alloca(
-                    element_llvm_type, name="temp_arr_init_val"
+                temp_alloca_reusable = self._temp(
+                    alloca, element_llvm_type, "temp_arr_init_val"
                 )
 
             for i, val_ast in enumerate(n.value):
@@ -1006,6 +1398,49 @@ class IRGenerator(Visitor):
                     free=free,
                 )
 
+    def _constant_array(self, n: ArrayDecl) -> ir.GlobalVariable | None:
+        """
+        Global privado y constante [N x T] con los valores de la lista, si
+        todos son literales (o -literal) de integer, float, char o boolean.
+        Las listas iguales comparten el global.
+        """
+        base = n.type.base
+
+        if isinstance(base, ArrayType) or base == SimpleTypes.STRING.value:
+            return None
+
+        for value in n.value:
+            if isinstance(value, UnaryOper) and value.oper == "-":
+                value = value.expr
+            if not isinstance(value, (Integer, Float, Char, Boolean)):
+                return None
+
+        values = [self._get_literal_value(value) for value in n.value]
+
+        if base == SimpleTypes.FLOAT.value:
+            constants = [IrTypes.const_float(value) for value in values]
+        else:
+            # boolean ocupa un byte en los datos del array, como char
+            element_t = IrTypes.get_type(base)
+            element_t = IrTypes.i8 if element_t == IrTypes.i1 else element_t
+            constants = [ir.Constant(element_t, int(value)) for value in values]
+
+        table_t = ir.ArrayType(constants[0].type, len(constants))
+        key = (str(base), tuple(map(repr, values)))
+
+        if key not in self._array_cache:
+            table = ir.GlobalVariable(
+                self.module, table_t, self.module.get_unique_name("array_init")
+            )
+            table.linkage = "private"
+            table.global_constant = True
+            table.unnamed_addr = True
+            table.align = IrTypes.get_align(base)
+            table.initializer = ir.Constant(table_t, constants)
+            self._array_cache[key] = table
+
+        return self._array_cache[key]
+
     def default_return(self, builder: ir.IRBuilder, ret_type: ir.Type | None):
         """
         Genera un return por defecto si no hay uno explícito.
@@ -1022,6 +1457,19 @@ class IRGenerator(Visitor):
             elif ret_type == IrTypes.i1:
                 builder.ret(IrTypes.const_bool(False))
 
+    def _is_borrowed(self, func_name: str, index: int) -> bool:
+        """Parámetro string que la función solo lee: se pasa como i8* (ver string_params)"""
+        flags = getattr(self, "borrowed", {}).get(func_name)
+        return bool(flags) and index < len(flags) and flags[index]
+
+    def _is_retained(self, func_name: str, index: int) -> bool:
+        """Parámetro array que la función puede retener (ver array_params)"""
+        if self.retained is None:
+            return True
+
+        flags = self.retained.get(func_name)
+        return flags is None or index >= len(flags) or flags[index]
+
     def declare_function(self, n: FuncDecl, env: Symtab, module):
         # Obtener tipo de retorno y parámetros
         # Crear tipo de función LLVM
@@ -1029,13 +1477,16 @@ class IRGenerator(Visitor):
         ret_type = IrTypes.get_type(n.return_type)
         param_types = []
 
-        for p in n.params:
+        for i, p in enumerate(n.params):
             llvm_type = IrTypes.get_type(p.type)
 
             # Si el parámetro es STRING, se pasa por REFERENCIA (i8**),
             # por lo que el tipo de argumento es puntero al puntero del string.
+            # Si la función solo lo lee, se pasa prestado (i8*).
             if isinstance(p.type, ArrayType):
                 param_types.append(llvm_type.as_pointer())
+            elif p.type == SimpleTypes.STRING.value and self._is_borrowed(n.name, i):
+                param_types.append(llvm_type)
             elif p.type == SimpleTypes.STRING.value:
                 param_types.append(llvm_type.as_pointer())  # Convierte i8* a i8**
             else:
@@ -1070,6 +1521,12 @@ class IRGenerator(Visitor):
         alloca_builder = ir.IRBuilder(alloca_block)
         body_builder = ir.IRBuilder(entry_block)
 
+        if self.profile_runtime:
+            user_main = self.semantic_env.get("main", recursive=False)
+            display_name = "main" if user_main is n else n.name
+            counter = self.profile_runtime.counter(func_body.name, display_name)
+            body_builder.call(self.profile_runtime.enter(), [counter])
+
         # Entorno de la función
         local_env = Symtab(n.name, parent=env)
 
@@ -1077,7 +1534,12 @@ class IRGenerator(Visitor):
         for i, param in enumerate(n.params):
             llvm_arg = func_body.args[i]
 
-            if param.type == SimpleTypes.STRING.value or isinstance(
+            if param.type == SimpleTypes.STRING.value and self._is_borrowed(n.name, i):
+                # prestado: guardar el puntero en una variable local que no se libera
+                ptr = alloca_builder.alloca(llvm_arg.type, name=param.name)
+                body_builder.store(llvm_arg, ptr)
+                local_env.add(param.name, ptr)
+            elif param.type == SimpleTypes.STRING.value or isinstance(
                 param.type, ArrayType
             ):
                 # pasar por referencia
@@ -1091,11 +1553,105 @@ class IRGenerator(Visitor):
                 body_builder.store(llvm_arg, ptr)
                 local_env.add(param.name, ptr)
 
+        self.tail_returns = self._self_tail_calls(n)
+
+        if self.tail_returns:
+            self.tail_params = [local_env.get(p.name) for p in n.params]
+            self.tail_loop = func_body.append_basic_block(name="tail_loop")
+            body_builder.branch(self.tail_loop)
+            body_builder.position_at_end(self.tail_loop)
+
+        if self.recursive is not None and n.name not in self.recursive:
+            self.stack_sizes = stack_arrays(n, self.constants, self._is_retained)
+
         self._run_block(n.body, local_env, body_builder, alloca_builder, func_body)
 
         alloca_builder.branch(entry_block)
+        self.stack_sizes = {}
         self.default_return(body_builder, ret_type)  # asegurar return al final
 
+        self.tail_returns, self.tail_params, self.tail_loop = set(), [], None
+
+        if self.profile_runtime:
+            # con _bminor_prof_exit antes del ret ya no hay llamadas de cola
+            self._exit_before_returns(func_body, counter)
+        else:
+            self._mark_tail_calls(func_body)
+
+    def _exit_before_returns(self, func, counter):
+        """Llama a _bminor_prof_exit antes de cada ret de func"""
+        builder = ir.IRBuilder()
+
+        for block in func.blocks:
+            if isinstance(block.terminator, ir.Ret):
+                builder.position_before(block.terminator)
+                builder.call(self.profile_runtime.exit(), [counter])
+
+    def _self_tail_calls(self, n: Node) -> set:
+        """
+        ids de los return f(args) dentro de f que se pueden ejecutar como un
+        salto al inicio del cuerpo. Solo si los parámetros son escalares y la
+        función no declara strings ni arrays, que habría que liberar en cada
+        vuelta.
+        """
+        if any(p.type not in _SCALARS for p in n.params):
+            return set()
+
+        nodes = list(_walk(n.body))
+
+        for node in nodes:
+            if isinstance(node, ArrayDecl) or (
+                isinstance(node, VarDecl) and node.type not in _SCALARS
+            ):
+                return set()
+
+        return {
+            id(node)
+            for node in nodes
+            if isinstance(node, ReturnStmt)
+            and isinstance(node.expr, FuncCall)
+            and node.expr.name == n.name
+            and len(node.expr.args) == len(n.params)
+        }
+
+    def _mark_tail_calls(self, func):
+        """
+        Marca como tail las llamadas que van justo antes de retornar su
+        resultado y no reciben punteros al stack de func. Con el mismo
+        tipo de función se marcan musttail y LLVM debe reutilizar el frame.
+        """
+
+        def on_stack(value) -> bool:
+            while isinstance(value, (ir.CastInstr, ir.GEPInstr)):
+                value = value.operands[0]
+
+            return isinstance(value, ir.AllocaInstr)
+
+        for block in func.blocks:
+            instrs = [
+                instr
+                for instr in block.instructions
+                if not isinstance(instr, ir.instructions.Comment)
+            ]
+
+            if len(instrs) < 2 or not isinstance(instrs[-1], ir.Ret):
+                continue
+
+            ret, call = instrs[-1], instrs[-2]
+
+            if (
+                not isinstance(call, ir.CallInstr)
+                or not isinstance(call.callee, ir.Function)
+                or any(on_stack(arg) for arg in call.args)
+            ):
+                continue
+
+            if ret.operands and ret.operands[0] is not call:
+                continue
+
+            same_type = call.callee.function_type == func.function_type
+            call.tail = "musttail" if same_type else "tail"
+
     def visit(
         self,
         n: FuncDecl,
@@ -1247,20 +1803,44 @@ class IRGenerator(Visitor):
         Genera el IR para concatenar dos strings, que pueden ser literales (i8*)
         o el resultado de otra operación (BMinorString*).
         """
+        temporary = self.arena and getattr(n, "_arena_temporary", False)
+        mark = None
+
+        if temporary:
+            # las concatenaciones internas también van a la arena
+            for operand in (n.left, n.right):
+                if self._is_concat(operand):
+                    operand._arena_temporary = True
+        else:
+            mark = self._arena_temporary(n.left, builder)
+            mark = self._arena_temporary(n.right, builder, mark)
+
         left = n.left.accept(self, env, builder, alloca, func)
         right = n.right.accept(self, env, builder, alloca, func)
 
         # Obtenemos las funciones del runtime
-        concat_fn = self.string_runtime.concat()
+        if temporary:
+            concat_fn = self.string_runtime.concat_tmp()
+        else:
+            concat_fn = self.string_runtime.concat()
+
         free_fn = self.string_runtime.free()
 
         result = builder.call(concat_fn, [left, right], "concat_result")
 
-        if isinstance(n.left, (BinOper, FuncCall)):
+        # los intermedios en la arena se liberan juntos, el resto uno a uno
+        if isinstance(n.left, FuncCall) or (
+            isinstance(n.left, BinOper) and not self.arena
+        ):
             builder.call(free_fn, [left])
-        if isinstance(n.right, (BinOper, FuncCall)):
+        if isinstance(n.right, FuncCall) or (
+            isinstance(n.right, BinOper) and not self.arena
+        ):
             builder.call(free_fn, [right])
 
+        if mark is not None:
+            builder.call(self.string_runtime.arena_release(), [mark])
+
         return result
 
     def _eval_and(
@@ -1301,6 +1881,9 @@ class IRGenerator(Visitor):
                 self, env, builder, alloca, func
             )  # Generar código para B
 
+            # B puede abrir sus propios bloques (a[i]): el phi viene del último
+            right_block = builder.block
+
             # Finalizar el bloque TRUE: B es el resultado final
             builder.branch(merge_block)
 
@@ -1314,7 +1897,7 @@ class IRGenerator(Visitor):
             phi_node.add_incoming(false_val, false_block)
 
             # Si venimos del bloque VERDADERO (True Block), el resultado es el resultado de la derecha (B)
-            phi_node.add_incoming(right_result, true_block)
+            phi_node.add_incoming(right_result, right_block)
 
             return phi_node
 
@@ -1405,10 +1988,55 @@ class IRGenerator(Visitor):
         free_ref_temps = (
             []
         )  # Para allocas temporales de strings pasados por referencia (i8**)
+        free_values = []  # strings temporales pasados prestados (i8*)
+        arena_mark = None  # strings temporales en la arena
         array_args = []  # (is_var, ptr)
 
+        param_types = fun_name.function_type.args
+
+        # variables string que la función puede asignar por referencia
+        by_reference = {
+            arg.name
+            for arg, param_type in zip(n.args, param_types)
+            if isinstance(arg, VarLoc)
+            and param_type == IrTypes.generic_pointer_t.as_pointer()
+        }
+
+        # variables string prestadas: se leen después de los demás
+        # argumentos, que pueden asignarlas (g(y) por referencia o un
+        # global) y liberar el valor leído antes
+        borrowed_vars = []
+
         for i, arg in enumerate(n.args):
-            if arg.type == SimpleTypes.STRING.value:
+            if arg.type == SimpleTypes.STRING.value and (
+                param_types[i] == IrTypes.generic_pointer_t
+            ):
+                # Parámetro prestado (i8*): la función solo lee el string
+                if isinstance(arg, VarLoc):
+                    borrowed_vars.append((len(args), arg))
+                    args.append(None)
+                    continue
+
+                arena_mark = self._arena_temporary(arg, builder, arena_mark)
+                val = arg.accept(self, env, builder, alloca, func)
+
+                if self._is_concat(arg) and self.arena:
+                    # en la arena, se libera después de la llamada
+                    args.append(val)
+                    continue
+
+                if isinstance(arg, Literal):
+                    # sin copia: no es memoria del heap
+                    args.append(val)
+                    continue
+                elif not isinstance(arg, (BinOper, FuncCall)):
+                    # a[i]: otro argumento puede asignar el elemento
+                    val = builder.call(self.string_runtime.copy(), [val])
+
+                # temporal del llamador, liberarlo después de la llamada
+                args.append(val)
+                free_values.append(val)
+            elif arg.type == SimpleTypes.STRING.value:
                 if isinstance(arg, VarLoc):
                     # Variable (Ej. set_str(var)) -> Pasa su alloca (i8**)
                     # El scope es el encargado de liberar.
@@ -1432,7 +2060,7 @@ class IRGenerator(Visitor):
                         val_to_pass = builder.call(self.string_runtime.copy(), [val])
 
                     # Crear alloca temporal (i8**) en el scope
-                    temp_ptr = alloca.alloca(val_to_pass.type, name="temp_ref_arg")
+                    temp_ptr = self._temp(alloca, val_to_pass.type, "temp_ref_arg")
                     builder.store(val_to_pass, temp_ptr)
 
                     # Pasar la REFERENCIA (i8**)
@@ -1443,20 +2071,40 @@ class IRGenerator(Visitor):
             elif isinstance(arg, VarLoc) and isinstance(arg.type, ArrayType):
                 loc_ptr = env.get(arg.name)
                 args.append(loc_ptr)
-                array_args.append((True, loc_ptr))
+                array_args.append((True, loc_ptr, self._is_retained(n.name, i)))
             elif isinstance(arg.type, ArrayType):
                 # Array literal, ejemplo return de una función, conver i8* a i8**
-                temp = builder.alloca(IrTypes.generic_pointer_t, name=f"temp_array_loc")
+                temp = self._temp(alloca, IrTypes.generic_pointer_t, "temp_array_loc")
                 builder.store(arg.accept(self, env, builder, alloca, func), temp)
                 args.append(temp)
-                array_args.append((False, temp))
+                array_args.append((False, temp, self._is_retained(n.name, i)))
             elif not arg.type == SimpleTypes.STRING.value:
                 # Tipos primitivos (int, float, bool, etc.)
                 args.append(arg.accept(self, env, builder, alloca, func))
 
-        for array in array_args:
-            inc_fn = self.array_runtime.incref()
-            builder.call(inc_fn, [builder.load(array[1], name="array_arg")])
+        for i, arg in borrowed_vars:
+            val = arg.accept(self, env, builder, alloca, func)
+
+            if arg.name in by_reference:
+                # la misma variable también va por referencia y se puede liberar
+                val = builder.call(self.string_runtime.copy(), [val])
+                free_values.append(val)
+
+            # si no, sin copia: el llamador sigue siendo el dueño
+            args[i] = val
+
+        # incref/decref solo si la función puede retener el array,
+        # si no el par se compensa y se omite
+        for is_var, ptr, retained in array_args:
+            if not retained:
+                continue
+
+            array_ptr = builder.load(ptr, name="array_arg")
+
+            if self.retained is None:
+                builder.call(self.array_runtime.incref(), [array_ptr])
+            else:
+                self.array_runtime.inline_incref(builder, array_ptr)
 
         val = builder.call(fun_name, args)
 
@@ -1465,18 +2113,23 @@ class IRGenerator(Visitor):
             str_to_free = builder.load(ptr, name="arg_temp_to_free")
             builder.call(self.string_runtime.free(), [str_to_free])
 
-        for array in array_args:
-            dec_fn = self.array_runtime.decref()
-            builder.call(dec_fn, [builder.load(array[1], name="array_arg")])
+        for str_to_free in free_values:
+            builder.call(self.string_runtime.free(), [str_to_free])
+
+        if arena_mark is not None:
+            builder.call(self.string_runtime.arena_release(), [arena_mark])
 
-            if array[0] is False:
+        for is_var, ptr, retained in array_args:
+            if retained:
+                dec_fn = self.array_runtime.decref()
+                builder.call(dec_fn, [builder.load(ptr, name="array_arg")])
+
+            if is_var is False:
                 # liberar el array temporal creado
                 # Return aumenta y como arg de función aumenta de nuevo
                 # como tal, debe ser decref dos veces
                 free_fn = self.array_runtime.decref()
-                builder.call(
-                    free_fn, [builder.load(array[1], name="array_temp_to_free")]
-                )
+                builder.call(free_fn, [builder.load(ptr, name="array_temp_to_free")])
 
         self.comment(builder, f"End function call: {n.name}")
 
@@ -1504,7 +2157,12 @@ class IRGenerator(Visitor):
         Obtener Puntero de la variable
         """
         var = env.get(n.name)
-        return builder.load(var, name=n.name)
+        value = builder.load(var, name=n.name)
+        value.set_metadata(
+            "tbaa", self.tbaa.tag("array" if isinstance(n.type, ArrayType) else n.type)
+        )
+
+        return value
 
     def visit(
         self,
@@ -1522,14 +2180,32 @@ class IRGenerator(Visitor):
             array_ptr = array_var
         else:
             array_ptr = builder.load(array_var, name=f"{n.array.name}_array_ptr")
+            array_ptr.set_metadata("tbaa", self.tbaa.tag("array"))
 
         index = n.index.accept(self, env, builder, alloca, func)
 
         # Obtener el tipo de retorno LLVM
         return_type = IrTypes.get_type(n.type)
 
+        if not isinstance(n.type, ArrayType):
+            # acceso directo al elemento, el runtime solo para los errores
+            element = self.array_runtime.element_ptr(
+                builder,
+                array_ptr,
+                index,
+                return_type,
+                self.array_runtime.get(),
+                checked=id(n) not in self.unchecked_accesses,
+            )
+            value = builder.load(element, name="array_element")
+            value.align = IrTypes.get_align(n.type)
+            value.set_metadata("tbaa", self.tbaa.element(n.type))
+            self.comment(builder)
+
+            return value
+
         # crear variable local
-        temp_alloca = alloca.alloca(return_type, name="temp_get_val")
+        temp_alloca = self._temp(alloca, return_type, "temp_get_val")
 
         # Castear al puntero genérico (i8*) para el runtime
         destination_ptr = builder.bitcast(
@@ -0,0 +1,86 @@
+"""
+Interfaz de un módulo para compilación separada
+
+Cada archivo .bminor es un módulo. Sus funciones con cuerpo (menos main)
+se exportan; una función declarada sin cuerpo (prototipo) es un extern
+que se resuelve con la interfaz del módulo que la exporta, como en C:
+
+    // lib.bminor
+    square: function integer (x: integer) = { return x * x; }
+
+    // main.bminor
+    square: function integer (x: integer);
+    main: function integer () = { print square(3); return 0; }
+
+La interfaz guarda la firma de cada función y su convención de llamada
+(strings prestados, arrays retenidos), que depende de su cuerpo y el
+llamador no puede calcular.
+"""
+
+import hashlib
+import json
+from parser.model import *
+
+from .array_params import retained_array_params
+from .string_params import borrowed_params
+
+INTERFACE_VERSION = 1
+
+
+def type_name(t) -> str:
+    """Nombre de un tipo para comparar firmas; el tamaño del array no cuenta"""
+    if isinstance(t, ArrayType):
+        return f"array [] {type_name(t.base)}"
+
+    return str(t)
+
+
+def signature(decl: FuncDecl) -> str:
+    params = ", ".join(type_name(p.type) for p in decl.params)
+    return f"function {type_name(decl.return_type)} ({params})"
+
+
+def interface(program: Program, name: str) -> dict:
+    """Funciones exportadas por el módulo, program ya revisado por Check"""
+    borrowed = borrowed_params(program, {})
+    retained = retained_array_params(program, {})
+
+    functions = {
+        decl.name: {
+            "signature": signature(decl),
+            "borrowed": borrowed[decl.name],
+            "retained": retained[decl.name],
+        }
+        for decl in program.body
+        if isinstance(decl, FuncDecl) and decl.body is not None
+        if decl.name != "main"
+    }
+
+    return {"version": INTERFACE_VERSION, "module": name, "functions": functions}
+
+
+def prototypes(program: Program) -> dict:
+    """Funciones declaradas sin cuerpo en el módulo: nombre -> firma"""
+    defined = {
+        decl.name
+        for decl in program.body
+        if isinstance(decl, FuncDecl) and decl.body is not None
+    }
+
+    return {
+        decl.name: signature(decl)
+        for decl in program.body
+        if isinstance(decl, FuncDecl) and decl.body is None
+        if decl.name not in defined
+    }
+
+
+def defines_main(program: Program) -> bool:
+    return any(
+        isinstance(decl, FuncDecl) and decl.name == "main" and decl.body is not None
+        for decl in program.body
+    )
+
+
+def interface_hash(iface: dict) -> str:
+    return hashlib.sha256(json.dumps(iface, sort_keys=True).encode()).hexdigest()
@@ -0,0 +1,164 @@
+"""
+Generación de código en paralelo
+
+Una vez declaradas, las funciones se generan de forma independiente.
+generate_parallel() reparte los cuerpos en grupos y cada proceso del pool
+genera (y opcionalmente optimiza) un módulo LLVM con su grupo:
+
+    - parte principal: globales, sentencias globales, main de entrada y
+      la función main del usuario
+    - resto de partes: declaran todas las funciones y globales, y definen
+      solo las de su grupo
+
+Los módulos vuelven como bitcode y se enlazan con llvmlite.binding.
+
+Lo que depende de todo el programa (inlining, licm, renombrar main,
+strings prestados, arrays retenidos) se calcula una vez antes de crear el pool;
+con fork los procesos heredan el AST sin copiarlo.
+"""
+
+import multiprocessing
+import os
+from parser.model import FuncDecl, Program
+
+import llvmlite.binding as llvm
+
+from semantic import Symtab, hoist_invariants, inline_calls
+from utils import clear_errors, error, errors_detected
+
+from . import ir_gen
+from .array_params import retained_array_params
+from .ir_gen import IRGenerator
+from .string_params import borrowed_params
+
+# programa que heredan los procesos del pool
+_program = None
+
+
+def _init_worker(program):
+    global _program
+    _program = program
+
+
+def optimize_module(module: llvm.ModuleRef, speed_level: int = 2):
+    """Pipeline -O<speed_level> de LLVM sobre el módulo"""
+    llvm.initialize_native_target()
+    llvm.initialize_native_asmprinter()
+
+    target = llvm.Target.from_default_triple()
+    machine = target.create_target_machine()
+    module.triple = target.triple
+
+    tuning = llvm.create_pipeline_tuning_options(speed_level=speed_level)
+    builder = llvm.create_pass_builder(machine, tuning)
+    builder.getModulePassManager().run(module, builder)
+
+
+def _generate_part(part: tuple):
+    """(índice, funciones) -> (índice, bitcode, errores de generación)"""
+    index, functions = part
+    ast, env, options, optimize = _program
+
+    # con fork se heredan los errores del proceso principal
+    clear_errors()
+
+    module = IRGenerator.Generate(
+        ast,
+        env,
+        f"part_{index}",
+        entry=index == 0,
+        functions=set(functions),
+        **options,
+    )
+
+    ref = llvm.parse_assembly(str(module))
+    ref.verify()
+
+    if optimize:
+        optimize_module(ref)
+
+    return index, ref.as_bitcode(), errors_detected()
+
+
+def split_functions(ast: Program, groups: int, main_name: str | None) -> list:
+    """
+    Grupos de funciones a definir, el primero con main. Se reparten por
+    cantidad de sentencias para equilibrar el trabajo de cada proceso.
+    """
+    first = [main_name] if main_name else []
+    bodies = [
+        decl
+        for decl in ast.body
+        if isinstance(decl, FuncDecl) and decl.body and decl.name != main_name
+    ]
+    bodies.sort(key=lambda decl: len(decl.body), reverse=True)
+
+    result = [[] for _ in range(groups)]
+    sizes = [0] * groups
+
+    for decl in bodies:
+        smallest = sizes.index(min(sizes))
+        result[smallest].append(decl.name)
+        sizes[smallest] += len(decl.body) + 1
+
+    return [first] + [group for group in result if group]
+
+
+def generate_parallel(
+    ast: Program,
+    env: Symtab,
+    jobs: int | None = None,
+    optimize: bool = False,
+    **options,
+) -> llvm.ModuleRef:
+    """
+    Genera el programa repartiendo las funciones entre jobs procesos.
+
+    args:
+        ast (Program): AST revisado por Check
+        env (Symtab): tabla de símbolos de Check
+        jobs (int | None): procesos del pool, por defecto uno por CPU
+        optimize (bool): optimizar cada parte (-O2) antes de enlazar
+        options: opciones de IRGenerator.Generate (allocation, optimize_refcounts, inline, licm, instrument, vectorize, stack_arrays)
+
+    return:
+        módulo enlazado; los errores de generación se reportan con utils.error
+    """
+    jobs = jobs or os.cpu_count() or 1
+    options.setdefault("allocation", ir_gen._default_allocation)
+
+    # una sola vez, las partes generan el mismo AST
+    if options.pop("inline", True) and not options.get("instrument"):
+        inline_calls(ast)
+    if options.pop("licm", True):
+        hoist_invariants(ast)
+
+    IRGenerator.rename_main(env)
+    user_main = env.get("main", recursive=False)
+
+    conventions = (borrowed_params(ast), retained_array_params(ast))
+    parts = list(enumerate(split_functions(ast, jobs, user_main and user_main.name)))
+    options.update(conventions=conventions, inline=False, licm=False)
+    program = (ast, env, options, optimize)
+
+    if jobs == 1:
+        _init_worker(program)
+        results = [_generate_part(part) for part in parts]
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+        with context.Pool(min(jobs, len(parts)), _init_worker, (program,)) as pool:
+            results = pool.map(_generate_part, parts, chunksize=1)
+
+    for index, _, count in results:
+        if count:
+            error(f"{count} errores generando la parte {index} del programa")
+
+    results.sort(key=lambda result: result[0])
+    linked = llvm.parse_bitcode(results[0][1])
+
+    for _, bitcode, _ in results[1:]:
+        linked.link_in(llvm.parse_bitcode(bitcode))
+
+    return linked
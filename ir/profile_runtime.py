@@ -0,0 +1,74 @@
+from llvmlite import ir
+
+from .ir_type import IrTypes
+
+_i64 = ir.IntType(64)
+
+# _bminor_prof_fn de runtime.c:
+# nombre, llamadas, inclusivo, exclusivo, profundidad, registrado, siguiente
+PROF_FN = ir.LiteralStructType(
+    [
+        IrTypes.generic_pointer_t,
+        _i64,
+        _i64,
+        _i64,
+        IrTypes.i32,
+        IrTypes.i32,
+        IrTypes.generic_pointer_t,
+    ]
+)
+
+
+class ProfileRuntime:
+    """Contadores de llamadas y tiempo por función (--instrument)"""
+
+    def __init__(self, module):
+        self.module = module
+        self._functions = {}
+
+        f_type = ir.FunctionType(ir.VoidType(), [PROF_FN.as_pointer()])
+
+        for name in ("enter", "exit"):
+            self._functions[name] = ir.Function(
+                module, f_type, name=f"_bminor_prof_{name}"
+            )
+
+    def counter(self, func_name: str, display_name: str) -> ir.GlobalVariable:
+        """_bminor_prof_fn de la función, con display_name para el reporte"""
+        data = bytearray(display_name.encode("utf-8") + b"\00")
+        text_type = ir.ArrayType(IrTypes.i8, len(data))
+
+        text = ir.GlobalVariable(
+            self.module, text_type, name=f"_bminor_prof.name.{func_name}"
+        )
+        text.linkage = "internal"
+        text.global_constant = True
+        text.initializer = ir.Constant(text_type, data)
+
+        counter = ir.GlobalVariable(
+            self.module, PROF_FN, name=f"_bminor_prof.{func_name}"
+        )
+        counter.linkage = "internal"
+        counter.initializer = ir.Constant(
+            PROF_FN,
+            [
+                text.gep([IrTypes.i32(0), IrTypes.i32(0)]),
+                _i64(0),
+                _i64(0),
+                _i64(0),
+                IrTypes.i32(0),
+                IrTypes.i32(0),
+                IrTypes.null_pointer,
+            ],
+        )
+
+        return counter
+
+    def get(self, func_name):
+        return self._functions.get(func_name)
+
+    def enter(self):
+        return self._functions["enter"]
+
+    def exit(self):
+        return self._functions["exit"]
@@ -1,13 +1,119 @@
+import atexit
 import platform
+import re
+import shutil
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
+from utils import timed_phase
+
+RUNTIME_C = Path(__file__).parent / "runtime.c"
+
+# runtime.c se compila una vez por proceso: (sufijo, opciones) -> archivo,
+# o None si clang no pudo generarlo
+_runtime_cache = {}
+_runtime_dir = None
+
+# enlazar el bitcode del runtime con el del programa antes de optimizar
+_runtime_lto = True
+
+# --rt-stats: "report" imprime las estadísticas de memoria del runtime,
+# "check" además falla si quedan objetos vivos al terminar (tests)
+_runtime_stats = None
+
+
+class RuntimeLeakError(AssertionError):
+    """El programa terminó con memoria del runtime sin liberar"""
+
+
+def set_runtime_stats(mode: str | None):
+    """Compilar runtime.c con -DBMINOR_RT_STATS: None, "report" o "check" """
+    global _runtime_stats
+
+    if mode not in (None, "report", "check"):
+        raise ValueError(f"Modo desconocido '{mode}', use 'report' o 'check'")
+
+    _runtime_stats = mode
+
+
+def set_runtime_lto(enabled: bool):
+    """
+    Con LTO el runtime se enlaza como bitcode al programa (llvm-link) y
+    clang optimiza todo junto, así los accesos a arrays y strings se
+    pueden inlinear en los bucles. Sin LTO, o si el bitcode no se puede
+    generar o enlazar, se enlaza runtime.o por separado.
+    """
+    global _runtime_lto
+
+    _runtime_lto = enabled
+
 
 def run_cmd(cmd, **kwargs):
     return subprocess.run(cmd, capture_output=True, text=True, check=True, **kwargs)
 
 
+def _runtime_flags() -> list:
+    return ["-DBMINOR_RT_STATS"] if _runtime_stats else []
+
+
+def _compile_runtime(suffix: str, flags: list, optional=False) -> Path | None:
+    """
+    runtime.c compilado con flags, solo la primera vez que se pide.
+    Si optional, un error de clang devuelve None en vez de propagarse.
+    """
+    global _runtime_dir
+
+    flags = [*flags, *_runtime_flags()]
+    key = (suffix, *flags)
+
+    if key not in _runtime_cache:
+        if _runtime_dir is None:
+            _runtime_dir = Path(tempfile.mkdtemp(prefix="bminor_runtime_"))
+            atexit.register(shutil.rmtree, _runtime_dir, ignore_errors=True)
+
+        path = _runtime_dir / f"runtime{len(_runtime_cache)}{suffix}"
+
+        try:
+            run_cmd(["clang", *flags, "-c", str(RUNTIME_C), "-o", str(path)])
+        except (OSError, subprocess.CalledProcessError):
+            if not optional:
+                raise
+
+            path = None
+
+        _runtime_cache[key] = path
+
+    return _runtime_cache[key]
+
+
+def _runtime_object() -> Path:
+    return _compile_runtime(".obj" if platform.system() == "Windows" else ".o", [])
+
+
+def _runtime_bitcode() -> Path | None:
+    """runtime.c en bitcode, None si clang no lo puede generar"""
+    # con -O0 clang marca todo optnone/noinline y no se podría inlinear
+    return _compile_runtime(".bc", ["-O2", "-emit-llvm"], optional=True)
+
+
+def _program_stderr(stderr: str):
+    """Reportes del runtime en stderr (--instrument, --rt-stats)"""
+    if _runtime_stats == "check":
+        # en modo check solo se oculta el reporte de memoria, que va al final
+        header = re.search(r"^site\s+allocs", stderr, re.MULTILINE)
+        stats = stderr[header.start() :] if header else ""
+        sys.stderr.write(stderr[: header.start()] if header else stderr)
+
+        match = re.search(r"live at exit: (\d+) objects", stats)
+
+        if match and int(match.group(1)) > 0:
+            raise RuntimeLeakError(f"Memoria sin liberar al terminar:\n{stats}")
+    else:
+        sys.stderr.write(stderr)
+
+
 def run_llvm_ir(ir_code: str) -> str:
     with tempfile.TemporaryDirectory() as tmpdir:
         tmpdir = Path(tmpdir)
@@ -19,13 +125,14 @@ def run_llvm_ir(ir_code: str) -> str:
         return result.stdout
 
 
-def run_llvm_clang_ir(ir_code: str, add_runtime=False) -> str:
+def run_llvm_clang_ir(ir_code: str, add_runtime=False, report=None) -> str:
     """
     Compila y ejecuta código LLVM IR usando clang.
 
     Args:
     ir_code: str, código LLVM IR a compilar y ejecutar
     add_runtime: bool, agregar runtime en c de bminor como prints
+    report: utils.PhaseReport, medir cada paso (--time-report)
 
     Return:
     str, la salida del programa
@@ -35,26 +142,100 @@ def run_llvm_clang_ir(ir_code: str, add_runtime=False) -> str:
         ir_path = tmpdir / "temp.ll"
         bc_path = tmpdir / "temp.bc"
         exe_path = tmpdir / "temp_exe"
-        runtime_c = "ir" / Path("runtime.c")
 
         ir_path.write_text(ir_code)
+        runtime_bc = runtime_obj = None
 
         if add_runtime:
-            if platform.system() == "Windows":
-                runtime_obj = tmpdir / "runtime.obj"
-                run_cmd(["clang", "-c", str(runtime_c), "-o", str(runtime_obj)])
-            else:
-                runtime_obj = tmpdir / "runtime.o"
-                run_cmd(["clang", "-c", str(runtime_c), "-o", str(runtime_obj)])
-
-        run_cmd(["llvm-as", str(ir_path), "-o", str(bc_path)])
+            with timed_phase(report, "clang runtime"):
+                if _runtime_lto:
+                    runtime_bc = _runtime_bitcode()
+                if runtime_bc is None:
+                    runtime_obj = _runtime_object()
+
+        with timed_phase(report, "llvm-as"):
+            run_cmd(["llvm-as", str(ir_path), "-o", str(bc_path)])
+
+        if runtime_bc is not None:
+            linked_path = tmpdir / "linked.bc"
+
+            try:
+                with timed_phase(report, "llvm-link"):
+                    run_cmd(
+                        [
+                            "llvm-link",
+                            str(bc_path),
+                            str(runtime_bc),
+                            "-o",
+                            str(linked_path),
+                        ]
+                    )
+
+                bc_path = linked_path
+            except subprocess.CalledProcessError:
+                # bitcode de otra versión de LLVM: runtime.o por separado
+                runtime_bc = None
+                runtime_obj = _runtime_object()
+
         cmd = ["clang", str(bc_path), "-fuse-ld=lld", "-o", str(exe_path)]
 
-        if add_runtime:
+        if runtime_bc is not None:
+            cmd.insert(1, "-O2")  # optimizar programa y runtime juntos
+        elif runtime_obj is not None:
             cmd.append(str(runtime_obj))
 
-        run_cmd(cmd)
-        result = run_cmd([str(exe_path)])
+        with timed_phase(report, "clang"):
+            run_cmd(cmd)
+        with timed_phase(report, "ejecución"):
+            result = run_cmd([str(exe_path)])
+
+        _program_stderr(result.stderr)
+
+        return result.stdout
+
+    return ""
+
+
+def run_llvm_module(module, add_runtime=False, report=None) -> str:
+    """
+    Compila a objeto un módulo de llvmlite.binding (ir/parallel.py) y lo
+    ejecuta enlazado con clang. Usa el LLVM de llvmlite, así no depende de
+    que llvm-as entienda su IR.
+
+    Args:
+    module: llvmlite.binding.ModuleRef
+    add_runtime: bool, agregar runtime en c de bminor como prints
+    report: utils.PhaseReport, medir cada paso (--time-report)
+
+    Return:
+    str, la salida del programa
+    """
+    import llvmlite.binding as llvm
+
+    llvm.initialize_native_target()
+    llvm.initialize_native_asmprinter()
+    machine = llvm.Target.from_default_triple().create_target_machine(reloc="pic")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        obj_path = tmpdir / "temp.o"
+        exe_path = tmpdir / "temp_exe"
+
+        with timed_phase(report, "emit object"):
+            obj_path.write_bytes(machine.emit_object(module))
+
+        cmd = ["clang", str(obj_path), "-fuse-ld=lld", "-o", str(exe_path)]
+
+        if add_runtime:
+            with timed_phase(report, "clang runtime"):
+                cmd.append(str(_runtime_object()))
+
+        with timed_phase(report, "clang"):
+            run_cmd(cmd)
+        with timed_phase(report, "ejecución"):
+            result = run_cmd([str(exe_path)])
+
+        _program_stderr(result.stderr)
 
         return result.stdout
 
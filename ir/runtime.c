@@ -4,6 +4,8 @@
 #include <stdbool.h>
 #include <string.h>
 #include <math.h>
+#include <stddef.h>
+#include <time.h>
 
 // Errores comunes
 typedef enum {
@@ -15,9 +17,12 @@ typedef enum {
     ARRAY_NULL_ERROR
 } _bminor_error_type;
 
-void _bminor_runtime_error(const char* msg, _bminor_error_type code) {
-    fprintf(stderr, "Runtime Error: %s\n", msg);
-    exit(code);
+// ================= Salida =================
+
+#ifdef BMINOR_PRINTF
+// Un printf por valor (bench/print_throughput.py)
+static void _bminor_flush(void) {
+    fflush(stdout);
 }
 
 void _bminor_print_int(int32_t value) {
@@ -43,6 +48,226 @@ void _bminor_print_bool(int8_t value) {
         printf("false");
     }
 }
+#else
+// Los prints escriben en un buffer propio que se vuelca con fwrite cuando
+// se llena, al terminar el programa y antes de un error de ejecución
+#define BMINOR_OUT_SIZE (1 << 16)
+
+static char _bminor_out[BMINOR_OUT_SIZE];
+static size_t _bminor_out_used = 0;
+
+static void _bminor_flush(void) {
+    if (_bminor_out_used > 0) {
+        fwrite(_bminor_out, 1, _bminor_out_used, stdout);
+        _bminor_out_used = 0;
+    }
+
+    fflush(stdout);
+}
+
+__attribute__((constructor)) static void _bminor_out_init(void) {
+    atexit(_bminor_flush);
+}
+
+static void _bminor_write(const char* data, size_t size) {
+    if (size > BMINOR_OUT_SIZE - _bminor_out_used) {
+        _bminor_flush();
+
+        // no cabe en el buffer vacío: directo a stdout
+        if (size > BMINOR_OUT_SIZE) {
+            fwrite(data, 1, size, stdout);
+            return;
+        }
+    }
+
+    memcpy(_bminor_out + _bminor_out_used, data, size);
+    _bminor_out_used += size;
+}
+
+// Dígitos de value al final de end, devuelve el inicio
+static char* _bminor_format_uint(uint64_t value, char* end) {
+    do {
+        *--end = (char)('0' + value % 10);
+        value /= 10;
+    } while (value);
+
+    return end;
+}
+
+void _bminor_print_int(int32_t value) {
+    char buffer[16];
+    char* end = buffer + sizeof(buffer);
+    int64_t wide = value;
+    char* start = _bminor_format_uint(wide < 0 ? -wide : wide, end);
+
+    if (wide < 0) {
+        *--start = '-';
+    }
+
+    _bminor_write(start, end - start);
+}
+
+void _bminor_print_float(float value) {
+    double d = value;
+
+    // Igual que printf("%f"): para |d| < 1e9, d * 1e6 es exacto en double
+    // y rint redondea al par como printf. El resto (grandes, inf, nan) se
+    // deja a snprintf (el mayor float ocupa 46 caracteres).
+    if (!(fabs(d) < 1e9)) {
+        char buffer[64];
+        int size = snprintf(buffer, sizeof(buffer), "%f", d);
+
+        _bminor_write(buffer, size);
+        return;
+    }
+
+    uint64_t scaled = (uint64_t)rint(fabs(d) * 1e6);
+    char buffer[32];
+    char* end = buffer + sizeof(buffer);
+    char* start = end;
+
+    for (int i = 0; i < 6; i++) {
+        *--start = (char)('0' + scaled % 10);
+        scaled /= 10;
+    }
+
+    *--start = '.';
+    start = _bminor_format_uint(scaled, start);
+
+    if (signbit(d)) {
+        *--start = '-';
+    }
+
+    _bminor_write(start, end - start);
+}
+
+void _bminor_print_char(char value) {
+    if (_bminor_out_used == BMINOR_OUT_SIZE) {
+        _bminor_flush();
+    }
+
+    _bminor_out[_bminor_out_used++] = value;
+}
+
+void _bminor_print_string(const char* value) {
+    _bminor_write(value, strlen(value));
+}
+
+void _bminor_print_bool(int8_t value) {
+    if (value) {
+        _bminor_write("true", 4);
+    } else {
+        _bminor_write("false", 5);
+    }
+}
+#endif
+
+void _bminor_runtime_error(const char* msg, _bminor_error_type code) {
+    _bminor_flush();
+    fprintf(stderr, "Runtime Error: %s\n", msg);
+    exit(code);
+}
+
+// ================= Memoria =================
+// Las reservas del runtime pasan por BMINOR_MALLOC/CALLOC/FREE. Con
+// -DBMINOR_RT_STATS (--rt-stats) cada bloque lleva un encabezado con su
+// sitio de reserva y su tamaño, enlazado en una lista de objetos vivos:
+// al terminar se imprimen en stderr reservas, liberaciones y bytes por
+// sitio, el pico de bytes vivos y los objetos que siguen vivos.
+
+typedef enum {
+    SITE_STRING_CONCAT = 0,
+    SITE_STRING_COPY,
+    SITE_ARRAY_NEW,
+    SITE_ARRAY_DATA,
+    SITE_ARENA_CHUNK,
+    SITE_COUNT
+} _bminor_alloc_site;
+
+#ifdef BMINOR_RT_STATS
+static const char* _bminor_site_names[SITE_COUNT] = {
+    "string_concat", "string_copy", "array_new", "array_data", "arena_chunk"
+};
+
+typedef struct _bminor_block {
+    struct _bminor_block* prev;
+    struct _bminor_block* next;
+    size_t size;
+    _bminor_alloc_site site;
+    // los datos van después, alineados como los de malloc
+    _Alignas(16) char data[];
+} _bminor_block;
+
+static struct {
+    uint64_t allocs;
+    uint64_t frees;
+    uint64_t bytes;
+} _bminor_sites[SITE_COUNT];
+
+static _bminor_block* _bminor_live = NULL;
+static size_t _bminor_live_bytes = 0;
+static size_t _bminor_peak_bytes = 0;
+
+static void* _bminor_stats_alloc(size_t size, _bminor_alloc_site site, bool zero) {
+    _bminor_block* block = zero ? calloc(1, sizeof(_bminor_block) + size)
+                                : malloc(sizeof(_bminor_block) + size);
+
+    if (!block) {
+        return NULL;
+    }
+
+    block->size = size;
+    block->site = site;
+    block->prev = NULL;
+    block->next = _bminor_live;
+
+    if (_bminor_live) {
+        _bminor_live->prev = block;
+    }
+
+    _bminor_live = block;
+    _bminor_sites[site].allocs++;
+    _bminor_sites[site].bytes += size;
+    _bminor_live_bytes += size;
+
+    if (_bminor_live_bytes > _bminor_peak_bytes) {
+        _bminor_peak_bytes = _bminor_live_bytes;
+    }
+
+    return block->data;
+}
+
+static void _bminor_stats_free(void* ptr) {
+    if (!ptr) {
+        return;
+    }
+
+    _bminor_block* block = (_bminor_block*)((char*)ptr - offsetof(_bminor_block, data));
+
+    if (block->prev) {
+        block->prev->next = block->next;
+    } else {
+        _bminor_live = block->next;
+    }
+
+    if (block->next) {
+        block->next->prev = block->prev;
+    }
+
+    _bminor_sites[block->site].frees++;
+    _bminor_live_bytes -= block->size;
+    free(block);
+}
+
+#define BMINOR_MALLOC(size, site) _bminor_stats_alloc((size), (site), false)
+#define BMINOR_CALLOC(count, size, site) \
+    _bminor_stats_alloc((size_t)(count) * (size_t)(size), (site), true)
+#define BMINOR_FREE(ptr) _bminor_stats_free(ptr)
+#else
+#define BMINOR_MALLOC(size, site) malloc(size)
+#define BMINOR_CALLOC(count, size, site) calloc((count), (size))
+#define BMINOR_FREE(ptr) free(ptr)
+#endif
 
 // ================= Math =================
 
@@ -50,6 +275,86 @@ int32_t _bminor_pow_int(int32_t base, int32_t exponent) {
     return pow(base, exponent);
 }
 
+// ================= Arena =================
+// Memoria para strings temporales (--arena): se reserva avanzando un
+// puntero y se libera en bloque volviendo a una marca.
+
+#define ARENA_CHUNK_SIZE (64 * 1024)
+
+typedef struct _bminor_arena_chunk {
+    struct _bminor_arena_chunk* prev;
+    size_t size;
+    size_t used;
+    char data[];
+} _bminor_arena_chunk;
+
+static _bminor_arena_chunk* _bminor_arena_top = NULL;
+// último chunk liberado, se reutiliza para no llamar a malloc en cada bucle
+static _bminor_arena_chunk* _bminor_arena_spare = NULL;
+
+void* _bminor_arena_alloc(size_t size) {
+    _bminor_arena_chunk* top = _bminor_arena_top;
+
+    if (!top || top->size - top->used < size) {
+        size_t chunk_size = size > ARENA_CHUNK_SIZE ? size : ARENA_CHUNK_SIZE;
+        _bminor_arena_chunk* chunk = _bminor_arena_spare;
+
+        if (chunk && chunk->size >= chunk_size) {
+            _bminor_arena_spare = NULL;
+        } else {
+            chunk = (_bminor_arena_chunk*)BMINOR_MALLOC(
+                sizeof(_bminor_arena_chunk) + chunk_size, SITE_ARENA_CHUNK
+            );
+
+            if (!chunk) {
+                _bminor_runtime_error("Failed to allocate memory.", ALLOCATION_ERROR);
+                return NULL;
+            }
+
+            chunk->size = chunk_size;
+        }
+
+        chunk->prev = top;
+        chunk->used = 0;
+        _bminor_arena_top = top = chunk;
+    }
+
+    void* result = top->data + top->used;
+    top->used += size;
+    return result;
+}
+
+// Posición actual de la arena
+char* _bminor_arena_mark(void) {
+    _bminor_arena_chunk* top = _bminor_arena_top;
+    return top ? top->data + top->used : NULL;
+}
+
+// Libera todo lo reservado después de la marca
+void _bminor_arena_release(char* mark) {
+    _bminor_arena_chunk* top = _bminor_arena_top;
+
+    while (top && !(mark >= top->data && mark <= top->data + top->used)) {
+        _bminor_arena_chunk* prev = top->prev;
+
+        if (!_bminor_arena_spare || _bminor_arena_spare->size < top->size) {
+            BMINOR_FREE(_bminor_arena_spare);
+            _bminor_arena_spare = top;
+        } else {
+            BMINOR_FREE(top);
+        }
+
+        top = prev;
+    }
+
+    _bminor_arena_top = top;
+
+    if (top) {
+        top->used = mark - top->data;
+    }
+}
+
+
 // ================= Strings =================
 
 // Concatena dos strings simples y devuelve un nuevo puntero al Heap
@@ -60,7 +365,7 @@ char* _bminor_string_concat(char* s1, char* s2) {
     size_t len1 = strlen(s1);
     size_t len2 = strlen(s2);
 
-    char* result = (char*)malloc(len1 + len2 + 1);
+    char* result = (char*)BMINOR_MALLOC(len1 + len2 + 1, SITE_STRING_CONCAT);
 
     if (!result) {
         _bminor_runtime_error("Failed to allocate memory.", ALLOCATION_ERROR);
@@ -73,21 +378,63 @@ char* _bminor_string_concat(char* s1, char* s2) {
     return result;
 }
 
+// Igual que _bminor_string_concat pero en la arena: no se libera con free
+char* _bminor_string_concat_tmp(char* s1, char* s2) {
+    if (!s1) s1 = "";
+    if (!s2) s2 = "";
+
+    size_t len1 = strlen(s1);
+    size_t len2 = strlen(s2);
+
+    char* result = (char*)_bminor_arena_alloc(len1 + len2 + 1);
+
+    memcpy(result, s1, len1);
+    memcpy(result + len1, s2, len2 + 1);
+
+    return result;
+}
+
 char* _bminor_string_copy(char* s) {
-    if (s == NULL) return strdup("");
+    if (s == NULL) s = "";
 
-    return strdup(s);
+    size_t size = strlen(s) + 1;
+    char* result = (char*)BMINOR_MALLOC(size, SITE_STRING_COPY);
+
+    if (!result) {
+        _bminor_runtime_error("Failed to allocate memory.", ALLOCATION_ERROR);
+        return NULL;
+    }
+
+    return memcpy(result, s, size);
 }
 
 void _bminor_string_free(char* s) {
     if (!s) return;
 
-    free(s);
+    BMINOR_FREE(s);
     s = NULL;
 }
 
 // ================= Arrays =================
 
+#ifdef BMINOR_COUNT_CALLS
+// Contadores de llamadas de conteo de referencias (bench/refcount_calls.py)
+static long _bminor_incref_calls = 0;
+static long _bminor_decref_calls = 0;
+
+static void _bminor_report_calls(void) {
+    fprintf(stderr, "incref=%ld decref=%ld\n", _bminor_incref_calls, _bminor_decref_calls);
+}
+
+__attribute__((constructor)) static void _bminor_count_calls_init(void) {
+    atexit(_bminor_report_calls);
+}
+
+#define COUNT_CALL(counter) ((counter)++)
+#else
+#define COUNT_CALL(counter)
+#endif
+
 typedef struct _bminor_array {
     void* data;
     int32_t data_size;
@@ -109,18 +456,18 @@ _bminor_array* _bminor_array_new(int32_t size, int32_t list_size, int32_t type,
         return NULL;
     }
 
-    _bminor_array* array = (_bminor_array*)malloc(sizeof(_bminor_array));
+    _bminor_array* array = (_bminor_array*)BMINOR_MALLOC(sizeof(_bminor_array), SITE_ARRAY_NEW);
 
     if (!array) {
         _bminor_runtime_error("Failed to allocate memory.", ALLOCATION_ERROR);
         return NULL;
     };
 
-    array->data = calloc(size, type);
+    array->data = BMINOR_CALLOC(size, type, SITE_ARRAY_DATA);
 
     if (!array->data) {
         _bminor_runtime_error("Failed to allocate memory.", ALLOCATION_ERROR);
-        free(array);
+        BMINOR_FREE(array);
         return NULL;
     }
 
@@ -138,12 +485,12 @@ void _bminor_array_free(_bminor_array* array) {
         for (int32_t i = 0; i < array->size; i++) {
             _bminor_string_free(((char**)array->data)[i]);
         }
-    } else {
-        free(array->data);
-        array->data = NULL;
     }
 
-    free(array);
+    BMINOR_FREE(array->data);
+    array->data = NULL;
+
+    BMINOR_FREE(array);
     array = NULL;
 }
 
@@ -173,7 +520,7 @@ void _bminor_array_set(_bminor_array* array, int32_t index, void* value_ptr) {
         char** old_string_loc = (char**)destination_ptr;
 
         if (*old_string_loc != NULL) {
-            free(*old_string_loc);
+            _bminor_string_free(*old_string_loc);
         }
 
         // Duplicar la nueva cadena y almacenar el puntero
@@ -208,6 +555,8 @@ void _bminor_array_get(_bminor_array* array, int32_t index, void* destination_pt
 }
 
 void _bminor_array_incref(_bminor_array* array) {
+    COUNT_CALL(_bminor_incref_calls);
+
     if (array)
     {
         array->reference_count += 1;
@@ -215,7 +564,187 @@ void _bminor_array_incref(_bminor_array* array) {
 }
 
 void _bminor_array_decref(_bminor_array* array) {
+    COUNT_CALL(_bminor_decref_calls);
+
     if (array && (--array->reference_count == 0)) {
         _bminor_array_free(array);
     }
-}
\ No newline at end of file
+}
+// ================= Profiler =================
+// Contadores de --ir --instrument: el IR llama a _bminor_prof_enter al
+// entrar a cada función y a _bminor_prof_exit antes de cada ret, con un
+// _bminor_prof_fn global por función. Al terminar el programa se imprime
+// en stderr llamadas, tiempo inclusivo (una sola vez por recursión) y
+// exclusivo (sin las funciones llamadas) de cada función.
+
+#ifdef _WIN32
+#define BMINOR_NOW(ts) timespec_get(&(ts), TIME_UTC)
+#else
+#define BMINOR_NOW(ts) clock_gettime(CLOCK_MONOTONIC, &(ts))
+#endif
+
+typedef struct _bminor_prof_fn {
+    const char* name;
+    uint64_t calls;
+    uint64_t inclusive;
+    uint64_t exclusive;
+    int32_t depth;
+    int32_t registered;
+    struct _bminor_prof_fn* next;
+} _bminor_prof_fn;
+
+typedef struct {
+    _bminor_prof_fn* fn;
+    uint64_t start;
+    uint64_t children;
+} _bminor_prof_frame;
+
+static _bminor_prof_fn* _bminor_prof_functions = NULL;
+static _bminor_prof_frame* _bminor_prof_stack = NULL;
+static size_t _bminor_prof_depth = 0;
+static size_t _bminor_prof_capacity = 0;
+
+static uint64_t _bminor_prof_now(void) {
+    struct timespec ts;
+    BMINOR_NOW(ts);
+    return (uint64_t)ts.tv_sec * 1000000000u + (uint64_t)ts.tv_nsec;
+}
+
+static int _bminor_prof_compare(const void* a, const void* b) {
+    const _bminor_prof_fn* x = *(_bminor_prof_fn* const*)a;
+    const _bminor_prof_fn* y = *(_bminor_prof_fn* const*)b;
+
+    return (x->exclusive < y->exclusive) - (x->exclusive > y->exclusive);
+}
+
+static void _bminor_prof_report(void) {
+    size_t count = 0;
+
+    for (_bminor_prof_fn* fn = _bminor_prof_functions; fn; fn = fn->next) {
+        count++;
+    }
+
+    _bminor_prof_fn** sorted = malloc(count * sizeof(*sorted));
+
+    if (!sorted) {
+        return;
+    }
+
+    count = 0;
+
+    for (_bminor_prof_fn* fn = _bminor_prof_functions; fn; fn = fn->next) {
+        sorted[count++] = fn;
+    }
+
+    // de mayor a menor tiempo exclusivo
+    qsort(sorted, count, sizeof(*sorted), _bminor_prof_compare);
+
+    fprintf(stderr, "%-24s %12s %16s %16s\n", "function", "calls", "inclusive_ms", "exclusive_ms");
+
+    for (size_t i = 0; i < count; i++) {
+        fprintf(
+            stderr, "%-24s %12llu %16.3f %16.3f\n", sorted[i]->name,
+            (unsigned long long)sorted[i]->calls, sorted[i]->inclusive / 1e6,
+            sorted[i]->exclusive / 1e6
+        );
+    }
+
+    free(sorted);
+    free(_bminor_prof_stack);
+}
+
+void _bminor_prof_enter(_bminor_prof_fn* fn) {
+    if (!fn->registered) {
+        if (!_bminor_prof_functions) {
+            atexit(_bminor_prof_report);
+        }
+
+        fn->registered = 1;
+        fn->next = _bminor_prof_functions;
+        _bminor_prof_functions = fn;
+    }
+
+    if (_bminor_prof_depth == _bminor_prof_capacity) {
+        size_t capacity = _bminor_prof_capacity ? _bminor_prof_capacity * 2 : 256;
+        _bminor_prof_frame* stack = realloc(_bminor_prof_stack, capacity * sizeof(*stack));
+
+        if (!stack) {
+            _bminor_runtime_error("Out of memory in profiler", ALLOCATION_ERROR);
+        }
+
+        _bminor_prof_stack = stack;
+        _bminor_prof_capacity = capacity;
+    }
+
+    _bminor_prof_frame* frame = &_bminor_prof_stack[_bminor_prof_depth++];
+    frame->fn = fn;
+    frame->children = 0;
+    fn->calls++;
+    fn->depth++;
+    frame->start = _bminor_prof_now();
+}
+
+void _bminor_prof_exit(_bminor_prof_fn* fn) {
+    uint64_t now = _bminor_prof_now();
+    _bminor_prof_frame* frame = &_bminor_prof_stack[--_bminor_prof_depth];
+    uint64_t elapsed = now - frame->start;
+
+    fn->exclusive += elapsed - frame->children;
+
+    if (--fn->depth == 0) {
+        fn->inclusive += elapsed;
+    }
+
+    if (_bminor_prof_depth > 0) {
+        _bminor_prof_stack[_bminor_prof_depth - 1].children += elapsed;
+    }
+}
+
+// ================= Estadísticas de memoria =================
+
+#ifdef BMINOR_RT_STATS
+static void _bminor_stats_report(void) {
+    // la caché de la arena no es una fuga
+    BMINOR_FREE(_bminor_arena_spare);
+    _bminor_arena_spare = NULL;
+
+    fprintf(stderr, "%-16s %12s %12s %14s\n", "site", "allocs", "frees", "bytes");
+
+    for (int site = 0; site < SITE_COUNT; site++) {
+        fprintf(
+            stderr, "%-16s %12llu %12llu %14llu\n", _bminor_site_names[site],
+            (unsigned long long)_bminor_sites[site].allocs,
+            (unsigned long long)_bminor_sites[site].frees,
+            (unsigned long long)_bminor_sites[site].bytes
+        );
+    }
+
+    size_t count = 0;
+
+    for (_bminor_block* block = _bminor_live; block; block = block->next) {
+        count++;
+    }
+
+    fprintf(stderr, "peak live bytes: %zu\n", _bminor_peak_bytes);
+    fprintf(stderr, "live at exit: %zu objects, %zu bytes\n", count, _bminor_live_bytes);
+
+    size_t shown = 0;
+
+    for (_bminor_block* block = _bminor_live; block && shown < 20; block = block->next) {
+        shown++;
+
+        if (block->site == SITE_STRING_CONCAT || block->site == SITE_STRING_COPY) {
+            fprintf(
+                stderr, "  %s %zu bytes \"%.40s\"\n", _bminor_site_names[block->site],
+                block->size, block->data
+            );
+        } else {
+            fprintf(stderr, "  %s %zu bytes\n", _bminor_site_names[block->site], block->size);
+        }
+    }
+}
+
+__attribute__((constructor)) static void _bminor_stats_init(void) {
+    atexit(_bminor_stats_report);
+}
+#endif
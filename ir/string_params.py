@@ -0,0 +1,133 @@
+"""
+Convención de llamada para parámetros string
+
+Un parámetro string se pasa por referencia (i8**) para que la función
+pueda asignarlo y el llamador vea el cambio. Si la función solo lo lee
+basta con el puntero (i8*): no hace falta copiar un literal al heap ni
+crear un alloca temporal en el llamador.
+
+Un parámetro es "prestado" (i8*) salvo que la función:
+
+    - lo asigne (s = ...)
+    - lo pase a un parámetro por referencia de otra función
+    - asigne un string global, directamente o en una función que llame:
+      el argumento podría ser ese global y su valor se liberaría
+
+Las funciones sin cuerpo usan la referencia en todos sus parámetros,
+salvo las de otros módulos (externs), que usan la convención de su
+interfaz. Como no se sabe qué hacen, se supone que asignan globales.
+"""
+
+from parser.model import *
+
+
+def _walk(node):
+    """Todos los nodos bajo node, sin entrar a atributos privados"""
+    stack = [node]
+
+    while stack:
+        n = stack.pop()
+
+        if isinstance(n, list):
+            stack.extend(n)
+        elif isinstance(n, Node):
+            yield n
+
+            for key, value in vars(n).items():
+                if not key.startswith("_") and isinstance(value, (Node, list)):
+                    stack.append(value)
+
+
+def borrowed_params(program: Program, externs: dict | None = None) -> dict:
+    """
+    Para cada función, una lista con True en los parámetros string que
+    se pasan prestados (i8*) y False en el resto.
+
+    externs: interfaz de las funciones de otros módulos, None si el
+    programa está completo
+    """
+    string = SimpleTypes.STRING.value
+    funcs = {}
+
+    for decl in program.body:
+        if isinstance(decl, FuncDecl):
+            if decl.body is not None or decl.name not in funcs:
+                funcs[decl.name] = decl
+
+    owned = {}  # función -> parámetros string por referencia
+    writes_global = {}  # función -> asigna un string global
+    calls = {}  # función -> [(función llamada, índice, nombre del argumento)]
+
+    for name, decl in funcs.items():
+        params = {p.name for p in decl.params if p.type == string}
+
+        if decl.body is None:
+            owned[name], calls[name] = params, []
+            writes_global[name] = externs is not None
+            continue
+
+        nodes = list(_walk(decl.body))
+        local_names = {p.name for p in decl.params} | {
+            n.name for n in nodes if isinstance(n, (VarDecl, ArrayDecl))
+        }
+        assigned = {
+            n.location.name
+            for n in nodes
+            if isinstance(n, Assignment) and isinstance(n.location, VarLoc)
+        }
+
+        owned[name] = params & assigned
+        writes_global[name] = any(
+            isinstance(n, Assignment)
+            and isinstance(n.location, VarLoc)
+            and n.location.type == string
+            and n.location.name not in local_names
+            for n in nodes
+        )
+        calls[name] = [
+            (n.name, i, arg.name if isinstance(arg, VarLoc) else None)
+            for n in nodes
+            if isinstance(n, FuncCall)
+            for i, arg in enumerate(n.args)
+        ]
+
+    changed = True
+
+    while changed:
+        changed = False
+
+        for name, decl in funcs.items():
+            callees = {callee for callee, _, _ in calls[name]}
+
+            if not writes_global[name] and any(
+                writes_global.get(c, False) for c in callees
+            ):
+                writes_global[name] = changed = True
+
+            params = {p.name for p in decl.params if p.type == string}
+            mutated = set(owned[name])
+
+            if writes_global[name]:
+                mutated |= params
+
+            for callee, i, arg in calls[name]:
+                target = funcs.get(callee)
+
+                if arg in params and target and i < len(target.params):
+                    if target.params[i].name in owned[callee]:
+                        mutated.add(arg)
+
+            if mutated != owned[name]:
+                owned[name] = mutated
+                changed = True
+
+    result = {
+        name: [p.type == string and p.name not in owned[name] for p in decl.params]
+        for name, decl in funcs.items()
+    }
+
+    for name, info in (externs or {}).items():
+        if name in funcs and funcs[name].body is None:
+            result[name] = list(info["borrowed"])
+
+    return result
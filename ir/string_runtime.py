@@ -12,6 +12,7 @@ class StringRuntime:
         self._declare_string_concat()
         self._declare_string_copy()
         self._declare_string_free()
+        self._declare_arena()
 
     def _declare_string_concat(self):
         # func(i8*, i8*) -> i8*
@@ -47,6 +48,32 @@ class StringRuntime:
             self.module, f_type, name="_bminor_string_free"
         )
 
+    def _declare_arena(self):
+        # strings temporales en la arena (--arena)
+        # func(i8*, i8*) -> i8*
+        f_type = ir.FunctionType(
+            IrTypes.generic_pointer_t,
+            [
+                IrTypes.generic_pointer_t,
+                IrTypes.generic_pointer_t,
+            ],
+        )
+        self._functions["_bminor_string_concat_tmp"] = ir.Function(
+            self.module, f_type, name="_bminor_string_concat_tmp"
+        )
+
+        # func() -> i8*
+        f_type = ir.FunctionType(IrTypes.generic_pointer_t, [])
+        self._functions["_bminor_arena_mark"] = ir.Function(
+            self.module, f_type, name="_bminor_arena_mark"
+        )
+
+        # func(i8*) -> void
+        f_type = ir.FunctionType(ir.VoidType(), [IrTypes.generic_pointer_t])
+        self._functions["_bminor_arena_release"] = ir.Function(
+            self.module, f_type, name="_bminor_arena_release"
+        )
+
     # --- Métodos de acceso para el generador de código ---
 
     def concat(self):
@@ -60,3 +87,15 @@ class StringRuntime:
     def free(self):
         """Devuelve la función LLVM para liberar la memoria de un BMinorString."""
         return self._functions["_bminor_string_free"]
+
+    def concat_tmp(self):
+        """Concatenación en la arena, el resultado se libera con arena_release."""
+        return self._functions["_bminor_string_concat_tmp"]
+
+    def arena_mark(self):
+        """Devuelve la posición actual de la arena."""
+        return self._functions["_bminor_arena_mark"]
+
+    def arena_release(self):
+        """Libera en bloque lo reservado en la arena después de una marca."""
+        return self._functions["_bminor_arena_release"]
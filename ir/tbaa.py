@@ -0,0 +1,43 @@
+"""
+Metadatos TBAA de los accesos a memoria
+
+B-minor no permite ver la memoria de una variable o de un elemento de
+array como otro tipo, y los elementos de los arrays (memoria del
+runtime) nunca son la celda de una variable. Cada acceso se marca con
+su tipo, "integer" para una variable y "integer[]" para un elemento, y
+LLVM sabe que escribir a[i] no cambia i, el fin de un bucle ni la
+variable a: puede sacar esas cargas del bucle y vectorizarlo.
+
+Los accesos sin marca pueden ser cualquier tipo, así que basta con
+marcar los que importan en los bucles. El runtime en C (también con
+LTO) usa el árbol de clang, con otra raíz: LLVM no supone nada entre
+los dos.
+"""
+
+from llvmlite import ir
+
+
+class TBAA:
+    def __init__(self, module: ir.Module):
+        self.module = module
+        self._tags = {}
+        self._root = None
+
+    def tag(self, name) -> ir.MDValue:
+        """Etiqueta de acceso al tipo name ("integer", "integer[]", "array", ...)"""
+        name = str(name)
+        tag = self._tags.get(name)
+
+        if tag is None:
+            if self._root is None:
+                self._root = self.module.add_metadata(["bminor tbaa"])
+
+            offset = ir.Constant(ir.IntType(64), 0)
+            scalar = self.module.add_metadata([name, self._root, offset])
+            tag = self._tags[name] = self.module.add_metadata([scalar, scalar, offset])
+
+        return tag
+
+    def element(self, name) -> ir.MDValue:
+        """Etiqueta de un elemento de array de tipo name"""
+        return self.tag(f"{name}[]")
@@ -0,0 +1,47 @@
+"""
+Temporales en el stack de una función
+
+Los valores que el runtime recibe por puntero (elemento de un array,
+string o array pasado por referencia) necesitan un alloca temporal. Si
+el alloca se emite donde está el builder, dentro de un bucle el stack
+crece en cada iteración; por eso todos se crean en el bloque alloca de
+la función y se reutilizan.
+
+Un temporal solo vive dentro de la sentencia que lo pidió: al terminar
+cada sentencia se liberan y la siguiente puede reutilizar los del mismo
+tipo. Dentro de una sentencia cada pedido recibe un slot distinto, así
+f(g(), h()) no comparte temporales.
+"""
+
+from llvmlite import ir
+
+
+class TempSlots:
+    def __init__(self, alloca: ir.IRBuilder):
+        """
+        alloca: builder del bloque alloca de la función
+        """
+        self.alloca = alloca
+        self.free = {}  # tipo -> [slots libres]
+        self.used = []  # slots de la sentencia actual
+        self.count = 0
+
+    def get(self, llvm_type: ir.Type, name: str = "temp") -> ir.AllocaInstr:
+        """Slot para un valor de tipo llvm_type, reutilizado si hay uno libre"""
+        slots = self.free.get(llvm_type)
+
+        if slots:
+            slot = slots.pop()
+        else:
+            slot = self.alloca.alloca(llvm_type, name=name)
+            self.count += 1
+
+        self.used.append(slot)
+        return slot
+
+    def release(self):
+        """Fin de sentencia: los slots usados quedan libres para la siguiente"""
+        for slot in self.used:
+            self.free.setdefault(slot.allocated_type, []).append(slot)
+
+        self.used.clear()
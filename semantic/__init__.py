@@ -1,4 +1,6 @@
 from .checker import Check
+from .inline import inline_calls
+from .licm import hoist_invariants
 from .semantic_error import SemanticError
 from .symtab import Symtab
 from .typesys import *
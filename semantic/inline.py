@@ -0,0 +1,244 @@
+"""
+Inlining de funciones pequeñas en el AST
+
+Después de Check, inline_calls() reemplaza las llamadas a funciones
+pequeñas por una copia de su expresión de retorno, con los argumentos en
+lugar de los parámetros:
+
+    square: function integer (x: integer) = { return x * x; }
+
+    print square(n);    ->    print n * n;
+
+El intérprete se ahorra el Symtab y el try/finally de la llamada y el IR
+la instrucción call. Solo se hace cuando el resultado es el mismo:
+
+    - el cuerpo es un solo return de una expresión de a lo sumo
+      INLINE_SIZE nodos, sin asignaciones, ++/-- ni llamadas (salvo
+      array_length), así que no es recursiva ni tiene efectos. Tampoco
+      índices de arrays ni divisiones: sus errores de ejecución se
+      reportan distinto dentro de una función
+    - retorna un escalar y sus parámetros son escalares o arrays. Un
+      string retornado tiene dueño (copia y free en el IR) y un array
+      retornado cambia su conteo de referencias; esas funciones se
+      siguen llamando. Los arrays del cuerpo solo se pasan a
+      array_length, así que no hace falta el incref/decref de la llamada
+    - cada argumento es un literal o una variable, o una expresión sin
+      efectos para un parámetro que se usa una sola vez: se evalúa las
+      mismas veces y en el mismo orden respecto al resto del cuerpo
+    - las globales que lee el cuerpo no están ocultas por una variable
+      local de la función que llama
+"""
+
+import copy
+from parser.model import *
+
+from .purity import BUILTINS
+
+# tamaño máximo (en nodos) de la expresión de una función para copiarla
+INLINE_SIZE = 16
+
+_SCALARS = ("integer", "float", "boolean", "char")
+
+
+def _children(n: Node):
+    for key, value in vars(n).items():
+        if key.startswith("_") or key == "type":
+            continue
+
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, list):
+            yield from (item for item in value if isinstance(item, Node))
+
+
+def _nodes(n: Node):
+    stack = [n]
+
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(_children(node))
+
+
+def _is_pure(expr: Node) -> bool:
+    """Expresión sin asignaciones, ++/-- ni llamadas con efectos"""
+    return all(
+        not isinstance(node, (Assignment, Increment, Decrement, Statement))
+        and (not isinstance(node, FuncCall) or node.name in BUILTINS)
+        for node in _nodes(expr)
+    )
+
+
+def _cannot_fail(expr: Node) -> bool:
+    """
+    Sin índices ni divisiones: un error de ejecución dentro de una función
+    se reporta como error de la llamada, fuera de ella no
+    """
+    return not any(
+        isinstance(node, ArrayLoc)
+        or (isinstance(node, BinOper) and node.oper in ("/", "%"))
+        for node in _nodes(expr)
+    )
+
+
+def _is_scalar(t) -> bool:
+    return isinstance(t, SimpleType) and t.name in _SCALARS
+
+
+def _candidate(decl: FuncDecl) -> bool:
+    if not decl.body or len(decl.body) != 1:
+        return False
+
+    ret = decl.body[0]
+
+    if not isinstance(ret, ReturnStmt) or ret.expr is None:
+        return False
+
+    return (
+        _is_scalar(decl.return_type)
+        and all(
+            _is_scalar(p.type) or isinstance(p.type, ArrayType) for p in decl.params
+        )
+        and _is_pure(ret.expr)
+        and _cannot_fail(ret.expr)
+        and sum(1 for _ in _nodes(ret.expr)) <= INLINE_SIZE
+    )
+
+
+def _uses(expr: Node) -> dict:
+    """Nombre de variable -> veces que se lee en expr"""
+    uses = {}
+
+    for node in _nodes(expr):
+        if isinstance(node, VarLoc):
+            uses[node.name] = uses.get(node.name, 0) + 1
+
+    return uses
+
+
+def _substitute(expr: Node, args: dict, lineno: int) -> Node:
+    """Copia de expr con los parámetros reemplazados por copias de args"""
+    if isinstance(expr, VarLoc) and expr.name in args:
+        return _substitute(args[expr.name], {}, lineno)
+
+    result = copy.copy(expr)
+    result.lineno = lineno
+
+    for key, value in vars(expr).items():
+        if key.startswith("_") or key == "type":
+            continue
+
+        if isinstance(value, Node):
+            setattr(result, key, _substitute(value, args, lineno))
+        elif isinstance(value, list):
+            setattr(
+                result,
+                key,
+                [
+                    _substitute(item, args, lineno) if isinstance(item, Node) else item
+                    for item in value
+                ],
+            )
+
+    return result
+
+
+class _Inliner:
+    def __init__(self, program: Program):
+        funcs = {}
+
+        for decl in program.body:
+            if isinstance(decl, FuncDecl):
+                if decl.body is not None or decl.name not in funcs:
+                    funcs[decl.name] = decl
+
+        self.candidates = {
+            name: decl for name, decl in funcs.items() if _candidate(decl)
+        }
+        self.inlined = []
+
+    def _locals(self, decl: FuncDecl) -> set:
+        names = {p.name for p in decl.params}
+
+        for node in _nodes(BlockStmt(decl.body)):
+            if isinstance(node, (VarDecl, ArrayDecl)):
+                names.add(node.name)
+
+        return names
+
+    def _inline(self, call: FuncCall, caller: FuncDecl | None, local_names: set):
+        decl = self.candidates.get(call.name)
+
+        if decl is None or decl is caller:
+            return None
+
+        expr = decl.body[0].expr
+        params = [p.name for p in decl.params]
+        uses = _uses(expr)
+
+        # globales del cuerpo ocultas por una local del llamador
+        if (set(uses) - set(params)) & local_names:
+            return None
+
+        for param, arg in zip(decl.params, call.args):
+            trivial = isinstance(arg, (Literal, VarLoc))
+
+            if isinstance(param.type, ArrayType) and not isinstance(arg, VarLoc):
+                return None
+            elif not trivial and (uses.get(param.name, 0) != 1 or not _is_pure(arg)):
+                return None
+
+        self.inlined.append((call.lineno, caller.name if caller else None, decl.name))
+
+        return _substitute(expr, dict(zip(params, call.args)), call.lineno)
+
+    def rewrite(self, n, caller: FuncDecl | None, local_names: set):
+        """Reescribe los hijos de n (de abajo hacia arriba) y devuelve n o su reemplazo"""
+        if isinstance(n, FuncDecl) and n.body:
+            caller, local_names = n, self._locals(n)
+
+        for key, value in vars(n).items():
+            if key.startswith("_") or key == "type":
+                continue
+
+            if isinstance(value, Node):
+                setattr(n, key, self.rewrite(value, caller, local_names))
+            elif isinstance(value, list):
+                value[:] = [
+                    (
+                        self.rewrite(item, caller, local_names)
+                        if isinstance(item, Node)
+                        else item
+                    )
+                    for item in value
+                ]
+
+        if isinstance(n, FuncCall):
+            return self._inline(n, caller, local_names) or n
+
+        return n
+
+
+def inline_calls(program: Program) -> list:
+    """
+    Reemplaza en program (ya revisado por Check) las llamadas a funciones
+    pequeñas por su cuerpo. Las funciones se mantienen para el resto de
+    llamadas y para otros módulos.
+
+    return:
+        llamadas reemplazadas: [(línea, función que llama o None, función)]
+    """
+    inliner = _Inliner(program)
+
+    if inliner.candidates:
+        # en el scope global solo ocultan las declaradas dentro de bloques
+        nested = {
+            node.name
+            for stmt in program.body
+            if not isinstance(stmt, (FuncDecl, VarDecl, ArrayDecl))
+            for node in _nodes(stmt)
+            if isinstance(node, (VarDecl, ArrayDecl))
+        }
+        inliner.rewrite(program, None, nested)
+
+    return inliner.inlined
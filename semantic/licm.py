@@ -0,0 +1,210 @@
+"""
+Mover fuera de los bucles las expresiones invariantes
+
+hoist_invariants() busca en la condición, el update y el cuerpo de cada
+for/while las expresiones que dan el mismo valor en todas las vueltas y
+las calcula una sola vez en una variable declarada antes del bucle:
+
+    for (i = 0; i < array_length(a); i++) { ... }
+
+    ->  _licm_0: integer = array_length(a);
+        for (i = 0; i < _licm_0; i++) { ... }
+
+Así el intérprete no pasa por BuiltinFunction.__call__ y el IR no llama
+a array_length en cada vuelta, en los dos casos sin cambiar nada más.
+
+Una expresión se mueve si es escalar y:
+
+    - solo tiene literales, variables, operadores (salvo / y %) y
+      llamadas a funciones safe (ver semantic/purity.py): evaluarla
+      antes del bucle, aunque este no dé ninguna vuelta, no puede fallar
+      ni dejar de terminar
+    - ninguna de sus variables se asigna o declara en el bucle (ni en el
+      init del for, que va después de la declaración). Si el bucle llama
+      a funciones con efectos solo valen las variables locales: esas
+      funciones pueden cambiar cualquier global
+    - ninguna función que llama lee una global que el bucle cambia
+
+Se toma la expresión invariante más grande que tenga una llamada o una
+variable; un literal o una variable sola no se mueven.
+"""
+
+from parser.model import *
+
+from .purity import Effects, assigned_names, function_effects, local_names, walk
+
+_SCALARS = ("integer", "float", "boolean", "char")
+_LOOPS = (ForStmt, WhileStmt)
+
+
+class _Hoister:
+    def __init__(self, program: Program):
+        self.effects = function_effects(program)
+        self.used = {
+            n.name
+            for n in walk(program)
+            if isinstance(n, (VarDecl, ArrayDecl, FuncDecl, Param))
+        }
+        self.counter = 0
+        self.hoisted = []
+
+    def _new_name(self) -> str:
+        while f"_licm_{self.counter}" in self.used:
+            self.counter += 1
+
+        name = f"_licm_{self.counter}"
+        self.used.add(name)
+
+        return name
+
+    def _invariant(self, expr: Node, loop) -> bool:
+        """expr se puede calcular antes del bucle (ver docstring del módulo)"""
+        if not isinstance(expr, Expression) or isinstance(expr, Location):
+            return False
+
+        if not isinstance(expr.type, SimpleType) or expr.type.name not in _SCALARS:
+            return False
+
+        worth = False
+
+        for n in walk(expr):
+            if getattr(n, "type", None) == SimpleTypes.STRING.value:
+                return False  # strings con dueño en el IR
+            elif isinstance(n, Literal):
+                continue
+            elif isinstance(n, VarLoc):
+                if n.name in loop.written or (
+                    loop.calls_writer and n.name not in self.locals
+                ):
+                    return False
+                worth = True
+            elif isinstance(n, BinOper):
+                if n.oper in ("/", "%"):
+                    return False
+            elif isinstance(n, UnaryOper):
+                continue
+            elif isinstance(n, FuncCall):
+                info = self.effects.get(n.name)
+
+                if info is None or not info.safe:
+                    return False
+                if info.reads & loop.written or (info.reads and loop.calls_writer):
+                    return False
+                worth = True
+            else:
+                return False
+
+        return worth
+
+    def _replace(self, node, loop, decls: list):
+        """Reemplaza en los hijos de node las expresiones invariantes"""
+        for key, value in vars(node).items():
+            if key.startswith("_") or key == "type":
+                continue
+
+            if isinstance(value, Node):
+                setattr(node, key, self._rewrite(value, loop, decls))
+            elif isinstance(value, list):
+                value[:] = [
+                    self._rewrite(item, loop, decls) if isinstance(item, Node) else item
+                    for item in value
+                ]
+
+    def _rewrite(self, expr: Node, loop, decls: list) -> Node:
+        if isinstance(expr, Location) and not isinstance(expr, ArrayLoc):
+            return expr
+
+        if self._invariant(expr, loop):
+            name = self._new_name()
+            lineno = getattr(loop.node, "lineno", None)
+
+            decl = VarDecl(name, expr.type, expr)
+            decl.lineno = lineno
+            decls.append(decl)
+
+            var = VarLoc(name)
+            var.type = expr.type
+            var.lineno = lineno
+
+            self.hoisted.append((lineno, name))
+            return var
+
+        # en x = ... o x++ la variable asignada no es una expresión
+        if isinstance(expr, ArrayLoc):
+            expr.index = self._rewrite(expr.index, loop, decls)
+            return expr
+
+        self._replace(expr, loop, decls)
+        return expr
+
+    def _hoist(self, stmt: Statement) -> list:
+        """Declaraciones a poner antes del bucle stmt"""
+        loop = _Loop(stmt, self.effects)
+        decls = []
+
+        for key in ("condition", "update", "body"):
+            value = getattr(stmt, key, None)
+
+            if isinstance(value, Node):
+                setattr(stmt, key, self._rewrite(value, loop, decls))
+            elif isinstance(value, list):
+                value[:] = [self._rewrite(item, loop, decls) for item in value]
+
+        return decls
+
+    def visit(self, node):
+        """Procesa primero los bucles internos y después los de node"""
+        if isinstance(node, FuncDecl) and node.body:
+            outer, self.locals = self.locals, local_names(node)
+
+        for key, value in vars(node).items():
+            if key.startswith("_") or key == "type":
+                continue
+
+            if isinstance(value, Node):
+                self.visit(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, Node):
+                        self.visit(item)
+
+                if any(isinstance(item, _LOOPS) for item in value):
+                    result = []
+
+                    for item in value:
+                        if isinstance(item, _LOOPS):
+                            result.extend(self._hoist(item))
+
+                        result.append(item)
+
+                    value[:] = result
+
+        if isinstance(node, FuncDecl) and node.body:
+            self.locals = outer
+
+
+class _Loop:
+    """Lo que cambia dentro de un bucle"""
+
+    def __init__(self, node, effects: dict):
+        self.node = node
+        self.written = assigned_names(node)
+        self.calls_writer = any(
+            isinstance(n, FuncCall) and effects.get(n.name, Effects(writes=True)).writes
+            for n in walk(node)
+        )
+
+
+def hoist_invariants(program: Program) -> list:
+    """
+    Mueve antes de cada for/while de program (ya revisado por Check) las
+    expresiones invariantes de su condición, update y cuerpo.
+
+    return:
+        variables creadas: [(línea del bucle, nombre)]
+    """
+    hoister = _Hoister(program)
+    hoister.locals = set()
+    hoister.visit(program)
+
+    return hoister.hoisted
@@ -0,0 +1,158 @@
+"""
+Efectos de las funciones de un programa
+
+function_effects() resume cada función (ya revisada por Check) para las
+optimizaciones del AST (semantic/licm.py):
+
+    writes  imprime, asigna una global o un elemento de un array, o llama
+            a una función que lo hace (o sin cuerpo: de otro módulo)
+    reads   globales que lee, directamente o en las funciones que llama
+    safe    sin efectos, siempre termina y no falla: sin bucles,
+            recursión, índices de arrays ni divisiones, y solo llama a
+            funciones safe. Evaluarla una vez de más o de menos no cambia
+            el programa
+
+Los builtins del runtime tienen su efecto anotado en BUILTINS.
+"""
+
+from dataclasses import dataclass, field
+from parser.model import *
+
+
+@dataclass
+class Effects:
+    writes: bool = False
+    reads: set = field(default_factory=set)
+    safe: bool = False
+
+
+# array_length solo lee el tamaño del array, que no cambia
+BUILTINS = {"array_length": Effects(writes=False, reads=set(), safe=True)}
+
+_LOOPS = (ForStmt, WhileStmt, DoWhileStmt)
+
+
+def walk(node):
+    """Todos los nodos bajo node, sin entrar a los tipos ni atributos privados"""
+    stack = [node]
+
+    while stack:
+        n = stack.pop()
+
+        if isinstance(n, list):
+            stack.extend(n)
+        elif isinstance(n, Node):
+            yield n
+
+            for key, value in vars(n).items():
+                if not key.startswith("_") and key != "type":
+                    if isinstance(value, (Node, list)):
+                        stack.append(value)
+
+
+def local_names(decl: FuncDecl) -> set:
+    """Parámetros y variables declaradas en la función"""
+    names = {p.name for p in decl.params}
+
+    for n in walk(decl.body or []):
+        if isinstance(n, (VarDecl, ArrayDecl)):
+            names.add(n.name)
+
+    return names
+
+
+def assigned_names(node) -> set:
+    """Variables asignadas (=, ++, --) o declaradas bajo node"""
+    names = set()
+
+    for n in walk(node):
+        if isinstance(n, (Assignment, Increment, Decrement)):
+            if isinstance(n.location, VarLoc):
+                names.add(n.location.name)
+        elif isinstance(n, (VarDecl, ArrayDecl)):
+            names.add(n.name)
+
+    return names
+
+
+def function_effects(program: Program) -> dict:
+    """Nombre de función -> Effects, incluye BUILTINS"""
+    funcs = {}
+
+    for decl in program.body:
+        if isinstance(decl, FuncDecl):
+            if decl.body is not None or decl.name not in funcs:
+                funcs[decl.name] = decl
+
+    effects = dict(BUILTINS)
+    calls = {}
+    local_safe = {}
+
+    for name, decl in funcs.items():
+        if decl.body is None:
+            effects[name] = Effects(writes=True)
+            calls[name], local_safe[name] = set(), False
+            continue
+
+        locals_ = local_names(decl)
+        nodes = list(walk(decl.body))
+        writes = False
+
+        for n in nodes:
+            if isinstance(n, PrintStmt):
+                writes = True
+            elif isinstance(n, (Assignment, Increment, Decrement)):
+                location = n.location
+                writes |= not (
+                    isinstance(location, VarLoc) and location.name in locals_
+                )
+
+        effects[name] = Effects(
+            writes=writes,
+            reads={
+                n.name for n in nodes if isinstance(n, VarLoc) and n.name not in locals_
+            },
+        )
+        calls[name] = {n.name for n in nodes if isinstance(n, FuncCall)}
+        local_safe[name] = not writes and not any(
+            isinstance(n, _LOOPS + (ArrayLoc,))
+            or (isinstance(n, BinOper) and n.oper in ("/", "%"))
+            for n in nodes
+        )
+
+    # writes y reads crecen hasta el punto fijo
+    changed = True
+
+    while changed:
+        changed = False
+
+        for name in funcs:
+            info = effects[name]
+
+            for callee in calls[name]:
+                other = effects.get(callee, Effects(writes=True))
+
+                if other.writes and not info.writes:
+                    info.writes = changed = True
+                if not other.reads <= info.reads:
+                    info.reads |= other.reads
+                    changed = True
+
+    # safe empieza en False: una recursión nunca llega a ser safe
+    changed = True
+
+    while changed:
+        changed = False
+
+        for name in funcs:
+            info = effects[name]
+
+            if info.safe or not local_safe[name] or info.writes:
+                continue
+
+            if all(
+                callee in effects and effects[callee].safe for callee in calls[name]
+            ):
+                info.safe = changed = True
+
+    return effects
@@ -41,16 +41,20 @@ class Symtab:
 
         pass
 
-    def __init__(self, name, parent=None):
+    def __init__(self, name, parent=None, register=True):
         """
         Crea una tabla de símbolos vacia con la tabla de
         simbolos padre dada.
+
+        Si register es False la tabla no se agrega a los hijos del
+        padre, así una tabla temporal (por ejemplo un scope del
+        intérprete) se libera apenas deja de referenciarse.
         """
         self.name = name
         self.entries = {}
         self.parent = parent
 
-        if self.parent:
+        if self.parent and register:
             self.parent.children.append(self)
 
         self.children = []
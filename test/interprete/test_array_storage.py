@@ -0,0 +1,110 @@
+import array
+import unittest
+from parser import Parser
+from parser.model import *
+
+from interprete import Context, Interpreter
+from interprete.arrays import BoolArray, new_array
+from scanner import Lexer
+from utils import clear_errors, errors_detected
+
+
+class TestArrayStorage(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def run_code(self, code, backend="tree"):
+        parser = Parser()
+        tokens = Lexer().tokenize(code)
+        ast = parser.parse(tokens)
+
+        interpreter = Interpreter(
+            Context(code), get_output=True, out=lambda s: None, backend=backend
+        )
+        interpreter.interpret(ast)
+
+        self.assertFalse(errors_detected(), f"Errores con backend {backend}")
+        return interpreter
+
+    # =========================================================================
+    # 1. ALMACENAMIENTO POR TIPO
+    # =========================================================================
+
+    def test_storage_by_type(self):
+        code = """
+        a: array [3] integer;
+        b: array [3] float;
+        c: array [3] char;
+        d: array [3] boolean;
+        e: array [3] string;
+        f: array [2] float = {1.5, 2.5};
+        """
+        env = self.run_code(code).env
+
+        self.assertEqual(env.get("a"), [0, 0, 0])
+        self.assertEqual(env.get("b"), [0, 0, 0])
+        self.assertEqual(env.get("f").typecode, "d")
+        self.assertIsInstance(env.get("c"), array.array)
+        self.assertIsInstance(env.get("d"), BoolArray)
+        self.assertEqual(env.get("e"), ["", "", ""])
+
+    def test_defaults(self):
+        self.assertEqual(list(new_array(SimpleTypes.INTEGER.value, None, 2)), [0, 0])
+        self.assertIs(new_array(SimpleTypes.FLOAT.value, None, 1)[0], 0)
+        self.assertEqual(new_array(SimpleTypes.CHAR.value, None, 1)[0], "\0")
+        self.assertIs(new_array(SimpleTypes.BOOLEAN.value, None, 1)[0], False)
+        self.assertEqual(len(new_array(SimpleTypes.INTEGER.value, None, -1)), 0)
+
+    # =========================================================================
+    # 2. MISMA SEMÁNTICA EN TODOS LOS BACKENDS
+    # =========================================================================
+
+    def test_semantics(self):
+        code = """
+        flip: function void (f: array [] boolean, c: array [] char) = {
+            f[0] = !f[0];
+            c[1] = 'z';
+        }
+
+        f: array [2] boolean;
+        c: array [2] char = {'a', 'b'};
+        x: array [2] float = {1.5, 2.5};
+        n: array [3] integer = {1, 2, 3};
+
+        flip(f, c);
+        n[2] = n[0] + n[1] * 10;
+        print f[0], f[1], c[0], c[1], x[1], n[2], array_length(f) + array_length(x);
+        """
+        for backend in ("tree", "closure", "pyjit"):
+            clear_errors()
+            output = self.run_code(code, backend).output
+            self.assertEqual(output, "truefalseaz2.5214", f"backend {backend}")
+
+    def test_float_defaults(self):
+        """Un float sin asignar se imprime igual en un array que en una variable."""
+        code = """
+        x: float;
+        a: array [3] float;
+        b: array [2] float = {1.5, 2.0};
+        print x, " ", a[0], " ", b[1];
+        """
+        for backend in ("tree", "closure", "pyjit"):
+            clear_errors()
+            output = self.run_code(code, backend).output
+            self.assertEqual(output, "0 0 2.0", f"backend {backend}")
+
+    def test_big_integers(self):
+        """Los integer de más de 64 bits caben en un array."""
+        code = """
+        a: array [2] integer = {1, 2};
+        a[0] = 99999999999 * 99999999999;
+        print a[0];
+        """
+        for backend in ("tree", "closure", "pyjit"):
+            clear_errors()
+            output = self.run_code(code, backend).output
+            self.assertEqual(output, "9999999999800000000001", f"backend {backend}")
+
+
+if __name__ == "__main__":
+    unittest.main()
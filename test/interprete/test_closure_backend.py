@@ -0,0 +1,156 @@
+import unittest
+from parser import Parser
+from parser.model import *
+
+from interprete import Context, Interpreter
+from scanner import Lexer
+from utils import clear_errors, errors_detected
+
+
+class TestClosureBackend(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def get_output(self, code, backend):
+        parser = Parser()
+        tokens = Lexer().tokenize(code)
+        ast = parser.parse(tokens)
+
+        interpreter = Interpreter(
+            Context(code), get_output=True, out=lambda s: None, backend=backend
+        )
+        interpreter.interpret(ast)
+
+        return interpreter.output
+
+    def assertSameOutput(self, code, expected):
+        """Ambos backends deben producir la salida esperada."""
+        for backend in ("tree", "closure"):
+            clear_errors()
+            output = self.get_output(code, backend)
+
+            self.assertFalse(errors_detected(), f"Errores con backend {backend}")
+            self.assertEqual(output, expected, f"backend {backend}")
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            Interpreter(Context(""), backend="vm")
+
+    def test_recursion(self):
+        code = """
+        fib: function integer (n: integer) = {
+            if (n < 2) {
+                return n;
+            }
+            return fib(n - 1) + fib(n - 2);
+        }
+
+        print fib(15);
+        """
+        self.assertSameOutput(code, "610")
+
+    def test_return_inside_loops(self):
+        code = """
+        find: function integer (a: array [] integer, x: integer) = {
+            i: integer;
+            for (i = 0; i < array_length(a); i++) {
+                while (true) {
+                    if (a[i] == x) {
+                        return i;
+                    }
+                    break;
+                }
+            }
+            return -1;
+        }
+
+        a: array [4] integer = {5, 7, 9, 11};
+        print find(a, 9), find(a, 4);
+        """
+        self.assertSameOutput(code, "2-1")
+
+    def test_break_continue(self):
+        code = """
+        i: integer;
+        for (i = 0; i < 10; i++) {
+            if (i % 2 == 0) { continue; }
+            if (i > 7) { break; }
+            print i;
+        }
+
+        i = 0;
+        do {
+            i++;
+            if (i == 2) { continue; }
+            print i;
+        } while (i < 4);
+        """
+        self.assertSameOutput(code, "1357134")
+
+    def test_shadowing(self):
+        """El update del for usa la variable exterior aunque el cuerpo la redeclare."""
+        code = """
+        i: integer;
+        x: integer = 100;
+
+        for (i = 0; i < 3; i++) {
+            x: integer = i * 10;
+            print x, " ";
+        }
+
+        {
+            x: integer = -1;
+            print x, " ";
+        }
+
+        print x;
+        """
+        self.assertSameOutput(code, "0 10 20 -1 100")
+
+    def test_globals_and_arrays_by_reference(self):
+        code = """
+        total: integer = 0;
+
+        fill: function void (a: array [] integer, v: integer) = {
+            i: integer;
+            for (i = 0; i < array_length(a); i++) {
+                a[i] = v + i;
+                total = total + a[i];
+            }
+        }
+
+        arr: array [3] integer;
+        fill(arr, 10);
+        print arr[0], arr[2], " ", total;
+        """
+        self.assertSameOutput(code, "1012 33")
+
+    def test_default_return(self):
+        code = """
+        nothing: function integer () = {
+            x: integer = 1;
+        }
+
+        flag: function boolean () = { }
+
+        print nothing(), flag();
+        """
+        self.assertSameOutput(code, "0false")
+
+    def test_runtime_error_in_call(self):
+        code = """
+        get: function integer (a: array [] integer, i: integer) = {
+            return a[i];
+        }
+
+        arr: array [2] integer = {1, 2};
+        print get(arr, 5);
+        """
+        for backend in ("tree", "closure"):
+            clear_errors()
+            self.get_output(code, backend)
+            self.assertTrue(errors_detected(), f"backend {backend}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import io
+import unittest
+from parser import Parser
+from parser.model import *
+
+from interprete import Context, Interpreter
+from scanner import Lexer
+from utils import clear_errors, errors_detected
+
+
+class TestOutputSink(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def run_code(self, code, **kwargs):
+        """Ejecuta el código y devuelve el intérprete usado."""
+        parser = Parser()
+        tokens = Lexer().tokenize(code)
+        ast = parser.parse(tokens)
+
+        interpreter = Interpreter(Context(code), **kwargs)
+        interpreter.interpret(ast)
+
+        self.assertFalse(errors_detected(), f"Errores en el intérprete:\n{code}")
+        return interpreter
+
+    # =========================================================================
+    # 1. DESTINOS DE SALIDA
+    # =========================================================================
+
+    def test_string_io_sink(self):
+        out = io.StringIO()
+        self.run_code("print 1, \" \", true, 'c';", out=out)
+        self.assertEqual(out.getvalue(), "1 truec")
+
+    def test_callback_sink(self):
+        chunks = []
+        self.run_code("print 1, 2, 3;", out=chunks.append)
+        self.assertEqual(chunks, ["1", "2", "3"])
+
+    def test_capture_and_sink(self):
+        """get_output sigue funcionando junto a un destino propio."""
+        out = io.StringIO()
+        interpreter = self.run_code('print "hola";', get_output=True, out=out)
+
+        self.assertEqual(interpreter.output, "hola")
+        self.assertEqual(out.getvalue(), "hola")
+
+    def test_no_capture(self):
+        interpreter = self.run_code("print 1;", out=io.StringIO())
+        self.assertEqual(interpreter.output, "")
+
+    def test_invalid_sink(self):
+        with self.assertRaises(TypeError):
+            Interpreter(Context(""), out=42)
+
+    # =========================================================================
+    # 2. SCOPES LIBERADOS AL SALIR
+    # =========================================================================
+
+    def test_scopes_not_retained(self):
+        """
+        Los scopes de bloques, if, bucles y llamadas no deben quedar
+        colgados del entorno global después de ejecutarse.
+        """
+        code = """
+        square: function integer (x: integer) = {
+            return x * x;
+        }
+
+        i: integer;
+        total: integer = 0;
+
+        for (i = 0; i < 50; i++) {
+            if (i % 2 == 0) {
+                total = total + square(i);
+            } else {
+                { y: integer = i; total = total - y; }
+            }
+        }
+
+        while (i > 0) {
+            i--;
+        }
+
+        print total;
+        """
+        interpreter = self.run_code(code, get_output=True, out=io.StringIO())
+
+        self.assertEqual(interpreter.output, "18975")
+        self.assertEqual(interpreter.env.children, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
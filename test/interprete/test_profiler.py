@@ -0,0 +1,159 @@
+import unittest
+from parser import Parser
+
+from interprete import Context, Interpreter, Profiler
+from scanner import Lexer
+from utils import clear_errors, errors_detected
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def profile(self, code, **kwargs):
+        ast = Parser().parse(Lexer().tokenize(code))
+        profiler = Profiler()
+        interpreter = Interpreter(
+            Context(code),
+            get_output=True,
+            out=lambda s: None,
+            backend="closure",
+            profiler=profiler,
+            **kwargs,
+        )
+        interpreter.interpret(ast)
+
+        self.assertFalse(errors_detected())
+        return profiler, interpreter.output
+
+    def test_function_and_line_counts(self):
+        """Cuenta llamadas por función y ejecuciones por línea."""
+        code = """square: function integer (x: integer) = {
+    y: integer = x * x;
+    return y;
+}
+
+i: integer;
+total: integer = 0;
+
+for (i = 0; i < 10; i++) {
+    total = total + square(i);
+}
+
+print total;
+"""
+        profiler, output = self.profile(code)
+
+        self.assertEqual(output, "285")
+        self.assertEqual(profiler.functions["square"].calls, 10)
+        self.assertEqual(profiler.lines[2].calls, 10)
+        self.assertEqual(profiler.lines[3].calls, 10)
+        # el for, su init y las 10 veces del update
+        self.assertEqual(profiler.lines[9].calls, 12)
+        self.assertEqual(profiler.lines[10].calls, 10)
+        self.assertEqual(profiler.lines[13].calls, 1)
+        self.assertEqual(profiler.line_function[2], "square")
+        self.assertEqual(profiler.line_function[10], "<global>")
+
+        # el bucle incluye el tiempo de las llamadas a square
+        self.assertGreaterEqual(
+            profiler.lines[9].total, profiler.functions["square"].total
+        )
+
+    def test_small_function_not_inlined(self):
+        """Una función pequeña llamada en un bucle aparece en el perfil."""
+        code = """double: function integer (x: integer) = { return x * 2; }
+
+i: integer;
+total: integer = 0;
+
+for (i = 0; i < 10; i++) {
+    total = total + double(i);
+}
+
+print total;
+"""
+        profiler, output = self.profile(code)
+
+        self.assertEqual(output, "90")
+        self.assertEqual(profiler.functions["double"].calls, 10)
+        self.assertEqual(profiler.lines[1].calls, 10)
+
+    def test_recursion(self):
+        """En una recursión el total no cuenta dos veces las activaciones internas."""
+        code = """fib: function integer (n: integer) = {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+main: function void () = {
+    print fib(10);
+}
+
+main();
+"""
+        profiler, output = self.profile(code)
+        fib = profiler.functions["fib"]
+        main = profiler.functions["main"]
+
+        self.assertEqual(output, "55")
+        self.assertEqual(fib.calls, 177)
+        self.assertLessEqual(fib.total, main.total)
+        self.assertLessEqual(main.own, main.total)
+        self.assertEqual(fib.depth, 0)
+
+    def test_collapsed_stacks(self):
+        """Las pilas se escriben como 'a;b;c microsegundos'."""
+        code = """f: function integer (n: integer) = {
+    i: integer;
+    s: integer = 0;
+    for (i = 0; i < n; i++) {
+        s = s + i;
+    }
+    return s;
+}
+
+g: function integer () = {
+    return f(20000);
+}
+
+print g();
+"""
+        profiler, _ = self.profile(code)
+        stacks = dict(line.rsplit(" ", 1) for line in profiler.collapsed().splitlines())
+
+        self.assertIn("<global>;g;f", stacks)
+        self.assertTrue(all(value.isdigit() for value in stacks.values()))
+
+    def test_runtime_error(self):
+        """Un error de ejecución deja las pilas del profiler vacías."""
+        code = """a: array [3] integer;
+
+f: function integer (i: integer) = {
+    return a[i];
+}
+
+print f(5);
+"""
+        ast = Parser().parse(Lexer().tokenize(code))
+        profiler = Profiler()
+        Interpreter(
+            Context(code), out=lambda s: None, backend="closure", profiler=profiler
+        ).interpret(ast)
+
+        self.assertTrue(errors_detected())
+        self.assertEqual(profiler._frames, [])
+        self.assertEqual(profiler.functions["f"].calls, 1)
+
+    def test_only_closure_backend(self):
+        code = "print 1;"
+
+        for backend in ("tree", "pyjit"):
+            with self.assertRaises(ValueError):
+                Interpreter(Context(code), backend=backend, profiler=Profiler())
+
+
+if __name__ == "__main__":
+    unittest.main()
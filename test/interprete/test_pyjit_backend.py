@@ -0,0 +1,237 @@
+import os
+import tempfile
+import unittest
+from parser import Parser
+from parser.model import *
+from unittest import mock
+
+from interprete import Context, Interpreter, pyjit
+from interprete.pyjit import PyTranspiler, _cache
+from scanner import Lexer
+from utils import clear_errors, errors_detected
+
+
+class TestPyjitBackend(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def get_output(self, code, backend):
+        parser = Parser()
+        tokens = Lexer().tokenize(code)
+        ast = parser.parse(tokens)
+
+        interpreter = Interpreter(
+            Context(code), get_output=True, out=lambda s: None, backend=backend
+        )
+        interpreter.interpret(ast)
+
+        return interpreter.output
+
+    def assertSameOutput(self, code, expected):
+        """El código generado debe producir la misma salida que el árbol."""
+        for backend in ("tree", "pyjit"):
+            clear_errors()
+            output = self.get_output(code, backend)
+
+            self.assertFalse(errors_detected(), f"Errores con backend {backend}")
+            self.assertEqual(output, expected, f"backend {backend}")
+
+    def test_range_loop_final_value(self):
+        """Tras un for traducido a range la variable queda como en B-minor."""
+        code = """
+        i: integer;
+        n: integer = 4;
+        t: integer = 0;
+        for (i = 0; i < n; i++) { t = t + i; }
+        print i, " ";
+
+        for (i = 10; i < n; i++) { t = t + i; }
+        print i, " ";
+
+        for (i = 0; i <= n; i++) {
+            if (i == 2) { break; }
+        }
+        print i;
+        """
+        self.assertSameOutput(code, "4 10 2")
+
+    def test_continue_runs_update(self):
+        """continue en un for que no es range también ejecuta el update."""
+        code = """
+        i: integer;
+        for (i = 0; i < 10; i = i + 3) {
+            if (i == 3) { continue; }
+            print i, " ";
+        }
+
+        i = 0;
+        do {
+            i++;
+            if (i < 3) { continue; }
+            print i;
+        } while (i < 5);
+        """
+        self.assertSameOutput(code, "0 6 9 345")
+
+    def test_bound_written_in_body(self):
+        code = """
+        i: integer;
+        n: integer = 5;
+        for (i = 0; i < n; i++) {
+            n = n - 1;
+            print i;
+        }
+        """
+        self.assertSameOutput(code, "012")
+
+    def test_integer_semantics(self):
+        code = """
+        x: integer = -7;
+        print x / 2, " ", x % 3, " ", 7.0 / 2.0;
+        """
+        self.assertSameOutput(code, "-4 2 3.5")
+
+    def test_increments_as_expressions(self):
+        code = """
+        x: integer = 5;
+        y: integer = x++ + ++x;
+        print x, " ", y, " ", x--, " ", --x;
+        """
+        self.assertSameOutput(code, "7 12 7 5")
+
+    def test_shadowing_and_globals(self):
+        code = """
+        x: integer = 1;
+        total: integer = 0;
+
+        add: function void (x: integer) = {
+            total = total + x;
+            {
+                x: integer = 100;
+                total = total + x;
+            }
+        }
+
+        add(5);
+        add(x);
+        print total, " ", x;
+        """
+        self.assertSameOutput(code, "206 1")
+
+    def test_arrays(self):
+        code = """
+        a: array [3] integer;
+        b: array [2] boolean;
+        c: array [2] string = {"x", "y"};
+        a[1] = a[2] = 7;
+        print a[0], a[1], a[2], b[0], c[1], array_length(c);
+        """
+        self.assertSameOutput(code, "077falsey2")
+
+    def test_integer_array_storage(self):
+        source = PyTranspiler.transpile(
+            Parser().parse(Lexer().tokenize("a: array [3] integer;"))
+        )
+        self.assertIn("_new_array('integer', [], 3)", source)
+
+    def test_recursion(self):
+        code = """
+        fib: function integer (n: integer) = {
+            if (n < 2) {
+                return n;
+            }
+            return fib(n - 1) + fib(n - 2);
+        }
+
+        print fib(15);
+        """
+        self.assertSameOutput(code, "610")
+
+    def test_default_return(self):
+        code = """
+        nothing: function integer () = {
+            x: integer = 1;
+        }
+
+        flag: function boolean () = { }
+
+        print nothing(), flag();
+        """
+        self.assertSameOutput(code, "0false")
+
+    def test_runtime_error_in_call(self):
+        code = """
+        get: function integer (a: array [] integer, i: integer) = {
+            return a[i];
+        }
+
+        arr: array [2] integer = {1, 2};
+        print get(arr, 5);
+        """
+        for backend in ("tree", "pyjit"):
+            clear_errors()
+            self.get_output(code, backend)
+            self.assertTrue(errors_detected(), f"backend {backend}")
+
+    def test_cached_by_source(self):
+        code = "x: integer = 41; print x + 1;"
+        self.assertSameOutput(code, "42")
+
+        cached = set(_cache.values())
+        self.assertSameOutput(code, "42")
+        self.assertEqual(set(_cache.values()), cached)
+
+    def test_cached_by_options(self):
+        """Sin inline ni licm el programa no usa el código de la caché."""
+        code = """
+        twice: function integer (x: integer) = { return x * 2; }
+        i: integer;
+        n: integer = 3;
+        for (i = 0; i < 3; i++) {
+            print twice(i) + n * n, " ";
+        }
+        """
+        sources = set()
+
+        for inline, licm in ((True, True), (False, True), (True, False)):
+            clear_errors()
+            ast = Parser().parse(Lexer().tokenize(code))
+            interpreter = Interpreter(
+                Context(code),
+                get_output=True,
+                out=lambda s: None,
+                backend="pyjit",
+                inline=inline,
+                licm=licm,
+            )
+            interpreter.interpret(ast)
+
+            self.assertEqual(interpreter.output, "9 11 13 ")
+            sources.add(PyTranspiler.load(ast, code, inline, licm))
+
+        self.assertEqual(len(sources), 3)
+
+    def test_private_cache_dir(self):
+        """La caché en disco solo usa un directorio 0700 del usuario."""
+        code = "print 7 * 6 + 1;"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            private = os.path.join(tmpdir, "privado")
+            shared = os.path.join(tmpdir, "compartido")
+            os.mkdir(shared)
+            os.chmod(shared, 0o777)
+
+            with mock.patch.object(pyjit, "CACHE_DIR", private):
+                self.assertEqual(pyjit._cache_dir(), private)
+                self.assertEqual(os.stat(private).st_mode & 0o777, 0o700)
+
+            with mock.patch.object(pyjit, "CACHE_DIR", shared):
+                self.assertIsNone(pyjit._cache_dir())
+
+                _cache.clear()
+                self.assertEqual(self.get_output(code, "pyjit"), "43")
+                self.assertEqual(os.listdir(shared), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from parser import Parser
+from parser.model import *
+
+from interprete import Context, Interpreter
+from interprete.interp import BACKENDS
+from scanner import Lexer
+from utils import clear_errors, errors_detected
+
+
+class TestRecursion(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def get_output(self, code, backend):
+        parser = Parser()
+        tokens = Lexer().tokenize(code)
+        ast = parser.parse(tokens)
+
+        interpreter = Interpreter(
+            Context(code), get_output=True, out=lambda s: None, backend=backend
+        )
+        interpreter.interpret(ast)
+
+        return interpreter.output
+
+    def assertAllBackends(self, code, expected):
+        for backend in BACKENDS:
+            clear_errors()
+            output = self.get_output(code, backend)
+
+            self.assertFalse(errors_detected(), f"Errores con backend {backend}")
+            self.assertEqual(output, expected, f"backend {backend}")
+
+    def test_deep_tail_call(self):
+        """Las llamadas de cola a la misma función no crecen la pila."""
+        code = """
+        count: function integer (n: integer, acc: integer) = {
+            if (n == 0) {
+                return acc;
+            }
+            return count(n - 1, acc + n);
+        }
+
+        print count(200000, 0);
+        """
+        self.assertAllBackends(code, str(sum(range(200001))))
+
+    def test_tail_call_arguments(self):
+        """Los argumentos se evalúan con los parámetros de la vuelta anterior."""
+        code = """
+        fib: function integer (n: integer, a: integer, b: integer) = {
+            if (n == 0) {
+                return a;
+            }
+            return fib(n - 1, b, a + b);
+        }
+
+        gcd: function integer (a: integer, b: integer) = {
+            while (b != 0) {
+                return gcd(b, a % b);
+            }
+            return a;
+        }
+
+        print fib(40, 0, 1), " ", gcd(1071, 462);
+        """
+        self.assertAllBackends(code, "102334155 21")
+
+    def test_deep_recursion(self):
+        """Recursión que no es de cola más profunda que el límite de python."""
+        code = """
+        depth: function integer (n: integer) = {
+            if (n == 0) {
+                return 0;
+            }
+            return 1 + depth(n - 1);
+        }
+
+        print depth(10000);
+        """
+        self.assertAllBackends(code, "10000")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from parser import Parser
+
+from interprete import Context, Interpreter
+from interprete.interp import BACKENDS
+from scanner import Lexer
+from utils import PhaseReport, clear_errors, errors_detected
+
+
+class TestTimeReport(unittest.TestCase):
+    CODE = """
+    square: function integer (x: integer) = {
+        return x * x;
+    }
+
+    i: integer;
+    total: integer = 0;
+
+    for (i = 0; i < 10; i++) {
+        total = total + square(i);
+    }
+
+    print total;
+    """
+
+    def setUp(self):
+        clear_errors()
+
+    def interpret(self, backend, report):
+        ast = Parser().parse(Lexer().tokenize(self.CODE))
+        interpreter = Interpreter(
+            Context(self.CODE),
+            get_output=True,
+            out=lambda s: None,
+            backend=backend,
+            report=report,
+        )
+        interpreter.interpret(ast)
+
+        return interpreter.output
+
+    def test_phases_per_backend(self):
+        """Cada fase de interpret() queda medida, en orden."""
+        expected = {
+            "tree": ["check", "inline", "licm", "specialize", "ejecución"],
+            "closure": [
+                "check",
+                "inline",
+                "licm",
+                "specialize",
+                "closures",
+                "ejecución",
+            ],
+            "pyjit": ["check", "inline", "licm", "specialize", "ejecución"],
+        }
+
+        for backend in BACKENDS:
+            clear_errors()
+            report = PhaseReport()
+            report.start()
+
+            try:
+                output = self.interpret(backend, report)
+            finally:
+                report.stop()
+
+            self.assertFalse(errors_detected())
+            self.assertEqual(output, "285")
+            self.assertEqual([p["name"] for p in report.phases], expected[backend])
+
+            for p in report.phases:
+                self.assertGreaterEqual(p["wall"], 0)
+                self.assertGreaterEqual(p["cpu"], 0)
+                self.assertGreaterEqual(p["peak"], 0)
+
+    def test_without_report(self):
+        """Sin reporte el intérprete funciona igual."""
+        self.assertEqual(self.interpret("tree", None), "285")
+
+    def test_json(self):
+        """El reporte se guarda en JSON con totales y contadores."""
+        report = PhaseReport()
+
+        with report.phase("a"):
+            pass
+        with report.phase("b"):
+            pass
+
+        report.count("nodos AST", 42)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "report.json")
+            report.save(filename)
+
+            with open(filename) as f:
+                data = json.load(f)
+
+        self.assertEqual([p["name"] for p in data["phases"]], ["a", "b"])
+        self.assertEqual(data["counts"], {"nodos AST": 42})
+        self.assertAlmostEqual(
+            data["total"]["wall"], sum(p["wall"] for p in data["phases"])
+        )
+        self.assertEqual(data["total"]["peak"], 0)  # sin tracemalloc
+
+    def test_child_cpu(self):
+        """El CPU de un proceso hijo (como clang) cuenta en la fase."""
+        report = PhaseReport()
+        busy = "import time\nwhile time.process_time() < 0.3: pass"
+
+        with report.phase("hijo"):
+            subprocess.run([sys.executable, "-c", busy], check=True)
+
+        self.assertGreaterEqual(report.phases[0]["cpu"], 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from parser import Parser
+from parser.model import *
+
+from interprete import Context, Interpreter
+from scanner import Lexer
+from utils import clear_errors, errors_detected
+
+
+class TestTypedOperators(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def run_code(self, code):
+        """Ejecuta el código y devuelve (intérprete, ast)."""
+        parser = Parser()
+        tokens = Lexer().tokenize(code)
+        ast = parser.parse(tokens)
+
+        interpreter = Interpreter(Context(code), get_output=True, out=lambda s: None)
+        interpreter.interpret(ast)
+
+        self.assertFalse(errors_detected(), f"Errores en el intérprete:\n{code}")
+        return interpreter, ast
+
+    def get_output(self, code):
+        interpreter, _ = self.run_code(code)
+        return interpreter.output
+
+    # =========================================================================
+    # 1. MISMA SEMÁNTICA QUE EL CAMINO VERIFICADO
+    # =========================================================================
+
+    def test_integer_division(self):
+        self.assertEqual(self.get_output("print 7 / 2, ' ', 7 % 3;"), "3 1")
+
+    def test_float_division(self):
+        self.assertEqual(self.get_output("print 7.0 / 2.0;"), "3.5")
+
+    def test_char_comparison(self):
+        code = "print 'a' < 'b', 'z' >= 'b', 'a' == 'a';"
+        self.assertEqual(self.get_output(code), "truetruetrue")
+
+    def test_string_concat(self):
+        code = 's: string = "ho" + "la"; print s;'
+        self.assertEqual(self.get_output(code), "hola")
+
+    def test_unary(self):
+        code = "x: integer = 5; b: boolean = true; print -x, !b, +x;"
+        self.assertEqual(self.get_output(code), "-5false5")
+
+    def test_literal_escapes(self):
+        code = """print "a\\tb", '\\n';"""
+        self.assertEqual(self.get_output(code), "a\tb\n")
+
+    # =========================================================================
+    # 2. ESPECIALIZACIÓN UNA VEZ POR NODO
+    # =========================================================================
+
+    def test_nodes_specialized(self):
+        code = """
+        i: integer;
+        total: float = 0.0;
+
+        for (i = 0; i < 10; i++) {
+            total = total + 1.5;
+        }
+
+        print total, " ", "x" + "y";
+        """
+        interpreter, ast = self.run_code(code)
+        self.assertEqual(interpreter.output, "15.0 xy")
+
+        loop = ast.body[2]
+        self.assertIsNotNone(loop.condition._binop)
+        self.assertIsNotNone(loop.body[0].value._binop)
+        self.assertEqual(ast.body[3].expr[1]._value, " ")
+
+    def test_checked_path_not_used(self):
+        """Con tipos probados no se llama a Interpreter.check."""
+        code = """
+        i: integer;
+        c: integer = 0;
+
+        for (i = 0; i < 5; i++) {
+            if (i % 2 == 0 && i >= 0) {
+                c = c + i * 2 - 1;
+            }
+        }
+
+        print c;
+        """
+        parser = Parser()
+        ast = parser.parse(Lexer().tokenize(code))
+
+        interpreter = Interpreter(Context(code), get_output=True, out=lambda s: None)
+
+        def fail(*args):
+            raise AssertionError("Interpreter.check no debería usarse")
+
+        interpreter.check = fail
+        interpreter.interpret(ast)
+
+        self.assertEqual(interpreter.output, "9")
+
+    def test_literal_without_specialize(self):
+        """Un Literal que specialize() no visitó se decodifica al evaluarlo."""
+        interpreter = Interpreter(Context(""), get_output=True, out=lambda s: None)
+
+        self.assertEqual(interpreter.visit(Char("'\\n'")), "\n")
+        self.assertEqual(interpreter.visit(Integer(7)), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from utils import clear_errors, errors_detected
+
+CODE = """
+T: array [4] integer = {1, -2, 3, 4};
+
+main: function integer () = {
+    f: array [3] float = {1.5, -0.5, 2.25};
+    c: array [2] char = {'a', 'b'};
+    b: auto = {true, false, true};
+    u: array [4] integer = {1, -2, 3, 4};
+    m: array [2] integer = {1 + 1, 2};
+    i: integer;
+
+    for (i = 0; i < 4; i++) {
+        print T[i], u[i], " ";
+    }
+    print f[0], f[1], f[2], c[0], c[1], b[0], b[1], b[2], m[0], " ";
+
+    T[0] = 9;
+    print T[0], u[0];
+    return 0;
+}
+"""
+
+EXPECTED = "11 -2-2 33 44 1.500000-0.5000002.250000abtruefalsetrue2 91"
+
+
+class TestArrayLiterals(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def generate(self, constant_arrays=True):
+        module = IRGenerator().generate_from_code(CODE, constant_arrays=constant_arrays)
+        self.assertFalse(errors_detected())
+
+        return str(module)
+
+    def test_constant_table(self):
+        """Las listas de literales se copian de un global constante."""
+        module = self.generate()
+
+        self.assertIn(
+            '@"array_init" = private unnamed_addr constant [4 x i32] [i32 1, i32 -2, i32 3, i32 4]',
+            module,
+        )
+        self.assertIn("constant [3 x i8] [i8 1, i8 0, i8 1]", module)
+        # T y u comparten la tabla, m tiene una expresión
+        self.assertEqual(module.count("private unnamed_addr constant"), 4)
+        self.assertEqual(module.count('call void @"llvm.memcpy'), 5)
+        self.assertEqual(module.count("Init array index"), 2)
+
+    def test_same_output(self):
+        """Con memcpy o un set por elemento el programa hace lo mismo."""
+        for constant_arrays in (True, False):
+            module = self.generate(constant_arrays)
+            self.assertEqual(run_llvm_clang_ir(module, add_runtime=True), EXPECTED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -76,11 +76,12 @@ class TestArrayRef(unittest.TestCase):
         self.assertEqual(output, expected_output)
 
         gen = str(gen)
+        # foo no retiene el array: se omite el par incref/decref de la llamada
         incref = gen.count('call void @"_bminor_array_incref"')
-        self.assertEqual(incref, 1)  # como arg de función
+        self.assertEqual(incref, 0)
 
         decref = gen.count('call void @"_bminor_array_decref"')
-        self.assertEqual(decref, 2)  # 1 en llamada y 1 al final del main
+        self.assertEqual(decref, 1)  # al final del main
 
     def test_inc_dec_return(self):
         code = """
@@ -149,12 +150,13 @@ class TestArrayRef(unittest.TestCase):
         self.assertEqual(output, expected_output)
 
         gen = str(gen)
+        # set_first no retiene su parámetro: sin incref/decref en la llamada
+        # foo lo retorna: incref en línea (sin llamada) y decref después
         incref = gen.count('call void @"_bminor_array_incref"')
-        self.assertEqual(incref, 5)
+        self.assertEqual(incref, 3)
 
         decref = gen.count('call void @"_bminor_array_decref"')
         # 1 return
-        # 1 set_first arg
         # 1 asignación arr2
         # 1 asignación arr
         # 1 foo arg
@@ -162,7 +164,7 @@ class TestArrayRef(unittest.TestCase):
         # 1 al final del main (arr)
         # 1 al final del main (arr2)
         # 1 al final del main (arr3)
-        self.assertEqual(decref, 9)
+        self.assertEqual(decref, 8)
 
     def test_inc_dec_literal(self):
         code = """
@@ -184,8 +186,36 @@ class TestArrayRef(unittest.TestCase):
         self.assertEqual(output, expected_output)
 
         gen = str(gen)
+        # sum_floats no retiene el array: sin incref/decref del argumento
         incref = gen.count('call void @"_bminor_array_incref"')
-        self.assertEqual(incref, 2)  # return, arg
+        self.assertEqual(incref, 1)  # return
 
         decref = gen.count('call void @"_bminor_array_decref"')
-        self.assertEqual(decref, 3)  # return, arg, arr literal
+        self.assertEqual(decref, 2)  # return, arr literal
+
+    def test_retained_param_keeps_pair(self):
+        code = """
+        ident: function array [2] integer (a: array [2] integer) = {
+            return a;
+        }
+
+        forward: function array [2] integer (a: array [2] integer) = {
+            return ident(a);
+        }
+
+        main: function void () = {
+            arr: array [2] integer = {1, 2};
+            r: array [2] integer;
+            r = forward(arr);
+            arr[0] = 7;
+            print r[0], r[1];
+        }
+        """
+        gen, output = self.get_ir_and_output(code)
+        self.assertEqual(output, "72")
+
+        # ident retorna su parámetro y forward se lo pasa: ambos lo retienen,
+        # el incref de la llamada se hace en línea sobre reference_count
+        gen = str(gen)
+        self.assertEqual(gen.count('call void @"_bminor_array_incref"'), 1)
+        self.assertEqual(gen.count('%"reference_count" = getelementptr'), 2)
@@ -339,6 +339,20 @@ class TestBinOper(unittest.TestCase):
         _, out = self.get_ir(code)
         self.assertEqual(out, "false")
 
+    def test_bool_and_array_right(self):
+        """a[i] del lado derecho de && o || abre sus propios bloques."""
+        code = """
+        main: function void () = {
+            a: array [3] integer = {0, 5, 0};
+            i: integer;
+            for (i = 0; i < 4; i++) {
+                print i < 3 && a[i] == 0, " ", i >= 2 || a[i % 3] > 1, " ";
+            }
+        }
+        """
+        _, out = self.get_ir(code)
+        self.assertEqual(out, "true false false true true true false true")
+
     # --- Tests con combinaciones de tipos ---
     # Dependiendo de tu lenguaje, esto podría ser un error de tipo
     # o una coerción automática. Si es un error de tipo, no necesitas estos tests
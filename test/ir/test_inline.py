@@ -0,0 +1,46 @@
+import unittest
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from utils import clear_errors, errors_detected
+
+
+class TestInline(unittest.TestCase):
+    CODE = """
+    square: function integer (x: integer) = { return x * x; }
+    size: function integer (a: array [] integer) = { return array_length(a) * 10; }
+
+    main: function void () = {
+        a: array [3] integer = {1, 2, 3};
+        i: integer;
+        for (i = 0; i < 4; i++) {
+            print square(i) + size(a), " ";
+        }
+    }
+    """
+
+    def setUp(self):
+        clear_errors()
+
+    def generate(self, inline):
+        module = str(IRGenerator().generate_from_code(self.CODE, inline=inline))
+        self.assertFalse(errors_detected())
+        return module
+
+    def test_calls_replaced(self):
+        module = self.generate(inline=True)
+
+        self.assertNotIn('call i32 @"square"', module)
+        self.assertNotIn('call i32 @"size"', module)
+        self.assertIn('call i32 @"square"', self.generate(inline=False))
+
+    def test_same_output(self):
+        expected = "30 31 34 39 "
+
+        for inline in (False, True):
+            module = self.generate(inline)
+            self.assertEqual(run_llvm_clang_ir(module, add_runtime=True), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import io
+import unittest
+from contextlib import redirect_stderr
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from utils import clear_errors, errors_detected
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def run_code(self, code):
+        """(salida del programa, {función: (llamadas, inclusivo, exclusivo)})"""
+        module = IRGenerator().generate_from_code(code, instrument=True)
+        self.assertFalse(errors_detected())
+
+        stderr = io.StringIO()
+
+        with redirect_stderr(stderr):
+            output = run_llvm_clang_ir(str(module), add_runtime=True)
+
+        lines = stderr.getvalue().splitlines()
+        self.assertEqual(
+            lines[0].split(), ["function", "calls", "inclusive_ms", "exclusive_ms"]
+        )
+
+        profile = {}
+
+        for line in lines[1:]:
+            name, calls, inclusive, exclusive = line.split()
+            profile[name] = (int(calls), float(inclusive), float(exclusive))
+
+        return output, profile
+
+    def test_call_counts(self):
+        """Cuenta cada llamada, también las recursivas."""
+        code = """
+        fib: function integer (n: integer) = {
+            if (n < 2) {
+                return n;
+            }
+            return fib(n - 1) + fib(n - 2);
+        }
+
+        unused: function integer (n: integer) = {
+            x: integer = n * 2;
+            return x;
+        }
+
+        main: function void () = {
+            print fib(10);
+        }
+        """
+        output, profile = self.run_code(code)
+
+        self.assertEqual(output, "55")
+        self.assertEqual(set(profile), {"fib", "main"})
+        self.assertEqual(profile["fib"][0], 177)
+        self.assertEqual(profile["main"][0], 1)
+
+    def test_inclusive_and_exclusive(self):
+        """El tiempo inclusivo de main contiene el de las funciones que llama."""
+        code = """
+        work: function integer (n: integer) = {
+            i: integer;
+            total: integer = 0;
+            for (i = 0; i < n; i++) {
+                total = (total + i * i) % 1000;
+            }
+            return total;
+        }
+
+        main: function void () = {
+            i: integer;
+            total: integer = 0;
+            for (i = 0; i < 20; i++) {
+                total = total + work(100000);
+            }
+            print total;
+        }
+        """
+        _, profile = self.run_code(code)
+        calls, inclusive, exclusive = profile["main"]
+
+        self.assertEqual(profile["work"][0], 20)
+        self.assertLessEqual(exclusive, inclusive)
+        self.assertGreaterEqual(inclusive, profile["work"][1])
+
+    def test_early_returns(self):
+        """Cada return de la función cierra su llamada."""
+        code = """
+        sign: function integer (n: integer) = {
+            if (n > 0) {
+                return 1;
+            }
+            if (n < 0) {
+                return -1;
+            }
+            return 0;
+        }
+
+        main: function void () = {
+            i: integer;
+            for (i = -2; i < 3; i++) {
+                print sign(i);
+            }
+            print sign(0) + sign(5);
+        }
+        """
+        output, profile = self.run_code(code)
+
+        self.assertEqual(output, "-1-10111")
+        self.assertEqual(profile["sign"][0], 7)
+
+    def test_small_function_not_inlined(self):
+        """Una función pequeña se cuenta aunque sin --instrument iría en línea."""
+        code = """
+        double: function integer (x: integer) = { return x * 2; }
+
+        main: function void () = {
+            i: integer;
+            total: integer = 0;
+            for (i = 0; i < 10; i++) {
+                total = total + double(i);
+            }
+            print total;
+        }
+        """
+        output, profile = self.run_code(code)
+
+        self.assertEqual(output, "90")
+        self.assertEqual(profile["double"][0], 10)
+
+    def test_disabled_by_default(self):
+        module = str(IRGenerator().generate_from_code("main: function void () = {}"))
+
+        self.assertNotIn("_bminor_prof", module)
+
+
+if __name__ == "__main__":
+    unittest.main()
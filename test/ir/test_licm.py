@@ -0,0 +1,53 @@
+import unittest
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from utils import clear_errors, errors_detected
+
+
+class TestLicm(unittest.TestCase):
+    CODE = """
+    scale: function integer (x: integer) = {
+        m: integer = x * 3;
+        return m + 1;
+    }
+
+    main: function void () = {
+        a: array [5] integer = {1, 2, 3, 4, 5};
+        i: integer;
+        n: integer = 4;
+        total: integer = 0;
+        for (i = 0; i < array_length(a); i++) {
+            total = total + a[i] * scale(n);
+        }
+        print total;
+    }
+    """
+
+    def setUp(self):
+        clear_errors()
+
+    def generate(self, licm):
+        module = str(IRGenerator().generate_from_code(self.CODE, licm=licm))
+        self.assertFalse(errors_detected())
+        return module
+
+    def test_calls_before_loop(self):
+        module = self.generate(licm=True)
+        loop = module.index("for_cond:")
+
+        self.assertLess(module.index('call i32 @"array_length"'), loop)
+        self.assertLess(module.index('call i32 @"scale"'), loop)
+
+        module = self.generate(licm=False)
+        loop = module.index("for_cond:")
+        self.assertGreater(module.index('call i32 @"array_length"'), loop)
+
+    def test_same_output(self):
+        for licm in (False, True):
+            output = run_llvm_clang_ir(self.generate(licm), add_runtime=True)
+            self.assertEqual(output, "195")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from ir import IRGenerator, run_llvm_clang_ir, runner, set_runtime_lto
+from utils import clear_errors, errors_detected
+
+CODE = """
+main: function void () = {
+    a: array [100] integer;
+    s: string = "";
+    i: integer;
+    total: integer = 0;
+
+    for (i = 0; i < 100; i++) {
+        a[i] = i * i;
+    }
+    for (i = 0; i < 100; i++) {
+        total = total + a[i];
+    }
+    for (i = 0; i < 3; i++) {
+        s = s + "ab";
+    }
+
+    print total, " ", s;
+}
+"""
+
+
+class TestRuntimeLTO(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def tearDown(self):
+        set_runtime_lto(True)
+
+    def run_code(self, code):
+        module = IRGenerator().generate_from_code(code)
+        self.assertFalse(errors_detected())
+
+        return run_llvm_clang_ir(str(module), add_runtime=True)
+
+    def test_same_output(self):
+        """Con y sin LTO el programa hace lo mismo."""
+        with_lto = self.run_code(CODE)
+        set_runtime_lto(False)
+
+        self.assertEqual(with_lto, "328350 ababab")
+        self.assertEqual(self.run_code(CODE), with_lto)
+
+    def test_runtime_compiled_once(self):
+        """runtime.c se compila una sola vez por proceso."""
+        self.assertEqual(runner._runtime_object(), runner._runtime_object())
+        self.assertIs(runner._runtime_bitcode(), runner._runtime_bitcode())
+
+    def test_link_error_fallback(self):
+        """Si llvm-link no acepta el bitcode del runtime se usa runtime.o."""
+        bitcode = runner._runtime_bitcode()
+        key = next(k for k, v in runner._runtime_cache.items() if v is bitcode)
+        invalid = runner._runtime_dir / "invalid.bc"
+        invalid.write_bytes(b"BC\xc0\xde no es bitcode")
+        runner._runtime_cache[key] = invalid
+
+        try:
+            self.assertEqual(self.run_code(CODE), "328350 ababab")
+        finally:
+            runner._runtime_cache[key] = bitcode
+
+
+if __name__ == "__main__":
+    unittest.main()
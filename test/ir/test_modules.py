@@ -0,0 +1,130 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from ir.build import BuildError, build
+from utils import clear_errors
+
+LIB = """
+offset: integer = 10;
+prefix: string = "hola ";
+
+greet: function string (name: string) = {
+    return prefix + name;
+}
+
+total: function integer (a: array [] integer) = {
+    i: integer;
+    t: integer = 0;
+    for (i = 0; i < array_length(a); i++) {
+        t = t + a[i];
+    }
+    return t + offset;
+}
+"""
+
+MAIN = """
+greet: function string (name: string);
+total: function integer (a: array [] integer);
+
+main: function integer () = {
+    a: array [3] integer = {1, 2, 3};
+    print greet("mundo"), " ", total(a), "\\n";
+    return 0;
+}
+"""
+
+
+class TestModules(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, code):
+        path = self.dir / name
+        path.write_text(code)
+        return path
+
+    def build(self, *sources):
+        exe = self.dir / "prog"
+        rebuilt = build(sources, self.dir / "build", exe)
+        output = subprocess.run([str(exe)], capture_output=True, text=True, check=True)
+        return rebuilt, output.stdout
+
+    def test_link_modules(self):
+        lib = self.write("lib.bminor", LIB)
+        main = self.write("main.bminor", MAIN)
+
+        rebuilt, output = self.build(lib, main)
+
+        self.assertEqual(sorted(rebuilt), ["lib", "main"])
+        self.assertEqual(output, "hola mundo 16\n")
+        self.assertTrue((self.dir / "build" / "lib.bmi").exists())
+
+    def test_nothing_changed(self):
+        lib = self.write("lib.bminor", LIB)
+        main = self.write("main.bminor", MAIN)
+
+        self.build(lib, main)
+        rebuilt, output = self.build(lib, main)
+
+        self.assertEqual(rebuilt, [])
+        self.assertEqual(output, "hola mundo 16\n")
+
+    def test_body_change_rebuilds_only_module(self):
+        lib = self.write("lib.bminor", LIB)
+        main = self.write("main.bminor", MAIN)
+
+        self.build(lib, main)
+        self.write("lib.bminor", LIB.replace("t + offset", "t + offset * 2"))
+        rebuilt, output = self.build(lib, main)
+
+        self.assertEqual(rebuilt, ["lib"])
+        self.assertEqual(output, "hola mundo 26\n")
+
+    def test_interface_change_rebuilds_importers(self):
+        """Si greet asigna su parámetro deja de recibirlo prestado."""
+        lib = self.write("lib.bminor", LIB)
+        main = self.write("main.bminor", MAIN)
+
+        self.build(lib, main)
+        self.write(
+            "lib.bminor",
+            LIB.replace(
+                "return prefix + name;", "name = prefix + name;\n    return name;"
+            ),
+        )
+        rebuilt, output = self.build(lib, main)
+
+        self.assertEqual(sorted(rebuilt), ["lib", "main"])
+        self.assertEqual(output, "hola mundo 16\n")
+
+    def test_signature_mismatch(self):
+        lib = self.write("lib.bminor", LIB)
+        main = self.write(
+            "main.bminor",
+            MAIN.replace(
+                "total: function integer (a: array [] integer);",
+                "total: function float (a: array [] integer);",
+            ),
+        )
+
+        with self.assertRaises(BuildError) as ctx:
+            build([lib, main], self.dir / "build")
+
+        self.assertIn("total", str(ctx.exception))
+
+    def test_single_entry(self):
+        lib = self.write("lib.bminor", LIB)
+
+        with self.assertRaises(BuildError):
+            build([lib], self.dir / "build")
+
+
+if __name__ == "__main__":
+    unittest.main()
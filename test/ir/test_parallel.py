@@ -0,0 +1,92 @@
+import unittest
+from parser import Parser
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir, run_llvm_module
+from ir.parallel import generate_parallel, split_functions
+from scanner import Lexer
+from semantic import Check
+from utils import clear_errors, errors_detected
+
+CODE = """
+total: integer = 0;
+name: string = "hola";
+table: array [3] integer = {1, 2, 3};
+
+add: function integer (a: array [] integer, x: integer) = {
+    total = total + x;
+    return a[0] + x;
+}
+
+greet: function string (s: string) = {
+    return s + " " + name;
+}
+
+count: function integer (n: integer) = {
+    if (n == 0) {
+        return 0;
+    }
+    return 1 + count(n - 1);
+}
+
+print "inicio\\n";
+
+main: function integer () = {
+    i: integer;
+    for (i = 0; i < 3; i++) {
+        print add(table, i), " ";
+    }
+    print greet("mundo"), " ", count(5), " ", total, "\\n";
+    return 0;
+}
+"""
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def front(self, code):
+        ast = Parser().parse(Lexer().tokenize(code))
+        env, ast = Check.checker(ast, return_ast=True)
+
+        self.assertFalse(errors_detected(), "Errores semánticos en el programa")
+        return env, ast
+
+    def test_same_output_as_serial(self):
+        env, ast = self.front(CODE)
+        expected = run_llvm_clang_ir(
+            str(IRGenerator.Generate(ast, env, None)), add_runtime=True
+        )
+
+        for jobs in (1, 2, 3):
+            env, ast = self.front(CODE)
+            module = generate_parallel(ast, env, jobs)
+
+            self.assertFalse(errors_detected())
+            self.assertEqual(run_llvm_module(module, add_runtime=True), expected)
+
+        self.assertEqual(expected, "inicio\n1 2 3 mundo hola 5 3\n")
+
+    def test_optimized_parts(self):
+        env, ast = self.front(CODE)
+        module = generate_parallel(ast, env, 2, optimize=True)
+
+        self.assertEqual(
+            run_llvm_module(module, add_runtime=True), "inicio\n1 2 3 mundo hola 5 3\n"
+        )
+
+    def test_split_functions(self):
+        env, ast = self.front(CODE)
+        groups = split_functions(ast, 2, "main")
+
+        self.assertEqual(groups[0], ["main"])
+        self.assertEqual(
+            sorted(name for group in groups[1:] for name in group),
+            ["add", "count", "greet"],
+        )
+        self.assertEqual(len(groups), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import functools
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from ir.build import BuildError, build, build_pgo
+from utils import clear_errors
+
+CODE = """
+collatz: function integer (n: integer) = {
+    steps: integer = 0;
+    while (n != 1) {
+        if (n % 2 == 0) {
+            n = n / 2;
+        } else {
+            n = 3 * n + 1;
+        }
+        steps++;
+    }
+    return steps;
+}
+
+main: function integer () = {
+    i: integer;
+    total: integer = 0;
+    for (i = 1; i < 1000; i++) {
+        total = total + collatz(i);
+    }
+    print total, "\\n";
+    return 0;
+}
+"""
+
+
+@functools.cache
+def clang_pgo() -> bool:
+    """clang y llvm-profdata con soporte de -fprofile-generate"""
+    if shutil.which("llvm-profdata") is None:
+        return False
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        source = tmpdir / "t.c"
+        source.write_text("int main(void) { return 0; }\n")
+
+        try:
+            subprocess.run(
+                [
+                    "clang",
+                    f"-fprofile-generate={tmpdir}",
+                    str(source),
+                    "-o",
+                    str(tmpdir / "t"),
+                ],
+                capture_output=True,
+                check=True,
+            )
+            subprocess.run([str(tmpdir / "t")], check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return False
+
+        return any(tmpdir.glob("*.profraw"))
+
+
+def write_profdata(path: Path, count: int):
+    """Un .profdata válido para main, con count ejecuciones"""
+    text = path.with_suffix(".proftext")
+    text.write_text(
+        "# IR level Instrumentation Flag\n:ir\n"
+        f"main\n# Func Hash:\n1\n# Num Counters:\n1\n# Counter Values:\n{count}\n"
+    )
+    subprocess.run(
+        ["llvm-profdata", "merge", f"-output={path}", str(text)],
+        capture_output=True,
+        check=True,
+    )
+
+
+class TestPGO(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.source = self.dir / "main.bminor"
+        self.source.write_text(CODE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_exe(self, exe):
+        return subprocess.run(
+            [str(exe)], capture_output=True, text=True, check=True
+        ).stdout
+
+    @unittest.skipUnless(clang_pgo(), "clang sin soporte de -fprofile-generate")
+    def test_step_change_rebuilds(self):
+        """Cambiar de paso de PGO recompila el módulo; repetirlo no."""
+        out_dir = self.dir / "build"
+
+        self.assertEqual(build([self.source], out_dir), ["main"])
+        self.assertEqual(build([self.source], out_dir, pgo="generate"), ["main"])
+        self.assertEqual(build([self.source], out_dir, pgo="generate"), [])
+        self.assertEqual(build([self.source], out_dir), ["main"])
+        self.assertEqual(self.run_exe(out_dir / "main"), "59431\n")
+
+    @unittest.skipUnless(clang_pgo(), "clang sin soporte de -fprofile-generate")
+    def test_profile_change_rebuilds(self):
+        """Un perfil con otro contenido recompila el módulo."""
+        out_dir = self.dir / "build"
+        profdata = self.dir / "bminor.profdata"
+
+        write_profdata(profdata, 1)
+        self.assertEqual(build([self.source], out_dir, pgo=profdata), ["main"])
+        self.assertEqual(build([self.source], out_dir, pgo=profdata), [])
+
+        write_profdata(profdata, 2)
+        self.assertEqual(build([self.source], out_dir, pgo=profdata), ["main"])
+
+    @unittest.skipUnless(clang_pgo(), "clang sin soporte de -fprofile-generate")
+    def test_workflow(self):
+        """Instrumentado, entrenamiento y compilación con el perfil."""
+        out_dir = self.dir / "build"
+        exe = self.dir / "prog"
+
+        rebuilt = build_pgo([self.source], out_dir, exe, runs=2)
+
+        self.assertEqual(rebuilt, ["main"])
+        self.assertTrue((out_dir / "bminor.profdata").exists())
+        self.assertTrue(any((out_dir / "pgo" / "profiles").glob("*.profraw")))
+        self.assertEqual(self.run_exe(exe), "59431\n")
+
+    def test_no_profiles(self):
+        """Sin perfiles del entrenamiento no hay compilación final."""
+        if clang_pgo():
+            self.skipTest("clang con soporte de -fprofile-generate")
+
+        with self.assertRaises(BuildError):
+            build_pgo([self.source], self.dir / "build", self.dir / "prog")
+
+
+if __name__ == "__main__":
+    unittest.main()
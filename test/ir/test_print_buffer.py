@@ -0,0 +1,69 @@
+import subprocess
+import unittest
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from utils import clear_errors, errors_detected
+
+
+class TestPrintBuffer(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def run_code(self, code):
+        module = IRGenerator().generate_from_code(code)
+
+        self.assertFalse(
+            errors_detected(),
+            "Errores semánticos detectados durante la generación de IR",
+        )
+        return run_llvm_clang_ir(str(module), add_runtime=True)
+
+    def test_format(self):
+        """Mismo formato que printf: %d, %f, %c, %s."""
+        code = """
+        main: function void () = {
+            f: float = 2.5;
+            print 0, " ", -7, " ", 2147483647, " ", -2147483647 - 1, "\\n";
+            print 0.0, " ", -0.5, " ", 123.456, " ", f * 1000000000.0, "\\n";
+            print 'a', true, false, "\\n";
+        }
+        """
+        expected = (
+            "0 -7 2147483647 -2147483648\n"
+            "0.000000 -0.500000 123.456001 2500000000.000000\n"
+            "atruefalse\n"
+        )
+        self.assertEqual(self.run_code(code), expected)
+
+    def test_larger_than_buffer(self):
+        code = """
+        main: function void () = {
+            i: integer;
+            for (i = 0; i < 100000; i++) {
+                print i, "\\n";
+            }
+        }
+        """
+        expected = "".join(f"{i}\n" for i in range(100000))
+        self.assertEqual(self.run_code(code), expected)
+
+    def test_flush_on_runtime_error(self):
+        """La salida anterior a un error de ejecución no se pierde."""
+        code = """
+        main: function void () = {
+            a: array [2] integer = {1, 2};
+            i: integer = 5;
+            print "antes\\n";
+            print a[i];
+        }
+        """
+        with self.assertRaises(subprocess.CalledProcessError) as ctx:
+            self.run_code(code)
+
+        self.assertEqual(ctx.exception.stdout, "antes\n")
+        self.assertIn("Array index out of bounds", ctx.exception.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
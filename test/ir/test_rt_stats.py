@@ -0,0 +1,125 @@
+import io
+import unittest
+from contextlib import redirect_stderr
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir, set_runtime_stats
+from ir.runner import RuntimeLeakError
+from utils import clear_errors, errors_detected
+
+
+class TestRuntimeStats(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+        set_runtime_stats("check")
+
+    def tearDown(self):
+        set_runtime_stats(None)
+
+    def run_code(self, code):
+        module = IRGenerator().generate_from_code(code)
+        self.assertFalse(errors_detected())
+
+        return run_llvm_clang_ir(str(module), add_runtime=True)
+
+    def test_report(self):
+        """Asignaciones, liberaciones y bytes por sitio, pico y objetos vivos."""
+        set_runtime_stats("report")
+        code = """
+        a: array [2] string;
+
+        main: function void () = {
+            s: string = "ab";
+            a[0] = s + "cd";
+            print a[0];
+        }
+        """
+        stderr = io.StringIO()
+
+        with redirect_stderr(stderr):
+            output = self.run_code(code)
+
+        lines = stderr.getvalue().splitlines()
+        start = next(i for i, line in enumerate(lines) if line.startswith("site "))
+        sites = {}
+
+        for line in lines[start + 1 :]:
+            if line.startswith("peak"):
+                break
+
+            name, allocs, frees, size = line.split()
+            sites[name] = (int(allocs), int(frees), int(size))
+
+        self.assertEqual(output, "abcd")
+        self.assertEqual(sites["string_concat"], (1, 1, 5))
+        self.assertEqual(sites["array_new"][:2], (1, 1))
+        self.assertIn("live at exit: 0 objects, 0 bytes", lines)
+        self.assertTrue(any(l.startswith("peak live bytes: ") for l in lines))
+
+    def test_leak_detected(self):
+        """En modo check un objeto vivo al terminar es un error."""
+        from ir.runner import _program_stderr
+
+        stats = "site allocs frees bytes\nlive at exit: 1 objects, 4 bytes\n"
+
+        with self.assertRaises(RuntimeLeakError):
+            _program_stderr(stats)
+
+        _program_stderr("site allocs frees bytes\nlive at exit: 0 objects, 0 bytes\n")
+
+    def test_array_element_temporary(self):
+        """El string temporal asignado a un elemento del array se libera."""
+        code = """
+        main: function void () = {
+            a: array [2] string;
+            b: string;
+            a[0] = "x" + "y";
+            b = a[1] = a[0] + "z";
+            print a[0], a[1], b;
+        }
+        """
+        self.assertEqual(self.run_code(code), "xyxyzxyz")
+
+    def test_return_in_nested_block(self):
+        """Un return dentro de un if libera los strings de los bloques externos."""
+        code = """
+        f: function string (n: integer) = {
+            s: string = "abc";
+            if (n > 0) {
+                t: string = s + "x";
+                while (true) {
+                    return t;
+                }
+            }
+            return s;
+        }
+
+        main: function void () = {
+            print f(1), f(0);
+        }
+        """
+        self.assertEqual(self.run_code(code), "abcxabc")
+
+    def test_break_in_nested_block(self):
+        """break y continue liberan los strings hasta el cuerpo del bucle."""
+        code = """
+        main: function void () = {
+            i: integer;
+            for (i = 0; i < 4; i++) {
+                s: string = "a";
+                if (i == 1) {
+                    continue;
+                }
+                if (i == 2) {
+                    t: string = "b";
+                    break;
+                }
+                print s;
+            }
+        }
+        """
+        self.assertEqual(self.run_code(code), "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+from parser import Parser
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from ir.array_escape import recursive_functions, stack_arrays
+from scanner import Lexer
+from semantic import Check
+from utils import clear_errors, errors_detected
+
+CODE = """
+N: constant = 4;
+
+sum: function integer (a: array [] integer) = {
+    i: integer;
+    total: integer = 0;
+    for (i = 0; i < array_length(a); i++) {
+        total = total + a[i];
+    }
+    return total;
+}
+
+make: function array [2] integer () = {
+    m: array [2] integer = {7, 8};
+    return m;
+}
+
+main: function integer () = {
+    a: array [N] integer;
+    b: array [2 * N] float;
+    c: array [3] integer = {1 + 1, 2, 3};
+    d: auto = {true, false};
+    k: auto = make();
+    i: integer;
+
+    for (i = 0; i < 3; i++) {
+        e: array [2] integer;
+        e[0] = e[0] + i;
+        print e[0], " ";
+    }
+    for (i = 0; i < N; i++) {
+        a[i] = i;
+        b[i] = 1.5;
+    }
+
+    print sum(a), " ", sum(c), " ", b[3], " ", d[0], " ", k[1];
+    return 0;
+}
+"""
+
+
+def program(code):
+    ast = Parser().parse(Lexer().tokenize(code))
+    _, ast = Check.checker(ast, return_ast=True)
+
+    return ast
+
+
+def on_stack(code, retained=lambda name, i: name != "array_length"):
+    """Nombres de los arrays de cada función que van en el stack"""
+    ast = program(code)
+    result = {}
+
+    for decl in ast.body:
+        if isinstance(decl, FuncDecl) and decl.body:
+            sizes = stack_arrays(decl, {}, retained)
+            names = [n.name for n in decl.body if id(n) in sizes]
+            result[decl.name] = names
+
+    return result
+
+
+class TestStackArrays(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def generate(self, code, **options):
+        module = IRGenerator().generate_from_code(code, **options)
+        self.assertFalse(errors_detected())
+
+        return str(module)
+
+    def test_no_heap_allocation(self):
+        """Solo el array retornado por make usa _bminor_array_new."""
+        module = self.generate(CODE)
+
+        self.assertEqual(module.count('call i8* @"_bminor_array_new"'), 1)
+        self.assertEqual(module.count("alloca {i8*, i32, i32, i8, i32}"), 5)
+
+    def test_same_output(self):
+        """Con y sin arrays en el stack el programa hace lo mismo."""
+        expected = "0 1 2 6 7 1.500000 true 8"
+
+        for stack in (True, False):
+            module = self.generate(CODE, stack_arrays=stack)
+            self.assertEqual(run_llvm_clang_ir(module, add_runtime=True), expected)
+
+    def test_escape(self):
+        """return, asignaciones y parámetros retenidos dejan el array en el heap."""
+        code = """
+        g: function void (a: array [] integer) = {
+            a[0] = 1;
+        }
+
+        main: function integer () = {
+            a: array [2] integer;
+            b: array [2] integer;
+            c: array [2] integer;
+            d: array [2] integer;
+            e: array [2] integer;
+            s: array [2] string;
+            n: integer = 2;
+            f: array [n] integer;
+            x: auto = b;
+            c = a;
+            g(a);
+            g(d);
+            return e[0];
+        }
+        """
+        self.assertEqual(on_stack(code, lambda name, i: False)["main"], ["d", "e"])
+
+        retained = lambda name, i: name == "g"
+        self.assertEqual(on_stack(code, retained)["main"], ["e"])
+
+    def test_recursive(self):
+        """Recursivas, o que llaman a una función sin cuerpo que podría llamarlas."""
+        code = """
+        ext: function void ();
+        g: function integer (n: integer);
+
+        f: function integer (n: integer) = {
+            if (n == 0) { return 0; }
+            return g(n - 1);
+        }
+
+        g: function integer (n: integer) = {
+            return f(n);
+        }
+
+        h: function void () = {
+            ext();
+        }
+
+        main: function void () = {
+            h();
+        }
+        """
+        self.assertEqual(recursive_functions(program(code)), {"f", "g", "h", "main"})
+
+
+if __name__ == "__main__":
+    unittest.main()
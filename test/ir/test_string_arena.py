@@ -0,0 +1,90 @@
+import unittest
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from utils import clear_errors, errors_detected
+
+CODE = """
+show: function void (s: string) = {
+    print s;
+}
+
+join: function string (a: string, b: string) = {
+    return a + "-" + b;
+}
+
+main: function void () = {
+    a: string = "ho";
+    b: string = "la";
+    i: integer;
+    r: string = "";
+
+    print a + b + "!", "\\n";
+    for (i = 0; i < 3; i++) {
+        show(a + b + "?");
+        r = r + a + b;
+    }
+    print "\\n", r, "\\n", join(a + b, b + a), "\\n";
+}
+"""
+
+
+class TestStringArena(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def generate(self, code, allocation):
+        module = IRGenerator().generate_from_code(code, allocation=allocation)
+
+        self.assertFalse(
+            errors_detected(),
+            "Errores semánticos detectados durante la generación de IR",
+        )
+        return str(module)
+
+    def test_same_output(self):
+        malloc = run_llvm_clang_ir(self.generate(CODE, "malloc"), add_runtime=True)
+        arena = run_llvm_clang_ir(self.generate(CODE, "arena"), add_runtime=True)
+
+        self.assertEqual(malloc, arena)
+        self.assertEqual(malloc, "hola!\nhola?hola?hola?\nholaholahola\nhola-laho\n")
+
+    def test_intermediates_in_arena(self):
+        code = """
+        main: function void () = {
+            a: string = "a";
+            print a + a + a;
+        }
+        """
+        malloc = self.generate(code, "malloc")
+        arena = self.generate(code, "arena")
+
+        self.assertNotIn('call i8* @"_bminor_string_concat_tmp"', malloc)
+        self.assertEqual(arena.count('call i8* @"_bminor_string_concat_tmp"'), 2)
+        self.assertEqual(arena.count('call i8* @"_bminor_arena_mark"'), 1)
+        self.assertEqual(arena.count('call void @"_bminor_arena_release"'), 1)
+        # ni el intermedio ni el resultado se liberan uno a uno
+        free = 'call void @"_bminor_string_free"'
+        self.assertEqual(arena.count(free), malloc.count(free) - 2)
+
+    def test_escaping_result_uses_malloc(self):
+        """El resultado que se guarda en una variable no puede ir a la arena."""
+        code = """
+        main: function void () = {
+            a: string = "a";
+            b: string = a + a + a;
+            print b;
+        }
+        """
+        arena = self.generate(code, "arena")
+
+        self.assertEqual(arena.count('call i8* @"_bminor_string_concat_tmp"'), 1)
+        self.assertEqual(arena.count('call i8* @"_bminor_string_concat"('), 1)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            self.generate(CODE, "pool")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from utils import clear_errors, errors_detected
+
+
+class TestTailCalls(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def generate(self, code):
+        module = IRGenerator().generate_from_code(code)
+
+        self.assertFalse(
+            errors_detected(),
+            "Errores semánticos detectados durante la generación de IR",
+        )
+        return module
+
+    def run_code(self, code):
+        return run_llvm_clang_ir(str(self.generate(code)), add_runtime=True)
+
+    def test_self_tail_call_is_loop(self):
+        """10 millones de llamadas de cola sin crecer la pila."""
+        code = """
+        count: function integer (n: integer, acc: integer) = {
+            if (n == 0) {
+                return acc;
+            }
+            return count(n - 1, (acc + n) % 1000);
+        }
+
+        main: function void () = {
+            print count(10000000, 0);
+        }
+        """
+        module = str(self.generate(code))
+
+        self.assertIn("tail_loop", module)
+        self.assertEqual(self.run_code(code), str(sum(range(10000001)) % 1000))
+
+    def test_arguments_evaluated_before_store(self):
+        """Los parámetros nuevos se calculan con los valores anteriores."""
+        code = """
+        fib: function integer (n: integer, a: integer, b: integer) = {
+            if (n == 0) {
+                return a;
+            }
+            return fib(n - 1, b, a + b);
+        }
+
+        main: function void () = {
+            print fib(30, 0, 1);
+        }
+        """
+        self.assertEqual(self.run_code(code), "832040")
+
+    def test_string_locals_keep_call(self):
+        """Con strings locales la llamada no se convierte en ciclo."""
+        code = """
+        repeat: function integer (n: integer) = {
+            s: string = "x";
+            if (n == 0) {
+                return 0;
+            }
+            return repeat(n - 1);
+        }
+
+        main: function void () = {
+            print repeat(100);
+        }
+        """
+        self.assertNotIn("tail_loop", str(self.generate(code)))
+        self.assertEqual(self.run_code(code), "0")
+
+    def test_sibling_calls_marked(self):
+        code = """
+        double: function integer (n: integer) = {
+            m: integer = n * 2;
+            return m;
+        }
+
+        next: function integer (n: integer) = {
+            return double(n + 1);
+        }
+
+        show: function void (n: integer) = {
+            print n;
+        }
+
+        main: function void () = {
+            print next(20), " ";
+            show(5);
+        }
+        """
+        module = str(self.generate(code))
+
+        self.assertIn('musttail call i32 @"double"', module)
+        self.assertEqual(self.run_code(code), "42 5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from parser.model import *
+
+from llvmlite import ir
+
+from ir import IRGenerator, run_llvm_clang_ir
+from utils import clear_errors, errors_detected
+
+
+class TestTempSlots(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def generate(self, code):
+        module = IRGenerator().generate_from_code(code)
+
+        self.assertFalse(
+            errors_detected(),
+            "Errores semánticos detectados durante la generación de IR",
+        )
+        return module
+
+    def allocas(self, func: ir.Function):
+        """(bloque, alloca) de todas las allocas de la función"""
+        return [
+            (block, instr)
+            for block in func.blocks
+            for instr in block.instructions
+            if isinstance(instr, ir.AllocaInstr)
+        ]
+
+    def test_temporaries_in_alloca_block(self):
+        """Ningún alloca fuera del bloque alloca, aunque esté en un bucle."""
+        code = """
+        g: function array [2] integer () = {
+            a: array [2] integer = {1, 2};
+            return a;
+        }
+
+        f: function integer (a: array [] integer, s: string) = {
+            return a[0];
+        }
+
+        main: function void () = {
+            i: integer;
+            t: integer = 0;
+            for (i = 0; i < 3; i++) {
+                t = t + f(g(), "x");
+            }
+        }
+        """
+        module = self.generate(code)
+
+        for func in module.functions:
+            if func.blocks:
+                for block, instr in self.allocas(func):
+                    self.assertIs(block, func.blocks[0], f"{func.name}: {instr}")
+
+    def test_slots_reused_between_statements(self):
+        code = """
+        g: function array [2] integer () = {
+            a: array [2] integer = {1, 2};
+            return a;
+        }
+
+        f: function integer (a: array [] integer, b: array [] integer) = {
+            return a[0] + b[1];
+        }
+
+        main: function void () = {
+            x: integer = f(g(), g());
+            x = f(g(), g());
+            x = f(g(), g()) + f(g(), g());
+            print x;
+        }
+        """
+        module = self.generate(code)
+        main = [f for f in module.functions if f.name.startswith("main_")][0]
+
+        temps = [
+            instr
+            for _, instr in self.allocas(main)
+            if instr.name.startswith("temp_") and str(instr.allocated_type) == "i8*"
+        ]
+        # la última sentencia necesita cuatro slots a la vez, el resto los reutiliza
+        # (a[i] de integer se lee sin slot, directo de los datos del array)
+        self.assertEqual(len(temps), 4)
+
+    def test_stress_loop(self):
+        """10M llamadas f(g()) no deben agotar el stack."""
+        code = """
+        g: function array [2] integer () = {
+            a: array [2] integer = {1, 2};
+            return a;
+        }
+
+        f: function integer (a: array [] integer) = {
+            return a[0] + a[1];
+        }
+
+        main: function void () = {
+            i: integer;
+            total: integer = 0;
+            for (i = 0; i < 10000000; i++) {
+                total = total + f(g());
+            }
+            print total;
+        }
+        """
+        output = run_llvm_clang_ir(str(self.generate(code)), add_runtime=True)
+        self.assertEqual(output.strip(), "30000000")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import subprocess
+import unittest
+from parser import Parser
+from parser.model import *
+
+from ir import IRGenerator, run_llvm_clang_ir
+from ir.array_loops import range_loop
+from scanner import Lexer
+from semantic import Check
+from semantic.purity import walk
+from utils import clear_errors, errors_detected
+
+CODE = """
+N: integer = 8;
+
+sum: function integer (a: array [] integer) = {
+    i: integer;
+    total: integer = 0;
+    for (i = 0; i < array_length(a); i++) {
+        total = total + a[i];
+    }
+    return total;
+}
+
+main: function void () = {
+    a: array [8] integer;
+    xs: array [8] float;
+    i: integer;
+
+    for (i = 0; i < N; i++) {
+        a[i] = i * 2;
+        xs[i] = 0.5;
+    }
+    for (i = 0; i <= N - 1; i++) {
+        xs[i] = xs[i] * 2.0 + 1.0;
+    }
+
+    print sum(a), " ", xs[7];
+}
+"""
+
+
+def for_loops(code):
+    ast = Parser().parse(Lexer().tokenize(code))
+    _, ast = Check.checker(ast, return_ast=True)
+
+    loops = [n for n in walk(ast) if isinstance(n, ForStmt)]
+
+    return sorted(loops, key=lambda n: n.lineno)
+
+
+class TestVectorize(unittest.TestCase):
+    def setUp(self):
+        clear_errors()
+
+    def generate(self, code, vectorize=True):
+        module = IRGenerator().generate_from_code(code, vectorize=vectorize)
+        self.assertFalse(errors_detected())
+
+        return str(module)
+
+    def test_unchecked_copy(self):
+        """El for sobre a[i] tiene una copia sin revisión de rango."""
+        module = self.generate(CODE)
+
+        self.assertIn("for_unchecked", module)
+        self.assertIn("!invariant.load", module)
+        self.assertIn('"llvm.loop.vectorize.enable"', module)
+        self.assertEqual(run_llvm_clang_ir(module, add_runtime=True), "56 2.000000")
+
+    def test_checked_path(self):
+        """Si fin no cabe en el array, el error sale en el mismo acceso."""
+        code = """
+        main: function void () = {
+            a: array [4] integer;
+            i: integer;
+            for (i = 0; i < 6; i++) {
+                print i;
+                a[i] = i;
+            }
+        }
+        """
+        with self.assertRaises(subprocess.CalledProcessError) as ctx:
+            run_llvm_clang_ir(self.generate(code), add_runtime=True)
+
+        self.assertEqual(ctx.exception.stdout, "01234")
+        self.assertIn("Array index out of bounds", ctx.exception.stderr)
+
+    def test_negative_start(self):
+        """Con i negativo se usa el bucle con revisión."""
+        code = """
+        main: function void () = {
+            a: array [4] integer;
+            i: integer;
+            for (i = -1; i < 4; i++) {
+                a[i] = i;
+            }
+        }
+        """
+        with self.assertRaises(subprocess.CalledProcessError) as ctx:
+            run_llvm_clang_ir(self.generate(code), add_runtime=True)
+
+        self.assertIn("Array index out of bounds", ctx.exception.stderr)
+
+    def test_range_loop(self):
+        """Solo los for con paso 1 que no cambian i, fin ni el array."""
+        loops = for_loops(
+            """
+        f: function integer (x: integer) = { return x; }
+
+        main: function void () = {
+            a: array [4] integer;
+            b: array [4] integer;
+            i: integer;
+            n: integer = 4;
+            for (i = 0; i < n; i++) { a[i] = b[i]; }
+            for (i = 0; i < n; i++) { a[i] = f(i); }
+            for (i = 0; i < n; i++) { a[i] = i; n = 3; }
+            for (i = 0; i < n; i = i + 2) { a[i] = i; }
+            for (i = 0; i < n; i++) { a[0] = i; }
+            for (i = 0; i < n; i++) { print a[i]; }
+        }
+        """
+        )
+        loop = range_loop(loops[0])
+
+        self.assertEqual(loop.arrays, {"a", "b"})
+        self.assertTrue(loop.vectorize)
+        self.assertEqual([range_loop(n) for n in loops[1:5]], [None] * 4)
+        self.assertFalse(range_loop(loops[5]).vectorize)
+
+    def test_disabled(self):
+        """Con vectorize=False no hay copia del bucle."""
+        module = self.generate(CODE, vectorize=False)
+
+        self.assertNotIn("for_unchecked", module)
+        self.assertEqual(run_llvm_clang_ir(module, add_runtime=True), "56 2.000000")
+
+
+if __name__ == "__main__":
+    unittest.main()
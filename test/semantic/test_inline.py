@@ -0,0 +1,106 @@
+import unittest
+from parser import Parser
+from parser.model import *
+
+from interprete import Context, Interpreter
+from scanner import Lexer
+from semantic import Check, inline_calls
+from utils import clear_errors, errors_detected
+
+
+class TestInline(unittest.TestCase):
+    def setUp(self):
+        self.lexer = Lexer()
+        self.parser = Parser()
+        clear_errors()
+
+    def inline(self, code):
+        tokens = self.lexer.tokenize(code)
+        ast = self.parser.parse(tokens)
+        env, ast = Check.checker(ast, return_ast=True)
+        self.assertFalse(errors_detected())
+        return inline_calls(ast)
+
+    def inlined_names(self, code):
+        return [callee for _, _, callee in self.inline(code)]
+
+    def run_both(self, code):
+        """Salida del intérprete con y sin inlining"""
+        outputs = []
+
+        for inline in (False, True):
+            clear_errors()
+            ast = self.parser.parse(self.lexer.tokenize(code))
+            interpreter = Interpreter(
+                Context(code), get_output=True, out=lambda s: None, inline=inline
+            )
+            interpreter.interpret(ast)
+            self.assertFalse(errors_detected())
+            outputs.append(interpreter.output)
+
+        return outputs
+
+    def test_small_functions(self):
+        code = """
+        k: integer = 3;
+        square: function integer (x: integer) = { return x * x; }
+        addk: function integer (x: integer) = { return x + k; }
+        size: function integer (a: array [] integer) = { return array_length(a) + 1; }
+
+        main: function void () = {
+            a: array [2] integer = {1, 2};
+            n: integer = 4;
+            print square(n), addk(n + 1), size(a);
+        }
+        """
+        result = self.inline(code)
+
+        self.assertEqual(
+            sorted(callee for _, _, callee in result), ["addk", "size", "square"]
+        )
+        self.assertTrue(all(caller == "main" for _, caller, _ in result))
+
+    def test_not_inlined(self):
+        code = """
+        k: integer = 3;
+        square: function integer (x: integer) = { return x * x; }
+        addk: function integer (x: integer) = { return x + k; }
+        get: function integer (a: array [] integer, i: integer) = { return a[i]; }
+        half: function integer (x: integer) = { return x / 2; }
+        name: function string (s: string) = { return s; }
+        twice: function integer (x: integer) = {
+            y: integer = x * 2;
+            return y;
+        }
+        fact: function integer (n: integer) = {
+            return n * fact(n - 1);
+        }
+
+        main: function void () = {
+            a: array [2] integer = {1, 2};
+            k: integer = 1;
+            n: integer = 4;
+            print square(n + 1), addk(n), get(a, 1), half(n), name("b"), twice(n), fact(n);
+        }
+        """
+        self.assertEqual(self.inlined_names(code), [])
+
+    def test_same_output(self):
+        code = """
+        g: integer = 10;
+        square: function integer (x: integer) = { return x * x; }
+        mix: function float (x: float, y: float) = { return x * 0.5 + y; }
+        isbig: function boolean (x: integer) = { return x > g; }
+
+        i: integer;
+        for (i = 0; i < 5; i++) {
+            print square(i), " ", mix(1.0, 2.0), " ", isbig(square(i)), " ";
+            g = g + 1;
+        }
+        """
+        without, inlined = self.run_both(code)
+        self.assertEqual(without, inlined)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+from parser import Parser
+from parser.model import *
+
+from interprete import Context, Interpreter
+from scanner import Lexer
+from semantic import Check, hoist_invariants
+from semantic.purity import function_effects
+from utils import clear_errors, errors_detected
+
+
+class TestLicm(unittest.TestCase):
+    def setUp(self):
+        self.lexer = Lexer()
+        self.parser = Parser()
+        clear_errors()
+
+    def check(self, code):
+        tokens = self.lexer.tokenize(code)
+        ast = self.parser.parse(tokens)
+        env, ast = Check.checker(ast, return_ast=True)
+        self.assertFalse(errors_detected())
+        return ast
+
+    def hoisted(self, code):
+        return hoist_invariants(self.check(code))
+
+    def run_both(self, code):
+        """Salida del intérprete con y sin licm"""
+        outputs = []
+
+        for licm in (False, True):
+            clear_errors()
+            ast = self.parser.parse(self.lexer.tokenize(code))
+            interpreter = Interpreter(
+                Context(code),
+                get_output=True,
+                out=lambda s: None,
+                inline=False,
+                licm=licm,
+            )
+            interpreter.interpret(ast)
+            self.assertFalse(errors_detected())
+            outputs.append(interpreter.output)
+
+        return outputs
+
+    def test_effects(self):
+        code = """
+        g: integer = 1;
+        add: function integer (x: integer) = { y: integer = x + g; return y; }
+        show: function void (x: integer) = { print x; }
+        setg: function void () = { g = 2; }
+        half: function integer (x: integer) = { return x / 2; }
+        loop: function integer (n: integer) = {
+            while (n > 0) { n = n - 1; }
+            return n;
+        }
+        rec: function integer (n: integer) = { return rec(n); }
+        twice: function integer (x: integer) = { return add(x) + add(x); }
+        """
+        effects = function_effects(self.check(code))
+
+        self.assertTrue(effects["array_length"].safe)
+        self.assertTrue(effects["add"].safe)
+        self.assertEqual(effects["add"].reads, {"g"})
+        self.assertTrue(effects["twice"].safe)
+        self.assertEqual(effects["twice"].reads, {"g"})
+        self.assertTrue(effects["show"].writes)
+        self.assertTrue(effects["setg"].writes)
+
+        for name in ("show", "setg", "half", "loop", "rec"):
+            self.assertFalse(effects[name].safe, name)
+
+    def test_array_length_condition(self):
+        code = """
+        main: function void () = {
+            a: array [3] integer = {1, 2, 3};
+            i: integer;
+            for (i = 0; i < array_length(a); i++) {
+                print a[i];
+            }
+        }
+        """
+        ast = self.check(code)
+        self.assertEqual(len(hoist_invariants(ast)), 1)
+
+        body = ast.body[0].body
+        loop = next(stmt for stmt in body if isinstance(stmt, ForStmt))
+        decl = body[body.index(loop) - 1]
+
+        self.assertIsInstance(decl, VarDecl)
+        self.assertIsInstance(decl.value, FuncCall)
+        self.assertEqual(loop.condition.right.name, decl.name)
+
+    def test_not_hoisted(self):
+        code = """
+        g: integer = 1;
+        add: function integer (x: integer) = { y: integer = x + g; return y; }
+        setg: function void () = { g = g + 1; }
+
+        main: function void () = {
+            a: array [3] integer = {1, 2, 3};
+            i: integer;
+            n: integer = 4;
+            while (i < n) {
+                i = i + 1;
+                print a[i - 1], n / 2, add(n);
+                setg();
+            }
+        }
+        """
+        self.assertEqual(self.hoisted(code), [])
+
+    def test_same_output(self):
+        code = """
+        g: integer = 3;
+        add: function integer (x: integer) = { y: integer = x + g; return y; }
+
+        a: array [5] integer = {5, 4, 3, 2, 1};
+        i: integer;
+        j: integer;
+        t: integer = 0;
+        for (i = 0; i < array_length(a); i++) {
+            for (j = 0; j < array_length(a) - i; j++) {
+                t = t + a[j] * add(i) + add(2);
+            }
+            g = g + 1;
+        }
+        print t;
+        """
+        without, hoisted = self.run_both(code)
+        self.assertEqual(without, hoisted)
+
+
+if __name__ == "__main__":
+    unittest.main()
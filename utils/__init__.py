@@ -1,3 +1,4 @@
 from .errors import *
+from .report import *
 from .utils import *
 from .warning import *
@@ -0,0 +1,121 @@
+"""
+Tiempo y memoria por fase del compilador (--time-report)
+
+PhaseReport mide cada bloque `with report.phase("nombre"):` y guarda:
+
+    wall     tiempo real (perf_counter)
+    cpu      tiempo de CPU del proceso, todos los hilos (process_time), más
+             el de los procesos hijos que terminaron durante la fase
+             (os.times: llvm-as, clang y el ejecutable)
+    peak     pico de memoria de Python durante la fase (tracemalloc)
+
+además de contadores sueltos (nodos del AST, instrucciones del IR).
+tracemalloc solo se activa en start() y hace más lento todo lo que mide:
+los tiempos de un reporte sirven para comparar fases entre sí, no con
+una ejecución sin reporte. Los procesos externos no aparecen en la
+memoria.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+__all__ = ["PhaseReport", "timed_phase"]
+
+
+def _cpu_time() -> float:
+    """CPU del proceso y de los hijos ya esperados (0 en Windows)"""
+    children = os.times()
+
+    return time.process_time() + children.children_user + children.children_system
+
+
+class PhaseReport:
+    def __init__(self):
+        self.phases = []
+        self.counts = {}
+
+    def start(self):
+        tracemalloc.start()
+
+    def stop(self):
+        tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name: str):
+        tracing = tracemalloc.is_tracing()
+
+        if tracing:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+
+        wall, cpu = time.perf_counter(), _cpu_time()
+
+        try:
+            yield
+        finally:
+            self.phases.append(
+                {
+                    "name": name,
+                    "wall": time.perf_counter() - wall,
+                    "cpu": _cpu_time() - cpu,
+                    "peak": tracemalloc.get_traced_memory()[1] - base if tracing else 0,
+                }
+            )
+
+    def count(self, name: str, value: int):
+        self.counts[name] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "phases": self.phases,
+            "total": {
+                "wall": sum(p["wall"] for p in self.phases),
+                "cpu": sum(p["cpu"] for p in self.phases),
+                "peak": max((p["peak"] for p in self.phases), default=0),
+            },
+            "counts": self.counts,
+        }
+
+    def save(self, filename: str):
+        with open(filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def print(self):
+        import rich
+        from rich.table import Table
+
+        t = Table(title="Tiempo por fase", show_header=True, header_style="blue")
+        t.add_column("Fase")
+        t.add_column("Real (ms)", justify="right")
+        t.add_column("CPU (ms)", justify="right")
+        t.add_column("Pico memoria (KiB)", justify="right")
+
+        data = self.to_dict()
+
+        for p in self.phases + [dict(name="total", **data["total"])]:
+            t.add_row(
+                p["name"],
+                f"{p['wall'] * 1000:.2f}",
+                f"{p['cpu'] * 1000:.2f}",
+                f"{p['peak'] / 1024:.1f}",
+            )
+
+        rich.print(t)
+
+        if self.counts:
+            c = Table(show_header=True, header_style="blue")
+            c.add_column("Contador")
+            c.add_column("Valor", justify="right")
+
+            for name, value in self.counts.items():
+                c.add_row(name, f"{value:,}")
+
+            rich.print(c)
+
+
+def timed_phase(report: PhaseReport | None, name: str):
+    """report.phase(name), o nada si no hay reporte"""
+    return report.phase(name) if report else nullcontext()